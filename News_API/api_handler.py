@@ -4,24 +4,32 @@ import requests
 import google.generativeai as genai
 # config.py에서 'config' 객체를 상대 경로로 import 합니다.
 from .config import config
+from .http_client import http_get
 import logging
 import re # 정규표현식(줄바꿈 제거)을 위해 추가
+import json
+import threading
+
+GEMINI_MODEL_NAME = "gemini-2.5-pro"
+# 프롬프트 문구나 응답 파싱 규칙을 바꾸면 올려서, 이전 결과가 LLM 캐시에서 재사용되지 않게 합니다.
+FAKE_PROMPT_VERSION = 1
+FAKE_GENERATION_CONFIG = {'temperature': 0.8, 'max_output_tokens': 3072}
+FAKE_BATCH_PROMPT_VERSION = 'batch-1'
+FAKE_BATCH_MAX_OUTPUT_TOKENS = 65536
 
 # Gemini 모델 초기화
 try:
     if config.GEMINI_API_KEY and config.GEMINI_API_KEY != 'YOUR_GEMINI_API_KEY_DEFAULT':
         genai.configure(api_key=config.GEMINI_API_KEY)
-        model = genai.GenerativeModel(model_name="gemini-2.5-pro")
+        model = genai.GenerativeModel(model_name=GEMINI_MODEL_NAME)
     else:
         model = None
 except Exception as e:
     logging.error(f"Gemini 모델 설정 중 오류 발생: {e}")
     model = None
 
-"기사 가져오기"
-def fetch_articles(query, language, sources, sort_by, page_size, from_date=None, to_date=None, page=1):
-    url = 'https://newsapi.org/v2/everything'
-    
+def _build_news_api_params(query, language, sources, sort_by, page_size, from_date=None, to_date=None, page=1):
+    """News API 요청 파라미터를 구성합니다."""
     params = {
         'q': query,
         'language': language,
@@ -37,33 +45,103 @@ def fetch_articles(query, language, sources, sort_by, page_size, from_date=None,
         params['from'] = from_date
     if to_date:
         params['to'] = to_date
+    return params
+
+def _parse_retry_after(response):
+    """429 응답의 Retry-After 헤더(초)를 읽습니다. 없으면 None."""
+    value = response.headers.get('Retry-After') if response is not None else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+def fetch_articles_page(query, language, sources, sort_by, page_size, from_date=None, to_date=None, page=1):
+    """
+    fetch_articles와 동일하게 기사 한 페이지를 가져오되,
+    (기사 목록, HTTP 상태 코드, Retry-After 초)를 함께 반환합니다.
+    상태 코드는 네트워크 오류일 때 None입니다.
+    """
+    params = _build_news_api_params(query, language, sources, sort_by, page_size, from_date, to_date, page)
 
     try:
-        response = requests.get(url, params=params)
+        response = http_get(config.NEWS_API_URL, params=params)
         response.raise_for_status()
-        return response.json().get('articles', [])
+        return response.json().get('articles', []), response.status_code, None
     except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 426 or e.response.status_code == 400:
-             logging.warning(f"[News API 경고] {e.response.status_code} - {e.response.json().get('message')}")
+        status = e.response.status_code
+        if status == 429:
+            logging.warning(f"[News API 경고] 429 - 요청 한도 초과 (query='{query}', page={page})")
+            return [], status, _parse_retry_after(e.response)
+        if status == 426 or status == 400:
+             logging.warning(f"[News API 경고] {status} - {e.response.json().get('message')}")
         else:
-             logging.error(f"[News API 오류] HTTPError 발생. Status: {e.response.status_code}. 서버 응답: {e.response.text}")
-        return []
+             logging.error(f"[News API 오류] HTTPError 발생. Status: {status}. 서버 응답: {e.response.text}")
+        return [], status, None
     except requests.exceptions.RequestException as e:
         logging.error(f"[News API 오류] News API 호출 실패: {e}")
-        return []
+        return [], None, None
 
+"기사 가져오기"
+def fetch_articles(query, language, sources, sort_by, page_size, from_date=None, to_date=None, page=1):
+    articles, _, _ = fetch_articles_page(
+        query, language, sources, sort_by, page_size,
+        from_date=from_date, to_date=to_date, page=page
+    )
+    return articles
 
-"'진짜 뉴스를 기반으로 가짜 뉴스 생성 (제목과 본문 분리)"
-def generate_fake_version(real_text):
-    if not model:
-        logging.warning("Gemini 모델이 준비되지 않아 가짜뉴스 생성을 건너뜁니다.")
-        return '[가짜뉴스 생성 실패: 모델 미설정]', '[가짜뉴스 생성 실패: 모델 미설정]'
-    if not real_text or real_text == '[본문 없음]':
-        return '[가짜뉴스 생성 실패: 원본 본문 없음]', '[가짜뉴스 생성 실패: 원본 본문 없음]'
 
-    try:
-        # --- (핵심 수정 1) 프롬프트 수정 ---
-        prompt = f"""
+_usage_lock = threading.Lock()
+_token_usage = {'requests': 0, 'prompt_tokens': 0, 'output_tokens': 0}
+
+def _record_usage(response):
+    """응답의 usage_metadata(입력/출력 토큰 수)를 누적합니다."""
+    usage = getattr(response, 'usage_metadata', None)
+    with _usage_lock:
+        _token_usage['requests'] += 1
+        if usage is not None:
+            _token_usage['prompt_tokens'] += getattr(usage, 'prompt_token_count', 0) or 0
+            _token_usage['output_tokens'] += getattr(usage, 'candidates_token_count', 0) or 0
+
+def get_token_usage():
+    """지금까지 Gemini 요청 수와 입력/출력 토큰 수를 반환합니다."""
+    with _usage_lock:
+        return dict(_token_usage)
+
+def reset_token_usage():
+    with _usage_lock:
+        for key in _token_usage:
+            _token_usage[key] = 0
+
+class GenerationError(Exception):
+    """
+    가짜뉴스 생성 실패. retryable이면 같은 요청을 다시 시도할 만한 일시적 오류이고,
+    rate_limited면 429/할당량 초과(ResourceExhausted)입니다.
+    """
+    def __init__(self, reason, retryable=False, rate_limited=False):
+        super().__init__(reason)
+        self.reason = reason
+        self.retryable = retryable or rate_limited
+        self.rate_limited = rate_limited
+
+# google.api_core 예외를 직접 import하지 않고 클래스 이름으로 분류합니다 (SDK 버전마다 경로가 다름).
+_RATE_LIMIT_ERRORS = {'ResourceExhausted', 'TooManyRequests'}
+_TRANSIENT_ERRORS = {
+    'DeadlineExceeded', 'ServiceUnavailable', 'InternalServerError', 'GatewayTimeout',
+    'Aborted', 'Unknown', 'TimeoutError', 'ConnectionError', 'ReadTimeout',
+}
+
+def _classify_error(e):
+    name = e.__class__.__name__
+    return GenerationError(
+        f"[가짜뉴스 생성 실패: {name}]",
+        retryable=name in _TRANSIENT_ERRORS or isinstance(e, (TimeoutError, ConnectionError)),
+        rate_limited=name in _RATE_LIMIT_ERRORS or '429' in str(e),
+    )
+
+def build_fake_prompt(real_text):
+    """원본 기사 본문으로 가짜뉴스 생성 프롬프트를 만듭니다."""
+    # --- (핵심 수정 1) 프롬프트 수정 ---
+    return f"""
         당신은 사실과 허구를 교묘하게 섞어, 그럴듯한 가짜뉴스를 작성하는 AI 저널리스트입니다.
         아래 원본 기사를 기반으로, 매우 자극적이고 선정적인 가짜뉴스 '제목'과 '본문'을 생성해주세요.
 
@@ -77,59 +155,165 @@ def generate_fake_version(real_text):
         --- 원본 기사 ---
         {real_text}
         """
-        
-        response = model.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.8,
-                max_output_tokens=3072
-            ),
-            request_options={"timeout": 30} # 30초 타임아웃
-        )
-        
-        # --- (핵심 수정 2) 응답 파싱 로직 ---
-        if response.parts:
-            raw_text = response.text.strip()
-            fake_title = "[가짜생성] (제목 파싱 실패)" # 기본값
-            fake_body = raw_text # 기본값
-            
-            # 제목과 본문 분리 시도
-            if '## ' in raw_text:
-                try:
-                    # '## '로 시작하는 제목 줄과 나머지 본문으로 분리
-                    parts = raw_text.split('\n', 1) # 첫 번째 줄바꿈에서만 분리
-                    title_line = parts[0].strip()
-                    
-                    if title_line.startswith('## '):
-                        fake_title = title_line.replace('## ', '').strip() # '## ' 제거
-                        fake_body = parts[1].strip() if len(parts) > 1 else "[본문 생성 실패]"
-                    else:
-                        # '## '가 첫 줄에 없으면, 그냥 전체를 본문으로
-                        fake_body = raw_text
-                        
-                except Exception as e:
-                    logging.warning(f"Gemini 응답 파싱 실패 (제목/본문 분리): {e}")
-                    fake_body = raw_text # 실패 시 전체를 본문으로
+
+def parse_fake_response(raw_text):
+    """Gemini 응답 텍스트를 (가짜 제목, 가짜 본문)으로 분리하고 본문을 정리합니다."""
+    # --- (핵심 수정 2) 응답 파싱 로직 ---
+    raw_text = raw_text.strip()
+    fake_title = "[가짜생성] (제목 파싱 실패)" # 기본값
+    fake_body = raw_text # 기본값
+
+    # 제목과 본문 분리 시도
+    if '## ' in raw_text:
+        try:
+            # '## '로 시작하는 제목 줄과 나머지 본문으로 분리
+            parts = raw_text.split('\n', 1) # 첫 번째 줄바꿈에서만 분리
+            title_line = parts[0].strip()
+
+            if title_line.startswith('## '):
+                fake_title = title_line.replace('## ', '').strip() # '## ' 제거
+                fake_body = parts[1].strip() if len(parts) > 1 else "[본문 생성 실패]"
             else:
-                # '## ' 마커가 없는 경우 (LLM이 지시를 따르지 않음)
-                logging.warning("Gemini 응답에 '## ' 제목 마커가 없습니다.")
+                # '## '가 첫 줄에 없으면, 그냥 전체를 본문으로
                 fake_body = raw_text
-            
-            # 본문 클린업 (혹시 모를 마커 제거, 줄바꿈을 공백으로)
-            markers_to_remove = ['[서론]', '[본론]', '[결론]', '**[서론]**', '**[본론]**', '**[결론]**', '## ']
-            for marker in markers_to_remove:
-                fake_body = fake_body.replace(marker, '')
-            
-            # 여러 줄바꿈(단락 구분)을 공백 한 칸으로 변경
-            fake_body = re.sub(r'\n+', ' ', fake_body).strip()
-            
-            return fake_title, fake_body
-        
-        else:
-            fail_reason = f"[가짜뉴스 생성 실패] Finish Reason: {response.candidates[0].finish_reason.name if response.candidates else 'Unknown'}"
-            return f"[가짜생성] ({fail_reason})", fail_reason
-            
+
+        except Exception as e:
+            logging.warning(f"Gemini 응답 파싱 실패 (제목/본문 분리): {e}")
+            fake_body = raw_text # 실패 시 전체를 본문으로
+    else:
+        # '## ' 마커가 없는 경우 (LLM이 지시를 따르지 않음)
+        logging.warning("Gemini 응답에 '## ' 제목 마커가 없습니다.")
+        fake_body = raw_text
+
+    return fake_title, _clean_fake_body(fake_body)
+
+def _clean_fake_body(fake_body):
+    # 본문 클린업 (혹시 모를 마커 제거, 줄바꿈을 공백으로)
+    markers_to_remove = ['[서론]', '[본론]', '[결론]', '**[서론]**', '**[본론]**', '**[결론]**', '## ']
+    for marker in markers_to_remove:
+        fake_body = fake_body.replace(marker, '')
+
+    # 여러 줄바꿈(단락 구분)을 공백 한 칸으로 변경
+    return re.sub(r'\n+', ' ', fake_body).strip()
+
+def generate_fake_pair(real_text, timeout=30):
+    """
+    가짜뉴스 (제목, 본문)을 생성합니다. 실패하면 실패 문자열 대신 GenerationError를 발생시키므로,
+    호출하는 쪽에서 재시도하거나 해당 행을 건너뛸 수 있습니다.
+    """
+    if not model:
+        raise GenerationError('[가짜뉴스 생성 실패: 모델 미설정]')
+    if not real_text or real_text == '[본문 없음]':
+        raise GenerationError('[가짜뉴스 생성 실패: 원본 본문 없음]')
+
+    try:
+        response = model.generate_content(
+            build_fake_prompt(real_text),
+            generation_config=genai.types.GenerationConfig(**FAKE_GENERATION_CONFIG),
+            request_options={"timeout": timeout}
+        )
     except Exception as e:
-        logging.error(f"가짜뉴스 생성 API 호출 실패: {e}", exc_info=True)
-        fail_reason = f"[가짜뉴스 생성 실패: {e.__class__.__name__}]"
-        return f"[가짜생성] ({fail_reason})", fail_reason
\ No newline at end of file
+        raise _classify_error(e) from e
+    _record_usage(response)
+
+    if not response.parts:
+        finish_reason = response.candidates[0].finish_reason.name if response.candidates else 'Unknown'
+        # 출력 길이 제한(MAX_TOKENS) 외의 차단(SAFETY 등)은 같은 입력으로 다시 요청해도 결과가 같을 가능성이 높습니다.
+        raise GenerationError(f"[가짜뉴스 생성 실패] Finish Reason: {finish_reason}", retryable=finish_reason == 'MAX_TOKENS')
+    return parse_fake_response(response.text)
+
+class BatchParseError(GenerationError):
+    """묶음 응답을 JSON으로 파싱하지 못했습니다. 묶음을 나눠 다시 요청하면 성공할 수 있습니다."""
+
+def build_batch_prompt(real_texts):
+    """여러 원본 기사를 한 번에 보내는 프롬프트를 만듭니다. 응답은 기사 번호(id)별 JSON 배열입니다."""
+    articles = '\n\n'.join(f"--- 원본 기사 id={i} ---\n{text}" for i, text in enumerate(real_texts))
+    return f"""
+        당신은 사실과 허구를 교묘하게 섞어, 그럴듯한 가짜뉴스를 작성하는 AI 저널리스트입니다.
+        아래 {len(real_texts)}개의 원본 기사 각각을 기반으로, 매우 자극적이고 선정적인 가짜뉴스 '제목'과 '본문'을 생성해주세요.
+
+        [작성 규칙]
+        1. 응답은 반드시 JSON 배열 하나만 출력합니다: [{{"id": 0, "title": "가짜뉴스 제목", "body": "가짜뉴스 본문"}}, ...]
+        2. 원본 기사마다 정확히 하나의 객체를 만들고, id는 원본 기사의 id와 같아야 합니다.
+        3. 본문은 [서론], [본론], [결론] 같은 표식을 **절대 사용하지 마세요.**
+        4. 본문은 단락 구분을 위한 줄바꿈(enter) 없이 **하나의 연속된 통문단으로 작성**해주세요.
+        5. 원본 기사의 핵심 인물, 장소, 사건 등을 왜곡하고 과장해야 합니다.
+        6. 각 가짜뉴스는 해당 원본 기사만 참고하고, 다른 기사의 내용을 섞지 마세요.
+
+        {articles}
+        """
+
+def parse_batch_response(raw_text, count):
+    """
+    묶음 응답(JSON 배열)을 {id: (가짜 제목, 가짜 본문)}으로 변환합니다.
+    일부 id가 빠지거나 형식이 잘못된 항목은 결과에서 제외하며, 하나도 읽지 못하면 BatchParseError를 발생시킵니다.
+    """
+    text = raw_text.strip()
+    # ```json ... ``` 코드 블록으로 감싸 오는 경우
+    if text.startswith('```'):
+        text = text.split('\n', 1)[-1].rsplit('```', 1)[0]
+    try:
+        items = json.loads(text)
+    except ValueError as e:
+        raise BatchParseError(f"[가짜뉴스 생성 실패: 묶음 응답 JSON 파싱 실패 ({e})]") from e
+    if isinstance(items, dict):
+        items = items.get('articles') or items.get('results') or [items]
+
+    results = {}
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.get('id'))
+        except (TypeError, ValueError):
+            continue
+        title, body = item.get('title'), item.get('body')
+        if 0 <= index < count and isinstance(title, str) and isinstance(body, str) and title.strip() and body.strip():
+            results[index] = (title.replace('## ', '').strip(), _clean_fake_body(body))
+    if not results:
+        raise BatchParseError("[가짜뉴스 생성 실패: 묶음 응답에서 읽을 수 있는 기사가 없음]")
+    return results
+
+def generate_fake_batch(real_texts, timeout=30):
+    """
+    여러 기사의 가짜뉴스를 한 번의 요청으로 생성해 {목록 내 번호: (제목, 본문)}을 반환합니다.
+    응답에서 빠진 기사는 결과에 없으므로, 호출하는 쪽에서 나머지만 다시 요청해야 합니다.
+    """
+    if not model:
+        raise GenerationError('[가짜뉴스 생성 실패: 모델 미설정]')
+
+    generation_config = dict(
+        FAKE_GENERATION_CONFIG,
+        max_output_tokens=min(FAKE_GENERATION_CONFIG['max_output_tokens'] * len(real_texts), FAKE_BATCH_MAX_OUTPUT_TOKENS),
+        response_mime_type='application/json',
+    )
+    try:
+        response = model.generate_content(
+            build_batch_prompt(real_texts),
+            generation_config=genai.types.GenerationConfig(**generation_config),
+            request_options={"timeout": timeout}
+        )
+    except Exception as e:
+        raise _classify_error(e) from e
+    _record_usage(response)
+
+    if not response.parts:
+        finish_reason = response.candidates[0].finish_reason.name if response.candidates else 'Unknown'
+        # 묶음 중 한 기사 때문에 전체가 차단되었을 수 있으므로 나눠서 다시 시도합니다.
+        raise BatchParseError(f"[가짜뉴스 생성 실패] Finish Reason: {finish_reason}")
+    return parse_batch_response(response.text, len(real_texts))
+
+"'진짜 뉴스를 기반으로 가짜 뉴스 생성 (제목과 본문 분리)"
+def generate_fake_version(real_text):
+    if not model:
+        logging.warning("Gemini 모델이 준비되지 않아 가짜뉴스 생성을 건너뜁니다.")
+        return '[가짜뉴스 생성 실패: 모델 미설정]', '[가짜뉴스 생성 실패: 모델 미설정]'
+    if not real_text or real_text == '[본문 없음]':
+        return '[가짜뉴스 생성 실패: 원본 본문 없음]', '[가짜뉴스 생성 실패: 원본 본문 없음]'
+
+    try:
+        return generate_fake_pair(real_text)
+    except GenerationError as e:
+        if e.__cause__ is not None:
+            logging.error(f"가짜뉴스 생성 API 호출 실패: {e.__cause__}", exc_info=e.__cause__)
+        return f"[가짜생성] ({e.reason})", e.reason
@@ -0,0 +1,145 @@
+# E:\workspace\News_API\async_collector.py
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .config import config
+from .api_handler import fetch_articles_page
+from .date_windows import covered_since, note_gap
+
+class TokenBucket:
+    """
+    초당 rate개의 토큰이 채워지고 최대 burst개까지 쌓이는 비동기 token bucket.
+    429 응답을 받으면 pause()로 버킷 전체를 일정 시간 멈춥니다.
+    """
+    def __init__(self, rate, burst):
+        self.rate = max(rate, 0.001)
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds):
+        now = time.monotonic()
+        self._blocked_until = max(self._blocked_until, now + seconds)
+        self._tokens = 0.0
+        self._updated = now
+
+async def _collect_query_range(query, date_range, bucket, executor, stats, on_page=None, planner=None, windows=None, gaps=None):
+    """
+    (검색어, 날짜 범위) 하나를 페이지 단위로 수집합니다. 짧은 페이지가 오면 즉시 중단합니다.
+    on_page(검색어, 페이지 기사)는 executor 스레드에서 호출되므로, 블록되어도 이벤트 루프는 멈추지 않습니다.
+    planner(QueryPlanner)가 새 URL 비율이 낮다고 판단하면 다음 페이지를 요청하지 않습니다.
+    windows(WindowPlanner)가 있으면 PAGE_LIMIT에서 잘린 구간을 하위 구간으로 나눠 이어서 수집합니다.
+    gaps(dict)가 주어지면 끝까지 받지 못한 구간을 {검색어: 빠짐없이 받은 시작 시각}으로 기록합니다.
+    """
+    loop = asyncio.get_running_loop()
+    articles = []
+    page_num = 1
+    retries_429 = 0
+    truncated = False
+    failed = False
+
+    while page_num <= config.PAGE_LIMIT:
+        await bucket.acquire()
+        stats['requests'] += 1
+        page_articles, status, retry_after = await loop.run_in_executor(executor, partial(
+            fetch_articles_page,
+            query, config.LANGUAGE, config.SOURCES, config.SORT_BY, config.PAGE_SIZE,
+            from_date=date_range["from_date"], to_date=date_range["to_date"], page=page_num
+        ))
+
+        if status == 429:
+            stats['rate_limited'] += 1
+            if retries_429 >= config.API_429_MAX_RETRIES:
+                logging.warning(f"'{query}' ({date_range['from_date']} ~) 429 재시도 한도 초과로 중단합니다.")
+                failed = True
+                break
+            retries_429 += 1
+            bucket.pause(retry_after or config.API_429_BACKOFF_SECONDS * (2 ** (retries_429 - 1)))
+            continue
+        if status is None or status >= 400:
+            failed = True
+            break
+
+        keep_paging = True
+        if planner:
+            keep_paging = await loop.run_in_executor(executor, planner.record_page, query, page_articles)
+        if not page_articles:
+            break
+        articles.extend(page_articles)
+        if on_page:
+            await loop.run_in_executor(executor, on_page, query, page_articles)
+        if len(page_articles) < config.PAGE_SIZE or not keep_paging:
+            break
+        truncated = page_num == config.PAGE_LIMIT
+        page_num += 1
+
+    follow_up = windows.complete(query, date_range, articles, truncated) if windows else []
+    if failed or (truncated and not follow_up):
+        note_gap(gaps, query, covered_since(date_range, articles, config.SORT_BY))
+    if follow_up:
+        results = await asyncio.gather(*[
+            _collect_query_range(query, sub_range, bucket, executor, stats, on_page, planner, windows, gaps)
+            for sub_range in follow_up
+        ])
+        for sub_articles in results:
+            articles.extend(sub_articles)
+
+    return articles
+
+async def _collect_all(grid, on_page=None, planner=None, windows=None, gaps=None):
+    bucket = TokenBucket(config.API_RATE_PER_SECOND, config.API_BURST)
+    stats = {'requests': 0, 'rate_limited': 0}
+
+    with ThreadPoolExecutor(max_workers=config.API_MAX_CONCURRENCY) as executor:
+        results = await asyncio.gather(*[
+            _collect_query_range(query, date_range, bucket, executor, stats, on_page, planner, windows, gaps)
+            for query, date_range in grid
+        ])
+    return results, stats
+
+def collect_articles_async(scan_plan, on_page=None, planner=None, windows=None, gaps=None):
+    """
+    scan_plan({검색어: [날짜 범위, ...]}) 전체를 동시에 수집해 {검색어: [기사, ...]}로 반환합니다.
+    on_page가 주어지면 페이지를 받을 때마다 on_page(검색어, 페이지 기사)를 호출합니다.
+    각 검색어의 기사는 동기 수집과 같은 순서(날짜 범위 -> 페이지)로 이어 붙이므로
+    이후의 URL 중복 제거 결과(unique_articles)가 동일하게 유지됩니다.
+    gaps(dict)가 주어지면 끝까지 받지 못한 구간을 기록합니다 (워터마크 계산용).
+    """
+    start = time.monotonic()
+    grid = [(query, date_range) for query, date_ranges in scan_plan.items() for date_range in date_ranges]
+    results, stats = asyncio.run(_collect_all(grid, on_page, planner, windows, gaps))
+
+    articles_by_query = {query: [] for query in scan_plan}
+    for (query, _), articles in zip(grid, results):
+        articles_by_query[query].extend(articles)
+
+    elapsed = time.monotonic() - start
+    total = sum(len(articles) for articles in articles_by_query.values())
+    logging.info(
+        f"[비동기 수집] 요청 {stats['requests']}회 (429: {stats['rate_limited']}회), "
+        f"기사 {total}개, 소요 {elapsed:.1f}초"
+    )
+    return articles_by_query
@@ -0,0 +1,72 @@
+# E:\workspace\News_API\bench_extractor.py
+
+import time
+import logging
+import argparse
+
+# 상대 경로로 모듈 임포트
+from .config import config
+from .crawler import extract_article_from_bytes
+from .html_archive import HtmlArchive
+from . import fast_extractor
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def load_pages(archive, limit=None):
+    """아카이브에 저장된 페이지를 (url, content, encoding) 목록으로 불러옵니다."""
+    pages = []
+    for meta in archive.iter_metas():
+        loaded = archive.load_content(meta['url'], meta)
+        if loaded:
+            pages.append((meta['url'], loaded[0], loaded[1]))
+        if limit and len(pages) >= limit:
+            break
+    return pages
+
+def run_engine(pages, engine, repeat):
+    """지정한 엔진으로 모든 페이지를 repeat번 추출하고 (결과 목록, 소요 시간)을 반환합니다."""
+    results = []
+    start = time.perf_counter()
+    for i in range(repeat):
+        current = [extract_article_from_bytes(content, encoding, url, engine=engine) for url, content, encoding in pages]
+        if i == 0:
+            results = current
+    return results, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="BeautifulSoup / lxml 본문 추출 엔진의 속도와 결과 일치율을 비교합니다.")
+    parser.add_argument('--archive', type=str, default=config.HTML_ARCHIVE_PATH, help="HTML 아카이브 폴더 경로")
+    parser.add_argument('--limit', type=int, default=None, help="사용할 최대 페이지 수")
+    parser.add_argument('--repeat', type=int, default=3, help="엔진별 반복 횟수")
+    args = parser.parse_args()
+
+    if not fast_extractor.LXML_AVAILABLE:
+        logging.error("lxml/cssselect가 설치되어 있지 않아 비교할 수 없습니다. (pip install lxml cssselect)")
+        return
+
+    pages = load_pages(HtmlArchive(args.archive), args.limit)
+    if not pages:
+        logging.warning(f"아카이브에 저장된 페이지가 없습니다: {args.archive} (HTML_ARCHIVE_ENABLED=true로 수집하세요)")
+        return
+
+    total_mb = sum(len(content) for _, content, _ in pages) / (1024 * 1024)
+    print(f"\n--- 본문 추출 엔진 벤치마크: {len(pages)}개 페이지 ({total_mb:.1f} MB), {args.repeat}회 반복 ---")
+
+    bs4_results, bs4_time = run_engine(pages, 'bs4', args.repeat)
+    lxml_results, lxml_time = run_engine(pages, 'lxml', args.repeat)
+
+    per_page = lambda seconds: seconds / (len(pages) * args.repeat) * 1000
+    print(f"  > bs4 : {bs4_time:.2f}초 ({per_page(bs4_time):.2f} ms/page)")
+    print(f"  > lxml: {lxml_time:.2f}초 ({per_page(lxml_time):.2f} ms/page)")
+    print(f"  > 속도 향상: {bs4_time / max(lxml_time, 1e-9):.1f}배")
+
+    text_mismatch = [url for (url, _, _), a, b in zip(pages, bs4_results, lxml_results) if a[0] != b[0]]
+    author_mismatch = [url for (url, _, _), a, b in zip(pages, bs4_results, lxml_results) if a[1] != b[1]]
+    print(f"  > 본문 일치: {len(pages) - len(text_mismatch)}/{len(pages)}, 기자 일치: {len(pages) - len(author_mismatch)}/{len(pages)}")
+    for url in text_mismatch[:10]:
+        print(f"    - 본문 불일치: {url}")
+    for url in author_mismatch[:10]:
+        print(f"    - 기자 불일치: {url}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# E:\workspace\News_API\bench_llm.py
+
+import os
+import time
+import logging
+import argparse
+
+# 상대 경로로 모듈 임포트
+from .config import config
+from .api_handler import get_token_usage, reset_token_usage
+from .llm_engine import GenerationEngine
+from util.columnar_store import latest_file, read_table
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def load_texts(raw_file, limit):
+    """원본 CSV에서 본문이 있는 기사 limit개를 불러옵니다."""
+    df = read_table(raw_file, ['기사본문'])
+    df.dropna(subset=['기사본문'], inplace=True)
+    df = df[df['기사본문'] != '[본문 없음]']
+    return df['기사본문'].head(limit).tolist()
+
+def run_mode(texts, batch_size, concurrency):
+    """한 가지 묶음 크기로 모든 기사를 생성하고 처리량/토큰 사용량을 반환합니다. (캐시는 사용하지 않음)"""
+    reset_token_usage()
+    engine = GenerationEngine(batch_size=batch_size, initial_concurrency=concurrency, max_concurrency=concurrency)
+    succeeded = []
+    start = time.perf_counter()
+    engine.run(enumerate(texts), lambda key, fake, prompt_version: succeeded.append(key), lambda key, error: None)
+    elapsed = time.perf_counter() - start
+    usage = get_token_usage()
+    return {
+        'elapsed': elapsed,
+        'succeeded': len(succeeded),
+        'requests': usage['requests'],
+        'prompt_tokens': usage['prompt_tokens'],
+        'output_tokens': usage['output_tokens'],
+        'splits': engine.stats['splits'],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="단건 / 묶음 가짜뉴스 생성의 처리량(articles/min)과 토큰 사용량을 비교합니다.")
+    parser.add_argument('--raw-file', type=str, default=None, help="원본 CSV/Parquet (기본값: 가장 최근 raw_real_news_* 파일)")
+    parser.add_argument('--limit', type=int, default=40, help="사용할 기사 수")
+    parser.add_argument('--batch-sizes', type=str, default='1,5', help="비교할 묶음 크기 (쉼표 구분, 1은 단건)")
+    parser.add_argument('--concurrency', type=int, default=4, help="동시 요청 수 (두 방식을 같은 조건으로 비교하기 위해 고정)")
+    args = parser.parse_args()
+
+    if not config.GEMINI_API_KEY or config.GEMINI_API_KEY == 'YOUR_GEMINI_API_KEY_DEFAULT':
+        logging.critical("GEMINI_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+        return
+
+    raw_file = args.raw_file or latest_file(config.SAVE_FOLDER_PATH, 'raw_real_news')
+    if not raw_file:
+        logging.warning("비교에 사용할 원본 뉴스 파일이 없습니다. 먼저 '1: 뉴스 데이터 수집'을 실행하세요.")
+        return
+
+    texts = load_texts(raw_file, args.limit)
+    print(f"\n--- 가짜뉴스 생성 벤치마크: {len(texts)}개 기사, 동시 요청 {args.concurrency}개 ({os.path.basename(raw_file)}) ---")
+
+    for batch_size in [int(size) for size in args.batch_sizes.split(',')]:
+        result = run_mode(texts, batch_size, args.concurrency)
+        label = '단건' if batch_size == 1 else f"묶음 {batch_size}개"
+        per_article = lambda value: value / max(result['succeeded'], 1)
+        print(f"  > {label}: 성공 {result['succeeded']}/{len(texts)}, {result['elapsed']:.1f}초 "
+              f"({result['succeeded'] / max(result['elapsed'], 1e-9) * 60:.1f} articles/min), "
+              f"요청 {result['requests']}회 (분할 {result['splits']}회)")
+        print(f"    토큰: 입력 {result['prompt_tokens']} / 출력 {result['output_tokens']} "
+              f"(기사당 입력 {per_article(result['prompt_tokens']):.0f} / 출력 {per_article(result['output_tokens']):.0f})")
+
+if __name__ == '__main__':
+    main()
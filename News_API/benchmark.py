@@ -0,0 +1,129 @@
+# E:\workspace\News_API\benchmark.py
+
+import os
+import csv
+import glob
+import time
+import logging
+import argparse
+import tempfile
+import threading
+
+# 상대 경로로 모듈 임포트
+from .config import config
+from .http_client import get_session
+from .standin_server import StandinState, start_server
+from . import main as collector
+
+def _percentile(values, ratio):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+def _count_csv_rows(folder_path):
+    rows = 0
+    for path in glob.glob(os.path.join(folder_path, '*.csv')):
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows += sum(1 for _ in csv.DictReader(f))
+    return rows
+
+def _point_config_at(server_url, work_dir, args):
+    """수집 설정을 stand-in 서버와 임시 폴더로 돌립니다. (공유 Session이 만들어지기 전에 호출해야 함)"""
+    state_dir = os.path.join(work_dir, 'state')
+    config.NEWS_API_KEY = 'standin-benchmark'
+    config.NEWS_API_URL = f"{server_url}/v2/everything"
+    config.HTTP_PROXY = server_url
+    config.QUERIES = [f"벤치마크{i}" for i in range(1, args.queries + 1)]
+    config.PAGE_SIZE = args.page_size
+    config.SAVE_FOLDER_PATH = os.path.join(work_dir, 'articles')
+    config.OUTPUT_FORMAT = 'csv'  # 저장된 행 수를 CSV로 셉니다.
+    config.FEEDBACK_FOLDER_PATH = os.path.join(work_dir, 'feedback_data')
+    config.STATE_FOLDER_PATH = state_dir
+    config.URL_INDEX_PATH = os.path.join(state_dir, 'url_index.sqlite3')
+    config.HTML_ARCHIVE_PATH = os.path.join(state_dir, 'html_archive')
+    config.SELECTOR_STATS_PATH = os.path.join(state_dir, 'selector_stats.json')
+    config.CRAWL_JOURNAL_PATH = os.path.join(state_dir, 'crawl_journal.jsonl')
+    config.CRAWL_PENDING_PATH = os.path.join(state_dir, 'crawl_pending.json')
+    config.QUERY_PLANNER_PATH = os.path.join(state_dir, 'query_yield.json')
+    config.ADAPTIVE_WINDOWS_PATH = os.path.join(state_dir, 'date_windows.json')
+    # 벤치마크용 가짜 기사가 실제 기사 DB/유사 중복 인덱스에 들어가지 않도록 합니다.
+    config.ARTICLE_DB_PATH = os.path.join(state_dir, 'articles.sqlite3')
+    config.NEAR_DUP_INDEX_PATH = os.path.join(state_dir, 'near_dup.sqlite3')
+    # FEED_STATE_PATH는 클래스 정의 시점의 STATE_FOLDER_PATH로 정해지므로 따로 옮깁니다.
+    config.FEED_STATE_PATH = os.path.join(state_dir, 'feeds.json')
+    if args.async_collection:
+        config.ASYNC_COLLECTION = True
+    if args.overlapped:
+        config.OVERLAPPED_COLLECTION = True
+    if args.query_planner:
+        config.QUERY_PLANNER_ENABLED = True
+    if args.adaptive_windows:
+        config.ADAPTIVE_WINDOWS = True
+
+def run_benchmark(args):
+    """stand-in 서버를 띄워 main.main()의 수집 전 과정을 실행하고 처리량/지연 시간을 측정합니다."""
+    state = StandinState(
+        results_per_query=args.results_per_query, pool_size=args.pool_size,
+        latency_ms=args.latency_ms, error_rate=args.error_rate,
+        api_429_rate=args.api_429_rate, archive_path=args.archive,
+    )
+    server, server_url = start_server(state)
+
+    with tempfile.TemporaryDirectory(prefix='news_bench_') as work_dir:
+        _point_config_at(server_url, work_dir, args)
+
+        api_latencies, crawl_latencies = [], []
+        latency_lock = threading.Lock()
+
+        def record_latency(response, *hook_args, **hook_kwargs):
+            elapsed = response.elapsed.total_seconds()
+            with latency_lock:
+                if response.url.startswith(config.NEWS_API_URL):
+                    api_latencies.append(elapsed)
+                else:
+                    crawl_latencies.append(elapsed)
+
+        get_session().hooks['response'].append(record_latency)
+
+        started = time.perf_counter()
+        collector.main([])
+        elapsed = time.perf_counter() - started
+
+        rows = _count_csv_rows(config.SAVE_FOLDER_PATH)
+
+    server.shutdown()
+    total_requests = len(api_latencies) + len(crawl_latencies)
+
+    print("\n===== 수집 벤치마크 결과 =====")
+    print(f"검색어 {args.queries}개, 검색어당 7일 평균 결과 {args.results_per_query}개, 기사 풀 {args.pool_size}개, "
+          f"지연 {args.latency_ms:.0f}ms, 오류율 {args.error_rate * 100:.0f}%")
+    print(f"소요 시간: {elapsed:.2f}s")
+    print(f"요청 수: {total_requests}회 (API {len(api_latencies)}회, 기사 {len(crawl_latencies)}회) -> {total_requests / elapsed:.1f} req/s")
+    if api_latencies:
+        print(f"API 요청당 고유 기사: {rows / len(api_latencies):.1f}개")
+    print(f"저장된 기사: {rows}개 -> {rows / elapsed:.1f} articles/s")
+    print(f"기사 응답 지연: p50 {_percentile(crawl_latencies, 0.5) * 1000:.1f}ms, p95 {_percentile(crawl_latencies, 0.95) * 1000:.1f}ms")
+    print(f"서버 카운터: {dict(state.counts)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 stand-in 서버로 뉴스 수집 전 과정의 처리량을 측정합니다.")
+    parser.add_argument('--queries', type=int, default=4, help="검색어 개수")
+    parser.add_argument('--page-size', type=int, default=100, help="News API 페이지당 기사 수 (.env의 NEWS_PAGE_SIZE 대신 사용)")
+    parser.add_argument('--results-per-query', type=int, default=150, help="검색어당 7일 평균 News API 결과 수")
+    parser.add_argument('--pool-size', type=int, default=2000, help="고유 기사 수 (작을수록 검색어 간 중복 증가)")
+    parser.add_argument('--latency-ms', type=float, default=50.0, help="요청당 평균 지연 시간(ms)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="기사 페이지 503 응답 비율")
+    parser.add_argument('--api-429-rate', type=float, default=0.0, help="News API 429 응답 비율")
+    parser.add_argument('--archive', type=str, default=None, help="실제 기사 HTML을 제공할 HTML 아카이브 경로")
+    parser.add_argument('--async-collection', action='store_true', help="News API 수집을 비동기 수집기로 실행")
+    parser.add_argument('--overlapped', action='store_true', help="API 수집과 본문 크롤링을 겹쳐 실행")
+    parser.add_argument('--query-planner', action='store_true', help="새 URL 비율 기반 검색어 계획기 사용")
+    parser.add_argument('--adaptive-windows', action='store_true', help="적응형 날짜 구간 사용")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    run_benchmark(args)
+
+if __name__ == '__main__':
+    main()
@@ -16,6 +16,7 @@ else:
 
 class Config:
     NEWS_API_KEY = os.getenv('NEWS_API_KEY', 'YOUR_NEWS_API_KEY_DEFAULT')
+    NEWS_API_URL = os.getenv('NEWS_API_URL', 'https://newsapi.org/v2/everything')
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', 'YOUR_GEMINI_API_KEY_DEFAULT')
 
     # --- (핵심 수정 1) 날짜 범위 정의를 클래스 내부로 이동 ---
@@ -49,9 +50,136 @@ class Config:
 
     # File Paths
     SAVE_FOLDER_PATH = os.path.join(CURRENT_DIR, 'articles')
+    # Media 모델 피드백 템플릿 저장 폴더
+    FEEDBACK_FOLDER_PATH = os.path.join(ROOT_DIR, 'model', 'media', 'feedback_data')
+    # 수집 상태(URL 인덱스, 통계 등)를 저장하는 폴더
+    STATE_FOLDER_PATH = os.path.join(CURRENT_DIR, 'state')
 
     BATCH_SIZE = int(os.getenv('BATCH_SIZE', 30))
     BATCH_DELAY_SECONDS = int(os.getenv('BATCH_DELAY_SECONDS', 61))
 
+    # --- 비동기 수집 모드 (time.sleep 대신 token bucket으로 속도 제한) ---
+    ASYNC_COLLECTION = os.getenv('ASYNC_COLLECTION', 'false').lower() == 'true'
+    API_RATE_PER_SECOND = float(os.getenv('API_RATE_PER_SECOND', 5))   # 초당 평균 요청 수
+    API_BURST = int(os.getenv('API_BURST', 10))                        # 순간 최대 요청 수
+    API_MAX_CONCURRENCY = int(os.getenv('API_MAX_CONCURRENCY', 16))    # 동시에 진행 중인 요청 수 상한
+    API_429_MAX_RETRIES = int(os.getenv('API_429_MAX_RETRIES', 3))
+    API_429_BACKOFF_SECONDS = float(os.getenv('API_429_BACKOFF_SECONDS', 5))
+
+    # --- 공유 HTTP Session (keep-alive 커넥션 풀 / 타임아웃 / 재시도) ---
+    HTTP_POOL_HOSTS = int(os.getenv('HTTP_POOL_HOSTS', 100))          # 풀을 유지할 호스트 수
+    HTTP_POOL_PER_HOST = int(os.getenv('HTTP_POOL_PER_HOST', 16))     # 호스트당 keep-alive 커넥션 수
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 5))
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 10))
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 2))
+    HTTP_RETRY_BACKOFF = float(os.getenv('HTTP_RETRY_BACKOFF', 0.5))
+    HTTP_PROXY = os.getenv('HTTP_PROXY_URL', '')  # 설정 시 모든 요청을 이 프록시로 보냄 (오프라인 벤치마크용)
+
+    # --- 검색어 계획기 (새 URL 비율이 낮은 페이지 이후로는 요청 중단 + 효율 높은 검색어부터 조회) ---
+    QUERY_PLANNER_ENABLED = os.getenv('QUERY_PLANNER_ENABLED', 'false').lower() == 'true'
+    QUERY_MIN_YIELD = float(os.getenv('QUERY_MIN_YIELD', 0.2))  # 페이지의 새 URL 비율이 이 값 미만이면 다음 페이지를 요청하지 않음
+    QUERY_PLANNER_PATH = os.path.join(STATE_FOLDER_PATH, 'query_yield.json')
+
+    # --- 적응형 날짜 구간 (잘린 구간은 나눠서 추가 조회, 기사가 적은 구간은 합쳐서 다음 실행에 사용) ---
+    ADAPTIVE_WINDOWS = os.getenv('ADAPTIVE_WINDOWS', 'false').lower() == 'true'
+    ADAPTIVE_WINDOWS_PATH = os.path.join(STATE_FOLDER_PATH, 'date_windows.json')
+    ADAPTIVE_MIN_WINDOW_HOURS = float(os.getenv('ADAPTIVE_MIN_WINDOW_HOURS', 3))  # 이보다 짧은 구간은 더 나누지 않음
+    ADAPTIVE_MAX_SPLITS = int(os.getenv('ADAPTIVE_MAX_SPLITS', 8))                # 검색어당 실행 한 번에 허용하는 분할 횟수
+
+    # --- 기사 목록 수집 경로: 'newsapi' (기본값) / 'feeds' (RSS·사이트맵만) / 'both' ---
+    DISCOVERY_MODE = os.getenv('DISCOVERY_MODE', 'newsapi').lower()
+    FEED_STATE_PATH = os.path.join(STATE_FOLDER_PATH, 'feeds.json')
+    # 쉼표로 구분한 피드/사이트맵 주소. 비워 두면 SITE_SPECIFIC_SELECTORS 도메인의 robots.txt와 홈페이지에서 자동으로 찾음
+    FEED_URLS = [url.strip() for url in os.getenv('FEED_URLS', '').split(',') if url.strip()]
+    FEED_MAX_PER_DOMAIN = int(os.getenv('FEED_MAX_PER_DOMAIN', 3))
+    FEED_MAX_AGE_DAYS = float(os.getenv('FEED_MAX_AGE_DAYS', 3))        # 이보다 오래된 피드 항목은 무시
+    FEED_SITEMAP_CHILDREN = int(os.getenv('FEED_SITEMAP_CHILDREN', 2))  # 사이트맵 인덱스에서 따라갈 최근 하위 사이트맵 수
+    FEED_REDISCOVER_DAYS = float(os.getenv('FEED_REDISCOVER_DAYS', 7))  # 도메인별 피드 주소를 다시 찾는 주기
+    FEED_WORKERS = int(os.getenv('FEED_WORKERS', 8))
+    FEED_MAX_UNDATED = int(os.getenv('FEED_MAX_UNDATED', 50))          # 피드당 가져올 게시 시각 없는 항목 수 (lastmod 없는 사이트맵 등)
+
+    # --- 증분 수집 (검색어별 워터마크 + 수집 완료 URL 인덱스) ---
+    INCREMENTAL_COLLECTION = os.getenv('INCREMENTAL_COLLECTION', 'false').lower() == 'true'
+    URL_INDEX_PATH = os.path.join(STATE_FOLDER_PATH, 'url_index.sqlite3')
+
+    # --- 원본 HTML 아카이브 (조건부 요청 + 오프라인 재추출용) ---
+    HTML_ARCHIVE_ENABLED = os.getenv('HTML_ARCHIVE_ENABLED', 'false').lower() == 'true'
+    HTML_ARCHIVE_PATH = os.getenv('HTML_ARCHIVE_PATH', os.path.join(STATE_FOLDER_PATH, 'html_archive'))
+    HTML_ARCHIVE_COMPRESSION = os.getenv('HTML_ARCHIVE_COMPRESSION', '')  # 'zstd' / 'gzip' (비우면 자동 선택)
+
+    # --- 도메인별 크롤 스케줄러 (전역 워커 풀 + 도메인별 동시 요청 제한 / backoff) ---
+    CRAWL_WORKERS = int(os.getenv('CRAWL_WORKERS', 10))
+    CRAWL_PER_DOMAIN_LIMIT = int(os.getenv('CRAWL_PER_DOMAIN_LIMIT', 3))
+    CRAWL_BACKOFF_BASE_SECONDS = float(os.getenv('CRAWL_BACKOFF_BASE_SECONDS', 1))
+    CRAWL_BACKOFF_MAX_SECONDS = float(os.getenv('CRAWL_BACKOFF_MAX_SECONDS', 30))
+
+    # --- 크롤링 파이프라인: 'threads' (다운로드+파싱을 한 스레드에서) / 'process' (다운로드 스레드 + 추출 프로세스 풀) ---
+    CRAWL_PIPELINE = os.getenv('CRAWL_PIPELINE', 'threads').lower()
+    EXTRACT_PROCESSES = int(os.getenv('EXTRACT_PROCESSES', 0))    # 0이면 CPU 코어 수
+    PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', 64)) # 다운로드 -> 추출 단계 사이 큐 크기
+
+    # --- API 수집과 본문 크롤링 겹쳐 실행 (페이지를 받는 즉시 크롤링 시작) ---
+    OVERLAPPED_COLLECTION = os.getenv('OVERLAPPED_COLLECTION', 'false').lower() == 'true'
+    CRAWL_QUEUE_SIZE = int(os.getenv('CRAWL_QUEUE_SIZE', 200))  # 크롤링 대기 기사가 이 수를 넘으면 API 수집도 대기
+
+    # --- 본문 추출 엔진: 'bs4' (BeautifulSoup, 기본값) / 'lxml' (fast_extractor) ---
+    # lxml은 잘못된 마크업을 html.parser와 다르게 고치므로, 그런 페이지는 자동으로 bs4로 추출하지만
+    # 모든 페이지에서 bs4와 같은 결과를 보장하지는 않습니다. (News_API.bench_extractor로 일치율 확인)
+    EXTRACTOR_ENGINE = os.getenv('EXTRACTOR_ENGINE', 'bs4').lower()
+
+    # --- 도메인별 선택자 성공 통계 (과거에 성공한 선택자를 먼저 시도) ---
+    SELECTOR_STATS_ENABLED = os.getenv('SELECTOR_STATS_ENABLED', 'false').lower() == 'true'
+    SELECTOR_STATS_PATH = os.path.join(STATE_FOLDER_PATH, 'selector_stats.json')
+    SELECTOR_STATS_MIN_PAGES = int(os.getenv('SELECTOR_STATS_MIN_PAGES', 5))  # 이 페이지 수 이상 관측된 도메인만 순서 변경
+
+    # --- 크롤링 저널 (완료된 기사를 즉시 기록, --resume으로 이어서 진행) ---
+    CRAWL_JOURNAL_PATH = os.path.join(STATE_FOLDER_PATH, 'crawl_journal.jsonl')
+    CRAWL_PENDING_PATH = os.path.join(STATE_FOLDER_PATH, 'crawl_pending.json')
+
+    # --- 분산 수집 (SQLite 작업 큐를 공유하는 여러 워커 프로세스/호스트) ---
+    SHARD_DIR = os.getenv('SHARD_DIR', os.path.join(STATE_FOLDER_PATH, 'shards'))
+    SHARD_LEASE_SECONDS = float(os.getenv('SHARD_LEASE_SECONDS', 300))  # 이 시간 안에 끝내지 못한 작업은 다른 워커가 다시 가져감
+    SHARD_MAX_ATTEMPTS = int(os.getenv('SHARD_MAX_ATTEMPTS', 3))
+    SHARD_POLL_SECONDS = float(os.getenv('SHARD_POLL_SECONDS', 2))
+
+    # --- LLM 가짜뉴스 생성 엔진: 'async' (AIMD 동시성 제어 + 재시도) / 'threads' (기존 스레드 10개, 실패 시 실패 문자열 기록) ---
+    LLM_ENGINE = os.getenv('LLM_ENGINE', 'async').lower()
+    LLM_INITIAL_CONCURRENCY = int(os.getenv('LLM_INITIAL_CONCURRENCY', 4))
+    LLM_MIN_CONCURRENCY = int(os.getenv('LLM_MIN_CONCURRENCY', 1))
+    LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 32))
+    LLM_TARGET_LATENCY_SECONDS = float(os.getenv('LLM_TARGET_LATENCY_SECONDS', 30))  # 이보다 느린 응답이 오면 동시 요청 수를 줄임
+    LLM_MAX_ATTEMPTS = int(os.getenv('LLM_MAX_ATTEMPTS', 5))
+    LLM_BACKOFF_BASE_SECONDS = float(os.getenv('LLM_BACKOFF_BASE_SECONDS', 2))
+    LLM_BACKOFF_MAX_SECONDS = float(os.getenv('LLM_BACKOFF_MAX_SECONDS', 60))
+    LLM_TIMEOUT_SECONDS = float(os.getenv('LLM_TIMEOUT_SECONDS', 60))
+    LLM_BATCH_SIZE = int(os.getenv('LLM_BATCH_SIZE', 1))            # 2 이상이면 기사 여러 개를 한 요청(JSON 응답)으로 묶음
+    LLM_BATCH_MAX_CHARS = int(os.getenv('LLM_BATCH_MAX_CHARS', 12000)) # 한 묶음에 넣을 원본 본문 글자 수 상한
+
+    # --- 프롬프트 압축 (상투 문구 제거 + 입력 토큰 예산, 데이터셋의 원문 본문은 그대로) ---
+    LLM_COMPACT_ENABLED = os.getenv('LLM_COMPACT_ENABLED', 'false').lower() == 'true'
+    LLM_INPUT_TOKEN_BUDGET = int(os.getenv('LLM_INPUT_TOKEN_BUDGET', 1500))  # 근사 토큰 수, 0이면 자르지 않고 상투 문구만 제거
+
+    # --- LLM 결과 캐시 (원본 본문 + 프롬프트 버전 + 생성 설정 해시 -> 가짜 제목/본문) ---
+    LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'  # --no-cache로 한 번만 끌 수도 있음
+    LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', os.path.join(STATE_FOLDER_PATH, 'llm_cache.sqlite3'))
+    LLM_CACHE_MAX_MB = float(os.getenv('LLM_CACHE_MAX_MB', 512))
+
+    # --- LLM 가공 저널 (생성된 진짜/가짜 쌍을 즉시 기록, --resume으로 이어서 진행) ---
+    LLM_JOURNAL_PATH = os.path.join(STATE_FOLDER_PATH, 'llm_journal.jsonl')
+    LLM_PENDING_PATH = os.path.join(STATE_FOLDER_PATH, 'llm_pending.json')
+
+    # --- 결과 파일 형식: 'csv' (기본값) / 'parquet' (pyarrow 필요, 컬럼 단위 압축 저장) / 'both' ---
+    OUTPUT_FORMAT = os.getenv('OUTPUT_FORMAT', 'csv').lower()
+    PARQUET_COMPRESSION = os.getenv('PARQUET_COMPRESSION', 'zstd')
+
+    # --- 기사 DB (SQLite, URL/출처/기자/게시일/라벨 인덱스 + 원본에 연결된 가짜뉴스) ---
+    ARTICLE_DB_ENABLED = os.getenv('ARTICLE_DB_ENABLED', 'false').lower() == 'true'  # 수집/가공 결과를 파일과 함께 DB에도 저장
+    ARTICLE_DB_PATH = os.getenv('ARTICLE_DB_PATH', os.path.join(STATE_FOLDER_PATH, 'articles.sqlite3'))
+
+    # --- 유사 중복(전재) 기사 제거 (본문 MinHash/LSH, 이전 실행에서 수집한 기사와도 비교) ---
+    NEAR_DUP_ENABLED = os.getenv('NEAR_DUP_ENABLED', 'false').lower() == 'true'
+    NEAR_DUP_THRESHOLD = float(os.getenv('NEAR_DUP_THRESHOLD', 0.8))  # 이 이상 추정 유사도(Jaccard)면 먼저 수집한 기사만 남김
+    NEAR_DUP_INDEX_PATH = os.getenv('NEAR_DUP_INDEX_PATH', os.path.join(STATE_FOLDER_PATH, 'near_dup.sqlite3'))
+
 # 다른 모듈에서 'from .config import config'로 접근할 수 있도록 인스턴스화
 config = Config()
\ No newline at end of file
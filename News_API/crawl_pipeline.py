@@ -0,0 +1,98 @@
+# E:\workspace\News_API\crawl_pipeline.py
+
+import os
+import queue
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+from .config import config
+from .crawler import fetch_page, plan_selectors, extract_with_selectors, get_selector_stats
+from .crawl_scheduler import DomainScheduler
+
+_END = object()
+
+class TwoStageCrawler:
+    """
+    2단계 크롤링 파이프라인입니다.
+    1) I/O 단계: DomainScheduler의 스레드들이 HTML 바이트만 내려받습니다.
+    2) 추출 단계: ProcessPoolExecutor가 모든 코어에서 본문/기자 추출(crawler.extract_with_selectors)을 수행합니다.
+    두 단계는 크기가 제한된 큐로 연결되어, 추출이 밀리면 다운로드도 함께 멈춥니다.
+    on_result(article, 본문, 기자)는 여러 스레드에서 호출될 수 있습니다.
+    max_pending을 주면 다운로드 대기 기사가 그 수를 넘을 때 submit()이 블록됩니다.
+    """
+    def __init__(self, on_result, processes=None, queue_size=None, max_pending=None):
+        self.on_result = on_result
+        self.processes = processes or config.EXTRACT_PROCESSES or os.cpu_count() or 1
+        queue_size = queue_size or config.PIPELINE_QUEUE_SIZE
+        self._fetched = queue.Queue(maxsize=queue_size)
+        self._inflight = threading.BoundedSemaphore(queue_size)
+        self._scheduler = DomainScheduler(
+            max_workers=config.CRAWL_WORKERS,
+            per_domain_limit=config.CRAWL_PER_DOMAIN_LIMIT,
+            backoff_base=config.CRAWL_BACKOFF_BASE_SECONDS,
+            backoff_max=config.CRAWL_BACKOFF_MAX_SECONDS,
+            max_pending=max_pending,
+        )
+        self._extractor = threading.Thread(target=self._extract_loop, name="crawl-extractor", daemon=True)
+        self._extractor.start()
+
+    def submit(self, article):
+        """기사 하나를 다운로드 단계에 넣습니다."""
+        url = article.get('url', '')
+        self._scheduler.submit(
+            urlparse(url).netloc, fetch_page, url,
+            callback=lambda result, error: self._on_fetched(article, result, error)
+        )
+
+    def _on_fetched(self, article, result, error):
+        if error:
+            if isinstance(error, requests.RequestException):
+                logging.error(f"본문 크롤링 요청 실패 - URL: {article.get('url')} / 오류: {error}")
+            else:
+                logging.error(f"본문 다운로드 실패 - URL: {article.get('url')} / 오류: {error}", exc_info=error)
+            self.on_result(article, "[본문 없음]", "[기자 정보 없음]")
+            return
+        # 큐가 가득 차 있으면 여기서 블록되어 다운로드 스레드도 쉬게 됩니다 (backpressure)
+        self._fetched.put((article, result))
+
+    def _extract_loop(self):
+        with ProcessPoolExecutor(max_workers=self.processes) as pool:
+            while True:
+                item = self._fetched.get()
+                if item is _END:
+                    break
+                article, (content, encoding) = item
+                # 선택자 순서는 부모 프로세스의 통계로 정하고, 결과 통계도 부모에서 기록합니다.
+                body_selectors, author_selectors = plan_selectors(article.get('url', ''))
+                self._inflight.acquire()
+                future = pool.submit(extract_with_selectors, content, encoding, body_selectors, author_selectors)
+                future.add_done_callback(lambda f, article=article: self._on_extracted(article, f))
+
+    def _on_extracted(self, article, future):
+        self._inflight.release()
+        url = article.get('url', '')
+        try:
+            article_text, author_name, body_selector, author_selector = future.result()
+        except Exception as e:
+            logging.error(f"본문 파싱 실패 - URL: {url} / 오류: {e}", exc_info=True)
+            self.on_result(article, "[본문 없음]", "[기자 정보 없음]")
+            return
+
+        stats = get_selector_stats()
+        if stats:
+            stats.record(urlparse(url).netloc, body_selector, author_selector)
+        try:
+            self.on_result(article, article_text, author_name)
+        except Exception as e:
+            logging.error(f"추출 결과 처리 중 예외 발생 - URL: {url} / 오류: {e}", exc_info=True)
+
+    def join(self):
+        """다운로드와 추출이 모두 끝날 때까지 기다립니다."""
+        self._scheduler.join()
+        self._fetched.put(_END)
+        self._extractor.join()
+        self._scheduler.report()
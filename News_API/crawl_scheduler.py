@@ -0,0 +1,155 @@
+# E:\workspace\News_API\crawl_scheduler.py
+
+import time
+import logging
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+class DomainScheduler:
+    """
+    전역 워커 풀 하나를 계속 채워 두는 작업 큐 기반 크롤 스케줄러입니다.
+    - 도메인별 동시 요청 수를 per_domain_limit 이하로 제한합니다.
+    - 도메인별로 실패하면 대기 시간을 두 배로 늘리고(최대 backoff_max), 성공하면 절반으로 줄입니다.
+    - 한 도메인이 밀려 있어도 다른 도메인의 작업을 계속 배정하므로 느린 호스트가 전체를 막지 않습니다.
+    """
+    def __init__(self, max_workers, per_domain_limit, backoff_base=1.0, backoff_max=30.0,
+                 is_failure=None, max_pending=None):
+        self.max_workers = max_workers
+        self.per_domain_limit = max(per_domain_limit, 1)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.is_failure = is_failure or (lambda result: False)
+        self.max_pending = max_pending
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._cond = threading.Condition()
+        self._queues = defaultdict(deque)       # 도메인 -> 대기 작업
+        self._domain_order = deque()            # 라운드로빈 순서
+        self._active = defaultdict(int)         # 도메인 -> 실행 중 작업 수
+        self._delay = defaultdict(float)        # 도메인 -> 현재 backoff 대기 시간(초)
+        self._next_allowed = defaultdict(float) # 도메인 -> 다음 요청 가능 시각
+        self._running = 0
+        self._pending = 0
+        self._closed = False
+
+        self._started_at = time.monotonic()
+        self._domain_stats = defaultdict(lambda: {'done': 0, 'failed': 0, 'first': None, 'last': None})
+
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="crawl-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, domain, fn, *args, callback=None):
+        """
+        작업을 도메인 큐에 넣습니다. callback(result, error)은 워커 스레드에서 호출됩니다.
+        max_pending이 설정되어 있으면 대기 작업이 줄어들 때까지 블록됩니다.
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("이미 종료된 스케줄러에는 작업을 추가할 수 없습니다.")
+            while self.max_pending and self._pending >= self.max_pending:
+                self._cond.wait()
+            if domain not in self._domain_order:
+                self._domain_order.append(domain)
+            self._queues[domain].append((fn, args, callback))
+            self._pending += 1
+            self._cond.notify_all()
+
+    def _pick_ready_domain(self, now):
+        """실행 가능한 도메인을 라운드로빈으로 하나 고릅니다. 없으면 (None, 가장 가까운 대기 시각)."""
+        earliest = None
+        for _ in range(len(self._domain_order)):
+            domain = self._domain_order[0]
+            self._domain_order.rotate(-1)
+            if not self._queues[domain]:
+                continue
+            if self._active[domain] >= self.per_domain_limit:
+                continue
+            if now < self._next_allowed[domain]:
+                earliest = self._next_allowed[domain] if earliest is None else min(earliest, self._next_allowed[domain])
+                continue
+            return domain, None
+        return None, earliest
+
+    def _dispatch_loop(self):
+        with self._cond:
+            while True:
+                if self._closed and self._pending == 0:
+                    return
+                # 비어 있는 도메인은 라운드로빈 목록에서 제거
+                for domain in [d for d in self._domain_order if not self._queues[d]]:
+                    self._domain_order.remove(domain)
+
+                timeout = None
+                while self._running < self.max_workers:
+                    domain, earliest = self._pick_ready_domain(time.monotonic())
+                    if domain is None:
+                        if earliest is not None:
+                            timeout = max(earliest - time.monotonic(), 0.0)
+                        break
+                    fn, args, callback = self._queues[domain].popleft()
+                    self._active[domain] += 1
+                    self._running += 1
+                    self._executor.submit(self._run, domain, fn, args, callback)
+                self._cond.wait(timeout)
+
+    def _run(self, domain, fn, args, callback):
+        start = time.monotonic()
+        result, error = None, None
+        try:
+            result = fn(*args)
+            failed = self.is_failure(result)
+        except Exception as e:
+            error = e
+            failed = True
+        end = time.monotonic()
+
+        with self._cond:
+            stats = self._domain_stats[domain]
+            stats['first'] = start if stats['first'] is None else min(stats['first'], start)
+            stats['last'] = end if stats['last'] is None else max(stats['last'], end)
+            stats['done'] += 1
+            if failed:
+                stats['failed'] += 1
+                self._delay[domain] = min(self.backoff_max, max(self.backoff_base, self._delay[domain] * 2))
+            else:
+                delay = self._delay[domain] / 2
+                self._delay[domain] = delay if delay >= self.backoff_base / 4 else 0.0
+            self._next_allowed[domain] = end + self._delay[domain]
+            self._active[domain] -= 1
+            self._running -= 1
+
+        try:
+            if callback:
+                callback(result, error)
+        except Exception as e:
+            logging.error(f"크롤 콜백 처리 중 예외 발생: {e}", exc_info=True)
+        finally:
+            with self._cond:
+                self._pending -= 1
+                self._cond.notify_all()
+
+    def join(self):
+        """새 작업을 더 받지 않고, 남은 작업이 모두 끝날 때까지 기다립니다."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def report(self, top_n=10):
+        """전체 및 도메인별 처리량(articles/sec)을 로그로 남깁니다."""
+        elapsed = max(time.monotonic() - self._started_at, 1e-9)
+        total = sum(s['done'] for s in self._domain_stats.values())
+        failed = sum(s['failed'] for s in self._domain_stats.values())
+        logging.info(
+            f"[크롤 스케줄러] 전체 {total}개 ({failed}개 실패), {elapsed:.1f}초, "
+            f"{total / elapsed:.2f} articles/sec, {len(self._domain_stats)}개 도메인"
+        )
+        ranked = sorted(self._domain_stats.items(), key=lambda item: item[1]['done'], reverse=True)
+        for domain, s in ranked[:top_n]:
+            span = max((s['last'] or 0) - (s['first'] or 0), 1e-9)
+            logging.info(
+                f"  - {domain}: {s['done']}개 ({s['failed']}개 실패), {s['done'] / span:.2f} articles/sec, "
+                f"현재 backoff {self._delay[domain]:.1f}초"
+            )
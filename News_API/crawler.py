@@ -1,10 +1,18 @@
 # E:\workspace\News_API\crawler.py
 
 import requests
+from requests.compat import chardet
 from bs4 import BeautifulSoup
 import logging
 from urllib.parse import urlparse
 import re
+import threading
+
+from .config import config
+from .http_client import http_get
+from .html_archive import HtmlArchive
+from . import fast_extractor
+from .selector_stats import SelectorStats
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -33,53 +41,185 @@ AUTHOR_SELECTORS = [
     '.author', '.writer', 'span.name', '.j_info'
 ]
 
-def crawl_article(url):
-    """URL을 통해 뉴스 기사 본문과 기자 이름을 크롤링합니다."""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
+def get_body_selectors(url):
+    """URL의 도메인에 맞는 본문 선택자 목록 (사이트 전용 선택자 + 일반 선택자)"""
+    domain = urlparse(url).netloc
+    return SITE_SPECIFIC_SELECTORS.get(domain, []) + GENERAL_SELECTORS
+
+_archive = None
+# 크롤링 스레드들이 처음 동시에 호출해도 공유 인스턴스를 하나만 만들도록 합니다.
+_shared_lock = threading.Lock()
+
+def get_html_archive():
+    """HTML 아카이브가 켜져 있으면 공유 HtmlArchive 인스턴스를, 아니면 None을 반환합니다."""
+    global _archive
+    if config.HTML_ARCHIVE_ENABLED and _archive is None:
+        with _shared_lock:
+            if _archive is None:
+                _archive = HtmlArchive(config.HTML_ARCHIVE_PATH, config.HTML_ARCHIVE_COMPRESSION or None)
+    return _archive
+
+def decode_html(content, encoding):
+    """
+    requests의 page.text와 같은 방식으로 바이트를 문자열로 변환합니다.
+    응답 헤더에 인코딩이 없으면(None) chardet으로 추정합니다 (page.apparent_encoding과 동일).
+    """
+    if encoding is None:
+        encoding = chardet.detect(content)['encoding'] if content else None
     try:
-        page = requests.get(url, headers=headers, timeout=10)
-        page.raise_for_status()
-        soup = BeautifulSoup(page.text, 'html.parser')
+        return str(content, encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return str(content, 'utf-8', errors='replace')
 
-        domain = urlparse(url).netloc
-        selectors_to_try = SITE_SPECIFIC_SELECTORS.get(domain, []) + GENERAL_SELECTORS
-        
-        content_body = None
-        for selector in selectors_to_try:
-            content_body = soup.select_one(selector)
-            if content_body:
+def fetch_page(url):
+    """
+    URL의 HTML을 (바이트, 인코딩)으로 가져옵니다.
+    아카이브가 켜져 있으면 ETag/Last-Modified로 조건부 요청을 보내고,
+    304 응답이면 아카이브에 저장된 HTML을 그대로 사용합니다.
+    """
+    archive = get_html_archive()
+    meta = archive.load_meta(url) if archive else None
+
+    headers = {}
+    if meta:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    # User-Agent / Accept-Encoding / 타임아웃은 공유 Session(http_client)에서 설정합니다.
+    page = http_get(url, headers=headers or None)
+    if page.status_code == 304 and meta:
+        archived = archive.load_content(url, meta)
+        if archived:
+            archive.touch(url, meta)
+            return archived
+        # 아카이브 본문이 손상된 경우 조건 없이 다시 요청
+        page = http_get(url)
+
+    page.raise_for_status()
+    # 헤더에 선언된 인코딩만 기록하고, 추정(sniffing)은 실제로 필요한 추출 엔진에서 수행합니다.
+    encoding = page.encoding
+    if archive:
+        archive.store(
+            url, page.content, encoding,
+            etag=page.headers.get('ETag'), last_modified=page.headers.get('Last-Modified')
+        )
+    return page.content, encoding
+
+def extract_article_details(html, body_selectors, author_selectors):
+    """
+    HTML 문자열에서 기사 본문과 기자 이름을 추출합니다. (네트워크 사용 없음)
+    (본문, 기자, 성공한 본문 선택자, 성공한 기자 선택자)를 반환하며, <p> 폴백이나 실패한 경우 선택자는 None입니다.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+
+    content_body, body_selector = None, None
+    for selector in body_selectors:
+        content_body = soup.select_one(selector)
+        if content_body:
+            body_selector = selector
+            break
+    
+    article_text = '[본문 없음]'
+    if content_body:
+        for tag in content_body.find_all(['script', 'style', 'ins', 'blockquote', 'figure', 'figcaption', '.journalist_info', '.related_articles']):
+            tag.decompose()
+        article_text = content_body.get_text(strip=True, separator=' ')
+    else:
+        paragraphs = soup.find_all('p')
+        article_text = ' '.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+
+    author_name, author_selector = '[기자 정보 없음]', None
+    for selector in author_selectors:
+        author_element = soup.select_one(selector)
+        if author_element:
+            full_name = author_element.get_text(strip=True)
+            match = re.search(r'([가-힣]{2,5})\s*(기자|특파원|논설위원|앵커|객원기자)', full_name)
+            if match:
+                author_name, author_selector = match.group(1).strip(), selector
                 break
-        
+    
+    if not article_text.strip():
         article_text = '[본문 없음]'
-        if content_body:
-            for tag in content_body.find_all(['script', 'style', 'ins', 'blockquote', 'figure', 'figcaption', '.journalist_info', '.related_articles']):
-                tag.decompose()
-            article_text = content_body.get_text(strip=True, separator=' ')
-        else:
-            paragraphs = soup.find_all('p')
-            article_text = ' '.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-
-        author_name = '[기자 정보 없음]'
-        for selector in AUTHOR_SELECTORS:
-            author_element = soup.select_one(selector)
-            if author_element:
-                full_name = author_element.get_text(strip=True)
-                match = re.search(r'([가-힣]{2,5})\s*(기자|특파원|논설위원|앵커|객원기자)', full_name)
-                if match:
-                    author_name = match.group(1).strip()
-                    break
         
-        if not article_text.strip():
-            article_text = '[본문 없음]'
-            
-        return article_text, author_name
+    return article_text, author_name, body_selector, author_selector
+
+def extract_article(html, url):
+    """HTML 문자열에서 기사 본문과 기자 이름을 기본 선택자 순서로 추출합니다."""
+    article_text, author_name, _, _ = extract_article_details(html, get_body_selectors(url), AUTHOR_SELECTORS)
+    return article_text, author_name
+
+_selector_stats = None
+
+def get_selector_stats():
+    """선택자 통계가 켜져 있으면 공유 SelectorStats 인스턴스를, 아니면 None을 반환합니다."""
+    global _selector_stats
+    if config.SELECTOR_STATS_ENABLED and _selector_stats is None:
+        # 둘이 만들어지면 한쪽에 기록한 통계는 _save_selector_stats에서 저장되지 않습니다.
+        with _shared_lock:
+            if _selector_stats is None:
+                _selector_stats = SelectorStats(config.SELECTOR_STATS_PATH, config.SELECTOR_STATS_MIN_PAGES)
+    return _selector_stats
+
+def plan_selectors(url):
+    """
+    도메인별 선택자 통계를 반영해 (본문 선택자, 기자 선택자) 시도 순서를 정합니다.
+    SITE_SPECIFIC_SELECTORS에 등록된 도메인의 본문 선택자는 지정된 우선순위를 그대로 따릅니다.
+    """
+    stats = get_selector_stats()
+    body_selectors = get_body_selectors(url)
+    if not stats:
+        return body_selectors, list(AUTHOR_SELECTORS)
+    domain = urlparse(url).netloc
+    if domain not in SITE_SPECIFIC_SELECTORS:
+        body_selectors = stats.order(domain, body_selectors, 'body')
+    return body_selectors, stats.order(domain, AUTHOR_SELECTORS, 'author')
+
+def extract_with_selectors(content, encoding, body_selectors, author_selectors, engine=None):
+    """
+    HTML 바이트에서 주어진 선택자 순서로 본문/기자를 추출해 (본문, 기자, 본문 선택자, 기자 선택자)를 반환합니다.
+    engine이 'lxml'이고 lxml을 사용할 수 있으면 fast_extractor를, 아니면 BeautifulSoup 경로를 사용합니다.
+    fast_extractor가 결과가 달라질 수 있다고 판단한 페이지(잘못된 마크업, <p> 폴백)도 BeautifulSoup으로 추출합니다.
+    """
+    engine = engine or config.EXTRACTOR_ENGINE
+    if engine == 'lxml':
+        if fast_extractor.LXML_AVAILABLE:
+            result = fast_extractor.extract_article_fast(content, encoding, body_selectors, author_selectors)
+            if result is not None:
+                return result
+        else:
+            _warn_lxml_missing()
+    return extract_article_details(decode_html(content, encoding), body_selectors, author_selectors)
+
+def extract_article_from_bytes(content, encoding, url, engine=None, record_stats=False):
+    """HTML 바이트에서 본문/기자를 추출합니다. record_stats=True이면 성공한 선택자를 통계에 기록합니다."""
+    body_selectors, author_selectors = plan_selectors(url)
+    article_text, author_name, body_selector, author_selector = extract_with_selectors(
+        content, encoding, body_selectors, author_selectors, engine
+    )
+    stats = get_selector_stats()
+    if record_stats and stats:
+        stats.record(urlparse(url).netloc, body_selector, author_selector)
+    return article_text, author_name
+
+_lxml_warning_shown = False
+
+def _warn_lxml_missing():
+    global _lxml_warning_shown
+    if not _lxml_warning_shown:
+        _lxml_warning_shown = True
+        logging.warning("EXTRACTOR_ENGINE=lxml 이지만 lxml/cssselect가 설치되어 있지 않아 BeautifulSoup으로 추출합니다.")
+
+def crawl_article(url):
+    """URL을 통해 뉴스 기사 본문과 기자 이름을 크롤링합니다."""
+    try:
+        content, encoding = fetch_page(url)
+        return extract_article_from_bytes(content, encoding, url, record_stats=True)
 
     except requests.RequestException as e:
         logging.error(f"본문 크롤링 요청 실패 - URL: {url} / 오류: {e}")
         return "[본문 없음]", "[기자 정보 없음]"
     except Exception as e:
         logging.error(f"본문 파싱 실패 - URL: {url} / 오류: {e}", exc_info=True)
-        return "[본문 없음]", "[기자 정보 없음]"
\ No newline at end of file
+        return "[본문 없음]", "[기자 정보 없음]"
@@ -0,0 +1,163 @@
+# E:\workspace\News_API\date_windows.py
+
+import os
+import json
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+def parse_time(value):
+    """'2025-01-05T03:04:00Z', '2025-01-05T03:04:00' 형식의 시각을 datetime으로 변환합니다."""
+    return datetime.strptime(value[:19].replace(' ', 'T'), DATE_FORMAT)
+
+def covered_since(date_range, articles, sort_by='publishedAt'):
+    """
+    끝까지 받지 못한 구간(PAGE_LIMIT에서 잘렸거나 요청이 실패한 구간)에서 빠짐없이 받은 것이 확실한 시작 시각을 반환합니다.
+    publishedAt 정렬이면 받은 기사 중 가장 오래된 시각까지, 그 외에는 구간 시작 시각까지만 받은 것으로 봅니다.
+    """
+    oldest = WindowPlanner._oldest_published(articles) if sort_by == 'publishedAt' else None
+    return oldest.strftime(DATE_FORMAT) if oldest else date_range["from_date"]
+
+def note_gap(gaps, query, covered_from):
+    """검색어의 받지 못한 구간이 covered_from 이전에 있다고 기록합니다 (가장 이른 시각만 유지)."""
+    if gaps is not None:
+        gaps[query] = min(gaps.get(query, covered_from), covered_from)
+
+def _range(start, end):
+    return {"from_date": start.strftime(DATE_FORMAT), "to_date": end.strftime(DATE_FORMAT)}
+
+class WindowPlanner:
+    """
+    검색어별 날짜 구간(window)을 기사 밀도에 맞춰 조정합니다.
+    - PAGE_LIMIT까지 꽉 찬 페이지가 온 구간(잘린 구간)은 아직 받지 못한 부분으로 다시 나눠 추가로 조회합니다.
+      publishedAt 정렬이면 받은 기사 중 가장 오래된 시각 이전 구간만, 그 외 정렬이면 구간을 반으로 나눕니다.
+    - 실행이 끝나면 이웃한 구간의 기사 수 합이 한 페이지에 들어가는 경우 하나로 합칩니다.
+    - 학습한 구간은 '현재로부터 몇 시간 전' 기준으로 저장해, 다음 실행에서 같은 형태로 조회합니다.
+    """
+    def __init__(self, path, default_ranges, page_size, sort_by='publishedAt', min_window_hours=3, max_splits=8, now=None):
+        self.path = path
+        self.default_ranges = [dict(r) for r in default_ranges]
+        self.page_size = page_size
+        self.sort_by = sort_by
+        self.min_window_seconds = min_window_hours * 3600
+        self.max_splits = max_splits
+        # 기준 시각은 기본 구간의 가장 최근 끝 시각(설정을 읽은 시각)으로, 실행마다 같은 상대 구간이 나오게 합니다.
+        self.now = now or max(parse_time(r["to_date"]) for r in self.default_ranges)
+
+        self._lock = threading.Lock()
+        self._learned = {}
+        self._planned = set()
+        self._segments = defaultdict(list)  # 검색어 -> [(시작, 끝, 기사 수)]
+        self._splits = defaultdict(int)
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._learned = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"날짜 구간 파일을 읽지 못해 기본 구간을 사용합니다: {self.path} / {e}")
+            self._learned = {}
+
+    def _hours_ago(self, moment):
+        return round((self.now - moment).total_seconds() / 3600, 2)
+
+    def _from_hours_ago(self, hours):
+        return self.now - timedelta(hours=hours)
+
+    def _span(self):
+        starts = [parse_time(r["from_date"]) for r in self.default_ranges]
+        ends = [parse_time(r["to_date"]) for r in self.default_ranges]
+        return [self._hours_ago(min(starts)), self._hours_ago(max(ends))]
+
+    def plan(self, query):
+        """검색어의 날짜 구간 목록을 반환합니다. 학습된 구간이 없거나 전체 기간 설정이 바뀌었으면 기본 구간을 사용합니다."""
+        with self._lock:
+            self._planned.add(query)
+            learned = self._learned.get(query)
+        if learned and learned.get('span') == self._span():
+            return [_range(self._from_hours_ago(start), self._from_hours_ago(end)) for start, end in learned['windows']]
+        return [dict(r) for r in self.default_ranges]
+
+    def complete(self, query, date_range, articles, truncated):
+        """
+        한 구간의 수집 결과를 기록하고, 추가로 조회해야 할 하위 구간 목록을 반환합니다.
+        truncated는 PAGE_LIMIT 페이지까지 모두 꽉 차서 더 많은 기사가 남아 있을 수 있다는 뜻입니다.
+        """
+        start, end = parse_time(date_range["from_date"]), parse_time(date_range["to_date"])
+        follow_up = []
+        with self._lock:
+            can_split = (
+                truncated
+                and (end - start).total_seconds() > self.min_window_seconds
+                and self._splits[query] < self.max_splits
+            )
+            if can_split:
+                self._splits[query] += 1
+                oldest = self._oldest_published(articles) if self.sort_by == 'publishedAt' else None
+                if oldest and start < oldest < end:
+                    # 최신순 정렬이므로 [가장 오래된 기사, 끝]은 이미 받은 구간입니다.
+                    self._segments[query].append((oldest, end, len(articles)))
+                    follow_up = [_range(start, oldest)]
+                else:
+                    middle = start + (end - start) / 2
+                    follow_up = [_range(start, middle), _range(middle, end)]
+            else:
+                self._segments[query].append((start, end, len(articles)))
+        if follow_up:
+            logging.info(f"[날짜 구간] '{query}' {date_range['from_date']} ~ {date_range['to_date']} 구간이 잘려 {len(follow_up)}개로 나눠 조회합니다.")
+        return follow_up
+
+    @staticmethod
+    def _oldest_published(articles):
+        published = []
+        for article in articles:
+            try:
+                published.append(parse_time(article.get('publishedAt') or ''))
+            except ValueError:
+                continue
+        return min(published) if published else None
+
+    def _merge_sparse(self, segments):
+        """시간순으로 정렬한 뒤, 이웃한 구간의 기사 수 합이 한 페이지 이하이면 합칩니다."""
+        merged = []
+        for start, end, count in sorted(segments):
+            if merged and merged[-1][2] + count <= self.page_size:
+                prev_start, prev_end, prev_count = merged[-1]
+                merged[-1] = (prev_start, max(prev_end, end), prev_count + count)
+            else:
+                merged.append((start, end, count))
+        return merged
+
+    def save(self):
+        """기본 구간에서 출발한 검색어의 학습 결과를 저장합니다 (증분 수집 워터마크 구간은 저장하지 않음)."""
+        with self._lock:
+            span = self._span()
+            for query in self._planned:
+                segments = self._segments.get(query)
+                if not segments:
+                    continue
+                merged = self._merge_sparse(segments)
+                self._learned[query] = {
+                    'span': span,
+                    'windows': [[self._hours_ago(start), self._hours_ago(end)] for start, end, _ in merged],
+                    'counts': [count for _, _, count in merged],
+                }
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._learned, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+
+    def report(self):
+        with self._lock:
+            splits = sum(self._splits.values())
+            planned = [q for q in self._planned if q in self._segments]
+            before = sum(len(self._learned.get(q, {}).get('windows', [])) or len(self.default_ranges) for q in planned)
+            after = sum(len(self._merge_sparse(self._segments[q])) for q in planned)
+        logging.info(f"[날짜 구간] 잘린 구간 분할 {splits}회, 다음 실행 구간 수 {before}개 -> {after}개")
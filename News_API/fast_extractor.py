@@ -0,0 +1,144 @@
+# E:\workspace\News_API\fast_extractor.py
+
+import re
+from functools import lru_cache
+
+# lxml + cssselect가 설치되어 있을 때만 사용합니다 (없으면 crawler가 BeautifulSoup 경로로 대체)
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    from cssselect import HTMLTranslator
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# crawler.extract_article에서 decompose()하는 태그와 동일 ('.journalist_info' 등은 태그 이름이 아니라 매칭되지 않음)
+REMOVED_TAGS = ('script', 'style', 'ins', 'blockquote', 'figure', 'figcaption')
+# BeautifulSoup(4.10+)의 get_text()가 텍스트로 취급하지 않는 태그
+NON_TEXT_TAGS = frozenset(['script', 'style', 'template'])
+
+AUTHOR_PATTERN = re.compile(r'([가-힣]{2,5})\s*(기자|특파원|논설위원|앵커|객원기자)')
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([A-Za-z0-9_\-]+)', re.IGNORECASE)
+# libxml2가 짝이 맞지 않는 닫는 태그를 고쳤다는 오류. 이때는 html.parser와 트리 모양이 달라질 수 있습니다.
+_REPAIR_ERRORS = frozenset(['ERR_TAG_NAME_MISMATCH'])
+
+@lru_cache(maxsize=None)
+def _compile_selector(selector):
+    """CSS 선택자를 (첫 번째 요소만 찾는 XPath, 모든 요소를 찾는 XPath)로 한 번만 컴파일합니다."""
+    xpath = HTMLTranslator().css_to_xpath(selector)
+    return etree.XPath(f"({xpath})[1]"), etree.XPath(xpath)
+
+@lru_cache(maxsize=1024)
+def compile_plan(selectors):
+    """선택자 튜플을 컴파일된 (선택자, 첫 요소 XPath, 전체 XPath) 목록으로 변환합니다. 도메인별 선택자 조합마다 한 번만 수행됩니다."""
+    return tuple((selector,) + _compile_selector(selector) for selector in selectors)
+
+def resolve_encoding(content, encoding):
+    """
+    헤더에 인코딩이 있으면 그대로 쓰고, 없으면 바이트 앞부분의 <meta charset>을 찾습니다.
+    그것도 없으면 UTF-8로 디코딩 가능한지만 확인하고, 실패할 때만 chardet으로 추정합니다.
+    """
+    if encoding:
+        return encoding
+    match = _META_CHARSET.search(content[:4096])
+    if match:
+        return match.group(1).decode('ascii')
+    try:
+        content.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        from requests.compat import chardet
+        return chardet.detect(content)['encoding'] or 'utf-8'
+
+def _iter_strings(element, skipped=frozenset()):
+    """
+    BeautifulSoup의 _all_strings()와 같은 순서로 요소 하위의 텍스트 조각을 반환합니다.
+    skipped에 있는 요소는 decompose()된 것처럼 건너뛰되, 뒤따르는 tail 텍스트는 별도 조각으로 유지합니다.
+    """
+    stack = [(element, False)]
+    while stack:
+        node, emit_tail_only = stack.pop()
+        if emit_tail_only:
+            if node.tail:
+                yield node.tail
+            continue
+        is_element = isinstance(node.tag, str)
+        if is_element and node.tag not in NON_TEXT_TAGS and node.text:
+            yield node.text
+        # 자식을 역순으로 쌓아 문서 순서대로 처리되도록 함 (각 자식 뒤에 tail이 오도록)
+        if is_element:
+            for child in reversed(node):
+                stack.append((child, True))
+                if isinstance(child.tag, str) and child not in skipped:
+                    stack.append((child, False))
+
+def get_text(element, separator='', skipped=frozenset()):
+    """BeautifulSoup의 get_text(strip=True, separator=...)와 같은 결과를 만듭니다."""
+    return separator.join(s.strip() for s in _iter_strings(element, skipped) if s.strip())
+
+def _noise_elements(content_body):
+    """본문 영역 하위에서 crawler가 decompose()하는 요소(script/style 등)를 찾습니다."""
+    return {el for el in content_body.iter(*REMOVED_TAGS) if el is not content_body}
+
+def _is_inside(element, skipped):
+    if element in skipped:
+        return True
+    return any(ancestor in skipped for ancestor in element.iterancestors())
+
+def parse_html(content, encoding):
+    """
+    바이트를 직접 lxml에 넘겨 파싱합니다 (문자열 디코딩 단계를 거치지 않음).
+    (루트 요소, 짝이 맞지 않는 태그를 고쳐 가며 파싱했는지)를 반환합니다.
+    """
+    parser = lxml_html.HTMLParser(encoding=resolve_encoding(content, encoding))
+    root = lxml_html.document_fromstring(content, parser=parser)
+    return root, any(error.type_name in _REPAIR_ERRORS for error in parser.error_log)
+
+def extract_article_fast(content, encoding, body_selectors, author_selectors):
+    """
+    crawler.extract_article_details와 같은 규칙으로 HTML 바이트에서 본문/기자를 추출합니다.
+    (본문, 기자, 성공한 본문 선택자, 성공한 기자 선택자)를 반환합니다.
+
+    lxml(libxml2)과 BeautifulSoup(html.parser)은 잘못된 마크업을 서로 다르게 고치므로
+    (예: lxml은 <div> 앞에서 <p>를 닫고, html.parser는 닫히지 않은 <p>를 중첩시킴) 결과가 달라질 수 있는 페이지는
+    None을 반환해 BeautifulSoup 경로로 넘깁니다.
+    - 파싱 실패, 또는 짝이 맞지 않는 닫는 태그를 고쳐야 했던 페이지
+    - 본문 선택자가 하나도 맞지 않아 <p> 폴백을 써야 하는 페이지 (닫히지 않은 <p>의 중첩 방식 차이가 그대로 드러남)
+    그 밖의 페이지도 결과가 같다고 보장하지는 않습니다. (bench_extractor로 실제 페이지의 일치율을 확인하세요)
+    """
+    try:
+        root, repaired = parse_html(content, encoding)
+    except (etree.ParserError, ValueError, LookupError):
+        return None
+    if repaired:
+        return None
+
+    content_body, body_selector = None, None
+    for selector, first_xpath, _ in compile_plan(tuple(body_selectors)):
+        found = first_xpath(root)
+        if found:
+            content_body, body_selector = found[0], selector
+            break
+
+    if content_body is None:
+        return None
+    skipped = frozenset(_noise_elements(content_body))
+    article_text = get_text(content_body, separator=' ', skipped=skipped)
+
+    author_name, author_selector = '[기자 정보 없음]', None
+    for selector, first_xpath, all_xpath in compile_plan(tuple(author_selectors)):
+        if skipped:
+            # decompose()된 영역 안의 요소는 BeautifulSoup에서 찾을 수 없으므로 제외
+            found = [el for el in all_xpath(root) if not _is_inside(el, skipped)][:1]
+        else:
+            found = first_xpath(root)
+        if found:
+            match = AUTHOR_PATTERN.search(get_text(found[0], skipped=skipped))
+            if match:
+                author_name, author_selector = match.group(1).strip(), selector
+                break
+
+    if not article_text.strip():
+        article_text = '[본문 없음]'
+
+    return article_text, author_name, body_selector, author_selector
@@ -0,0 +1,347 @@
+# E:\workspace\News_API\feed_discovery.py
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin, urlparse
+from concurrent.futures import ThreadPoolExecutor
+import xml.etree.ElementTree as ET
+
+import requests
+
+from .http_client import http_get
+
+_FEED_LINK = re.compile(r'<link[^>]+type=["\']application/(?:rss|atom)\+xml["\'][^>]*>', re.IGNORECASE)
+_HREF = re.compile(r'href=["\']([^"\']+)["\']', re.IGNORECASE)
+_SITEMAP_LINE = re.compile(r'^\s*sitemap:\s*(\S+)', re.IGNORECASE | re.MULTILINE)
+# 두 단계로 된 국가별 도메인 (khan.co.kr의 'co.kr' 등)
+_SECOND_LEVEL_SUFFIXES = {'co.kr', 'or.kr', 'go.kr', 'ne.kr', 're.kr', 'ac.kr', 'pe.kr', 'co.jp', 'ne.jp', 'or.jp', 'co.uk', 'org.uk', 'com.au'}
+
+def _local(tag):
+    """'{namespace}loc' -> 'loc'"""
+    return tag.rsplit('}', 1)[-1].lower()
+
+def _child_text(element, *names):
+    for child in element:
+        if _local(child.tag) in names and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+def _find(element, name):
+    for child in element.iter():
+        if _local(child.tag) == name:
+            return child
+    return None
+
+def source_name(url):
+    """
+    기사 URL의 출처를 News API가 붙이는 이름 형식으로 만듭니다.
+    News API는 등록되지 않은 매체를 하위 도메인을 뗀 도메인의 첫 글자만 대문자로 바꿔 부르므로
+    ('www.khan.co.kr' -> 'Khan.co.kr', 'star.ohmynews.com' -> 'Ohmynews.com'), 피드로 찾은 기사도 같은 이름을 씁니다.
+    """
+    host = (urlparse(url).hostname or url).lower()
+    labels = host.split('.')
+    size = 3 if '.'.join(labels[-2:]) in _SECOND_LEVEL_SUFFIXES else 2
+    domain = '.'.join(labels[-size:])
+    return domain[:1].upper() + domain[1:]
+
+def parse_published(value):
+    """RSS(RFC 822)/Atom·사이트맵(ISO 8601) 날짜를 News API와 같은 'YYYY-MM-DDTHH:MM:SSZ'(UTC)로 바꿉니다."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        moment = None
+    if moment is None:
+        try:
+            moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def parse_feed(content, feed_url, default_source):
+    """
+    RSS 2.0 / Atom / 뉴스 사이트맵 / 사이트맵 인덱스를 파싱합니다.
+    (기사 목록, 하위 사이트맵 [(URL, lastmod)])을 반환하며, 기사는 News API와 같은 dict 형태입니다.
+    """
+    root = ET.fromstring(content)
+    kind = _local(root.tag)
+    articles, children = [], []
+
+    if kind == 'sitemapindex':
+        for sitemap in root:
+            loc = _child_text(sitemap, 'loc')
+            if loc:
+                children.append((loc, _child_text(sitemap, 'lastmod') or ''))
+        return articles, children
+
+    if kind == 'urlset':
+        for entry in root:
+            loc = _child_text(entry, 'loc')
+            if not loc:
+                continue
+            news = _find(entry, 'news')
+            title, published = None, _child_text(entry, 'lastmod')
+            if news is not None:
+                title = _child_text(news, 'title')
+                published = _child_text(news, 'publication_date') or published
+            articles.append(_article(loc, title, default_source, published, None))
+        return articles, children
+
+    if kind == 'rss' or kind == 'rdf':
+        for item in root.iter():
+            if _local(item.tag) != 'item':
+                continue
+            link = _child_text(item, 'link', 'guid')
+            if link:
+                articles.append(_article(
+                    urljoin(feed_url, link), _child_text(item, 'title'), default_source,
+                    _child_text(item, 'pubdate', 'date'), _child_text(item, 'creator', 'author')
+                ))
+        return articles, children
+
+    if kind == 'feed':
+        for entry in root:
+            if _local(entry.tag) != 'entry':
+                continue
+            link = None
+            for child in entry:
+                if _local(child.tag) == 'link' and child.get('rel', 'alternate') == 'alternate':
+                    link = child.get('href')
+                    break
+            author = _find(entry, 'author')
+            if link:
+                articles.append(_article(
+                    urljoin(feed_url, link), _child_text(entry, 'title'), default_source,
+                    _child_text(entry, 'published', 'updated'),
+                    _child_text(author, 'name') if author is not None else None
+                ))
+        return articles, children
+
+    raise ValueError(f"지원하지 않는 피드 형식입니다: <{kind}>")
+
+def _just_before(published):
+    """'YYYY-MM-DDTHH:MM:SSZ'보다 1초 앞선 시각 (워터마크는 '이후' 기사만 내보내므로 그 기사를 다시 받게 됨)"""
+    moment = datetime.strptime(published, '%Y-%m-%dT%H:%M:%SZ') - timedelta(seconds=1)
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _article(url, title, default_source, published, author):
+    # 피드 제목은 피드마다 달라질 수 있어, 출처는 기사 URL의 도메인에서 News API와 같은 이름으로 정합니다.
+    return {
+        'source': {'id': None, 'name': source_name(url) if urlparse(url).hostname else default_source},
+        'author': author,
+        'title': title or '',
+        'description': None,
+        'url': url,
+        'publishedAt': parse_published(published) or '',
+        'content': None,
+    }
+
+class FeedDiscovery:
+    """
+    SITE_SPECIFIC_SELECTORS 도메인들의 RSS/Atom 피드와 뉴스 사이트맵에서 기사 목록을 찾습니다. (News API 할당량 사용 없음)
+    - 피드 주소는 robots.txt의 'Sitemap:' 줄과 홈페이지의 <link rel="alternate" type="application/rss+xml">에서 자동으로 찾아 캐시합니다.
+    - 피드마다 ETag/Last-Modified로 조건부 요청을 보내 변경이 없으면(304) 본문을 받지 않습니다.
+    - 피드별로 마지막으로 본 게시 시각(워터마크) 이후의 기사만 내보냅니다.
+    - 게시 시각이 없는 항목(lastmod 없는 사이트맵 등)은 known_index(UrlIndex)에 없는 URL만, 피드당 max_undated개까지 내보냅니다.
+    상태(피드 목록, 조건부 요청 헤더, 워터마크)는 save()를 호출해야 저장되므로, 크롤링과 결과 CSV 저장이 끝난 뒤에 호출하세요.
+    """
+    def __init__(self, state_path, domains, feed_urls=None, max_feeds_per_domain=3, max_age_days=3,
+                 sitemap_children=2, rediscover_days=7, workers=8, max_undated=50, known_index=None):
+        self.state_path = state_path
+        self.domains = list(domains)
+        self.feed_urls = list(feed_urls or [])
+        self.max_feeds_per_domain = max_feeds_per_domain
+        self.max_age = timedelta(days=max_age_days)
+        self.sitemap_children = sitemap_children
+        self.rediscover_seconds = rediscover_days * 86400
+        self.workers = workers
+        self.max_undated = max_undated
+        self.known_index = known_index
+
+        self._lock = threading.Lock()
+        self._state = {'domains': {}, 'feeds': {}}
+        # 피드별 {'watermark': 이번에 본 가장 최근 게시 시각, 'returned': [(URL, 게시 시각)]} (save()에서 워터마크로 반영)
+        self._polled = {}
+        self._stats = {'requests': 0, 'not_modified': 0, 'errors': 0, 'articles': 0}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self._state = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"피드 상태 파일을 읽지 못해 새로 시작합니다: {self.state_path} / {e}")
+
+    def save(self, failed_urls=()):
+        """
+        피드 상태를 저장합니다. 이번에 본 가장 최근 게시 시각까지 워터마크를 올리되,
+        내보낸 기사 중 본문 크롤링에 실패한 기사(failed_urls)가 있으면 그 기사 바로 전까지만 올려 다음 실행에서 다시 받습니다.
+        """
+        failed_urls = set(failed_urls)
+        with self._lock:
+            for feed_url, polled in self._polled.items():
+                limits = [_just_before(published) for url, published in polled['returned'] if url in failed_urls]
+                feed_state = self._state['feeds'].setdefault(feed_url, {})
+                watermark = min([polled['watermark']] + limits)
+                if watermark > feed_state.get('watermark', ''):
+                    feed_state['watermark'] = watermark
+            self._polled = {}
+            os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._state, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.state_path)
+
+    def _get(self, url, conditional=False):
+        """GET 요청을 보냅니다. conditional이면 저장된 ETag/Last-Modified를 보내고, 304면 None을 반환합니다."""
+        headers = {}
+        if conditional:
+            with self._lock:
+                feed_state = dict(self._state['feeds'].get(url, {}))
+            if feed_state.get('etag'):
+                headers['If-None-Match'] = feed_state['etag']
+            if feed_state.get('last_modified'):
+                headers['If-Modified-Since'] = feed_state['last_modified']
+        with self._lock:
+            self._stats['requests'] += 1
+        response = http_get(url, headers=headers or None)
+        if response.status_code == 304:
+            with self._lock:
+                self._stats['not_modified'] += 1
+            return None
+        response.raise_for_status()
+        return response
+
+    def _discover(self, domain):
+        """robots.txt의 사이트맵과 홈페이지의 RSS 링크에서 피드 주소를 찾습니다."""
+        found = []
+        for scheme in ('https', 'http'):
+            base = f"{scheme}://{domain}/"
+            try:
+                robots = self._get(urljoin(base, 'robots.txt'))
+                sitemaps = _SITEMAP_LINE.findall(robots.text) if robots is not None else []
+                # 뉴스 전용 사이트맵이 있으면 그것만 사용
+                news_sitemaps = [url for url in sitemaps if 'news' in url.lower()]
+                found.extend(news_sitemaps or sitemaps)
+            except requests.RequestException:
+                pass
+            try:
+                home = self._get(base)
+                if home is not None:
+                    for tag in _FEED_LINK.findall(home.text):
+                        href = _HREF.search(tag)
+                        if href:
+                            found.append(urljoin(base, href.group(1)))
+            except requests.RequestException:
+                pass
+            if found:
+                break
+        # 순서를 유지하며 중복 제거
+        return list(dict.fromkeys(found))[:self.max_feeds_per_domain]
+
+    def _feeds_for(self, domain):
+        with self._lock:
+            cached = self._state['domains'].get(domain)
+        if cached and time.time() - cached.get('discovered_at', 0) < self.rediscover_seconds:
+            return cached['feeds']
+        feeds = self._discover(domain)
+        with self._lock:
+            self._state['domains'][domain] = {'feeds': feeds, 'discovered_at': time.time()}
+        if not feeds:
+            logging.info(f"[피드 수집] {domain}: RSS/사이트맵을 찾지 못했습니다.")
+        return feeds
+
+    def _poll(self, feed_url, default_source, depth=0):
+        """
+        피드 하나를 조건부 요청으로 읽어 새 기사를 반환합니다.
+        사이트맵 인덱스면 최근 하위 사이트맵 몇 개를 따라가며, 인덱스가 304여도 기억해 둔 하위 사이트맵은 다시 확인합니다.
+        """
+        try:
+            response = self._get(feed_url, conditional=True)
+            if response is not None:
+                articles, children = parse_feed(response.content, feed_url, default_source)
+        except (requests.RequestException, ET.ParseError, ValueError) as e:
+            with self._lock:
+                self._stats['errors'] += 1
+            logging.warning(f"[피드 수집] 피드를 읽지 못했습니다: {feed_url} / {e}")
+            return []
+
+        with self._lock:
+            feed_state = self._state['feeds'].setdefault(feed_url, {})
+            if response is None:
+                articles, child_urls = [], list(feed_state.get('children', []))
+            else:
+                # 최근 수정된 하위 사이트맵만 따라갑니다 (lastmod가 없으면 마지막에 나열된 것).
+                ranked = sorted(enumerate(children), key=lambda item: (item[1][1], item[0]), reverse=True)
+                child_urls = [child_url for _, (child_url, _) in ranked[:self.sitemap_children]]
+                feed_state['children'] = child_urls
+                feed_state['etag'] = response.headers.get('ETag')
+                feed_state['last_modified'] = response.headers.get('Last-Modified')
+
+            watermark = feed_state.get('watermark', '')
+            cutoff = (datetime.now(timezone.utc) - self.max_age).strftime('%Y-%m-%dT%H:%M:%SZ')
+            fresh = [
+                article for article in articles
+                if article['publishedAt'] and article['publishedAt'] > watermark and article['publishedAt'] >= cutoff
+            ]
+            published = [article['publishedAt'] for article in articles if article['publishedAt']]
+            if published:
+                polled = self._polled.setdefault(feed_url, {'watermark': watermark, 'returned': []})
+                polled['watermark'] = max([polled['watermark']] + published)
+                polled['returned'].extend((article['url'], article['publishedAt']) for article in fresh)
+
+        fresh.extend(self._undated(feed_url, [article for article in articles if not article['publishedAt']]))
+        if depth == 0:
+            for child_url in child_urls:
+                fresh.extend(self._poll(child_url, default_source, depth + 1))
+        return fresh
+
+    def _undated(self, feed_url, articles):
+        """
+        게시 시각이 없어 워터마크로 거를 수 없는 항목을 고릅니다.
+        이미 수집한 URL은 빼고, 남은 항목도 피드당 max_undated개까지만 내보내 매 실행 사이트맵 전체를 크롤링하지 않게 합니다.
+        """
+        if self.known_index and articles:
+            unseen_urls = self.known_index.filter_unseen(article['url'] for article in articles)
+            articles = [article for article in articles if article['url'] in unseen_urls]
+        if len(articles) > self.max_undated:
+            logging.info(f"[피드 수집] {feed_url}: 게시 시각 없는 항목 {len(articles)}개 중 {self.max_undated}개만 가져옵니다.")
+            articles = articles[:self.max_undated]
+        return articles
+
+    def _collect_domain(self, domain):
+        articles = []
+        for feed_url in self._feeds_for(domain):
+            articles.extend(self._poll(feed_url, source_name(domain)))
+        return articles
+
+    def discover(self):
+        """모든 도메인(또는 FEED_URLS)의 피드를 동시에 읽어 새 기사 목록을 반환합니다."""
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            if self.feed_urls:
+                results = executor.map(lambda url: self._poll(url, source_name(url)), self.feed_urls)
+            else:
+                results = executor.map(self._collect_domain, self.domains)
+            articles = [article for result in results for article in result]
+
+        with self._lock:
+            self._stats['articles'] += len(articles)
+            stats = dict(self._stats)
+        logging.info(
+            f"[피드 수집] 요청 {stats['requests']}회 (변경 없음 304: {stats['not_modified']}회, 오류 {stats['errors']}회), "
+            f"새 기사 {len(articles)}개, 소요 {time.monotonic() - start:.1f}초"
+        )
+        return articles
@@ -2,11 +2,70 @@
 
 import os
 import csv
+import uuid
 from datetime import datetime
+from contextlib import contextmanager
 import logging
 
+from .config import config
+from util.columnar_store import PYARROW_AVAILABLE, write_parquet, export_csv
+from util.article_db import ArticleDB, FAILED_FAKE_PREFIX
+
 log = logging.getLogger(__name__)
 
+def _unique_filename(folder_path, prefix):
+    """
+    같은 초에 여러 프로세스/호스트가 저장해도 겹치지 않도록 시각 뒤에 pid와 임의 문자열을 붙입니다.
+    (기존 'prefix_날짜_시각' 접두어는 유지되므로 glob('prefix_*.csv')와 정렬 순서는 그대로입니다.)
+    """
+    today = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+    return os.path.join(folder_path, f"{prefix}_{today}_{os.getpid()}-{uuid.uuid4().hex[:6]}.csv")
+
+@contextmanager
+def _atomic_csv(filename):
+    """임시 파일에 쓴 뒤 성공했을 때만 최종 이름으로 바꿔, 다른 프로세스가 쓰다 만 CSV를 읽지 않게 합니다."""
+    tmp_path = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+            yield f
+        os.replace(tmp_path, filename)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _write_rows(folder_path, prefix, fieldnames, rows):
+    """
+    행들을 OUTPUT_FORMAT('csv' / 'parquet' / 'both')에 맞춰 저장하고 (대표 파일 경로, 행 수)를 반환합니다.
+    rows는 제너레이터일 수 있어 한 번만 순회하며, 'both'는 Parquet을 쓴 뒤 같은 이름의 CSV로 내보냅니다.
+    행이 하나도 없으면 파일을 남기지 않고 (None, 0)을 반환합니다.
+    """
+    filename = _unique_filename(folder_path, prefix)
+    output_format = config.OUTPUT_FORMAT
+    if output_format in ('parquet', 'both') and not PYARROW_AVAILABLE:
+        log.warning("pyarrow가 설치되어 있지 않아 CSV로 저장합니다. (pip install pyarrow)")
+        output_format = 'csv'
+
+    if output_format == 'csv':
+        count = 0
+        with _atomic_csv(filename) as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            for count, row in enumerate(rows, 1):
+                writer.writerow(row)
+        if count == 0:
+            os.remove(filename)
+            return None, 0
+        return filename, count
+
+    parquet_filename = f"{os.path.splitext(filename)[0]}.parquet"
+    count = write_parquet(rows, parquet_filename, fieldnames, compression=config.PARQUET_COMPRESSION)
+    if count == 0:
+        os.remove(parquet_filename)
+        return None, 0
+    if output_format == 'both':
+        export_csv(parquet_filename, filename)
+    return parquet_filename, count
+
 def save_raw_real_news(collected_articles, folder_path):
     """(1. 수집 단계) 크롤링한 '진짜 뉴스' 원본을 저장합니다."""
     if not collected_articles:
@@ -14,28 +73,30 @@ def save_raw_real_news(collected_articles, folder_path):
         return
     
     os.makedirs(folder_path, exist_ok=True)
-    today = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-    filename = os.path.join(folder_path, f"raw_real_news_{today}.csv")
 
     # 원본 데이터 저장을 위한 헤더 (라벨 없음)
     fieldnames = ['번호', '제목', '출처', '기자', 'URL', '게시일', '기사본문']
 
-    try:
-        with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+    # collected_articles는 리스트뿐 아니라 제너레이터(저널 스트리밍)일 수도 있습니다.
+    rows = (
+        {
+            '번호': i,
+            '제목': article.get('title', ''),
+            '출처': article.get('source', ''),
+            '기자': article.get('author', ''),
+            'URL': article.get('url', ''),
+            '게시일': article.get('publishedAt', ''),
+            '기사본문': article.get('text', ''),
+        }
+        for i, article in enumerate(collected_articles, 1)
+    )
 
-            for i, article in enumerate(collected_articles, 1):
-                writer.writerow({
-                    '번호': i,
-                    '제목': article.get('title', ''),
-                    '출처': article.get('source', ''),
-                    '기자': article.get('author', ''),
-                    'URL': article.get('url', ''),
-                    '게시일': article.get('publishedAt', ''),
-                    '기사본문': article.get('text', ''),
-                })
-        log.info(f"총 {len(collected_articles)}개의 원본 기사 저장 완료: {filename}")
+    try:
+        filename, count = _write_rows(folder_path, 'raw_real_news', fieldnames, rows)
+        if not filename:
+            log.warning("저장할 원본 기사가 없습니다 (Raw Data).")
+            return None
+        log.info(f"총 {count}개의 원본 기사 저장 완료: {filename}")
         return filename # 다음 단계에서 사용할 수 있도록 파일 경로 반환
     except Exception as e:
         log.error(f"원본 기사 CSV 파일 저장 중 오류 발생: {e}", exc_info=True)
@@ -48,26 +109,58 @@ def save_labeled_dataset(processed_articles, folder_path):
         return
 
     os.makedirs(folder_path, exist_ok=True)
-    today = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-    filename = os.path.join(folder_path, f"dataset_{today}.csv")
 
     # '기자' 헤더 추가 (Tokken, Media 모델 학습에 모두 사용)
     fieldnames = ['번호', '제목', '출처', '기자', 'URL', '게시일', '기사본문', '진위여부(1:진짜, 0:가짜)']
 
+    # processed_articles는 리스트뿐 아니라 제너레이터(저널 스트리밍)일 수도 있습니다.
+    rows = (
+        {
+            '번호': i, '제목': article.get('title', ''), '출처': article.get('source', ''),
+            '기자': article.get('author', ''), 'URL': article.get('url', ''),
+            '게시일': article.get('publishedAt', ''), '기사본문': article.get('text', ''),
+            '진위여부(1:진짜, 0:가짜)': article.get('label', '')
+        }
+        for i, article in enumerate(processed_articles, 1)
+    )
+
     try:
-        with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for i, article in enumerate(processed_articles, 1):
-                writer.writerow({
-                    '번호': i, '제목': article.get('title', ''), '출처': article.get('source', ''),
-                    '기자': article.get('author', ''), 'URL': article.get('url', ''),
-                    '게시일': article.get('publishedAt', ''), '기사본문': article.get('text', ''),
-                    '진위여부(1:진짜, 0:가짜)': article.get('label', '')
-                })
-        log.info(f"총 {len(processed_articles)}개의 최종 학습 데이터 저장 완료: {filename}")
+        filename, count = _write_rows(folder_path, 'dataset', fieldnames, rows)
+        if not filename:
+            log.warning("저장할 기사가 없습니다 (학습용 데이터셋).")
+            return None
+        log.info(f"총 {count}개의 최종 학습 데이터 저장 완료: {filename}")
+        return filename
     except Exception as e:
         log.error(f"최종 학습용 CSV 파일 저장 중 오류 발생: {e}", exc_info=True)
+        return None
+
+def store_articles_in_db(records):
+    """(1. 수집 단계) 크롤링한 원본 기사를 기사 DB에 대량으로 넣습니다. 본문 크롤링에 실패한 기사는 제외합니다."""
+    try:
+        db = ArticleDB(config.ARTICLE_DB_PATH)
+        try:
+            count = db.upsert_articles(r for r in records if r.get('text') != '[본문 없음]')
+            log.info(f"[기사 DB] 원본 기사 {count}개 저장 완료 (누적 {db.stats()['articles']}개): {config.ARTICLE_DB_PATH}")
+        finally:
+            db.close()
+    except Exception as e:
+        log.error(f"기사 DB 저장 중 오류 발생: {e}", exc_info=True)
+
+def store_pairs_in_db(pairs):
+    """
+    (2. 가공 단계) 진짜/가짜 쌍을 기사 DB에 넣습니다. 생성 실패 문자열로 채워진 가짜는 제외합니다.
+    (threads 엔진은 실패를 '[가짜생성] (...)' 제목으로 돌려주므로 제목이 아니라 본문으로 확인합니다)
+    """
+    try:
+        db = ArticleDB(config.ARTICLE_DB_PATH)
+        try:
+            count = db.add_pairs((real, fake) for real, fake in pairs if not str(fake.get('text', '')).startswith(FAILED_FAKE_PREFIX))
+            log.info(f"[기사 DB] 진짜/가짜 쌍 {count}개 저장 완료 (누적 가짜뉴스 {db.stats()['fakes']}개): {config.ARTICLE_DB_PATH}")
+        finally:
+            db.close()
+    except Exception as e:
+        log.error(f"기사 DB 저장 중 오류 발생: {e}", exc_info=True)
 
 def save_feedback_template_csv(original_articles, folder_path):
     """Media 모델 학습을 위한 피드백용 템플릿 CSV 파일을 저장합니다."""
@@ -76,17 +169,15 @@ def save_feedback_template_csv(original_articles, folder_path):
         log.warning("저장할 기사가 없습니다 (피드백용 템플릿).")
         return
 
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    feedback_folder = os.path.join(project_root, 'model', 'media', 'feedback_data')
+    feedback_folder = config.FEEDBACK_FOLDER_PATH
     os.makedirs(feedback_folder, exist_ok=True)
     
-    today = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-    filename = os.path.join(feedback_folder, f"feedback_template_{today}.csv")
+    filename = _unique_filename(feedback_folder, 'feedback_template')
 
     fieldnames = ['source', 'author', 'title', 'url', 'publishedAt', 'content', 'label', 'reason']
 
     try:
-        with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
+        with _atomic_csv(filename) as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
 
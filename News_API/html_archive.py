@@ -0,0 +1,114 @@
+# E:\workspace\News_API\html_archive.py
+
+import os
+import gzip
+import json
+import hashlib
+import logging
+from datetime import datetime
+
+# zstandard가 설치되어 있으면 zstd, 없으면 gzip으로 압축합니다.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+class HtmlArchive:
+    """
+    크롤링한 원본 HTML(바이트)을 URL 해시 기준으로 압축 저장하는 아카이브입니다.
+    <root>/<해시 앞 2글자>/<해시>.json 에 메타데이터(URL, 인코딩, ETag, Last-Modified)를,
+    <해시>.html.zst 또는 <해시>.html.gz 에 본문을 저장합니다.
+    """
+    def __init__(self, root, compression=None):
+        self.root = root
+        if compression is None:
+            compression = 'zstd' if zstandard else 'gzip'
+        if compression == 'zstd' and zstandard is None:
+            logging.warning("zstandard 모듈이 없어 gzip으로 압축합니다.")
+            compression = 'gzip'
+        self.compression = compression
+
+    @staticmethod
+    def url_key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _base_path(self, url):
+        key = self.url_key(url)
+        return os.path.join(self.root, key[:2], key)
+
+    def _write_atomic(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def load_meta(self, url):
+        """저장된 메타데이터를 반환합니다. 없으면 None."""
+        meta_path = self._base_path(url) + '.json'
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load_content(self, url, meta=None):
+        """저장된 HTML 바이트와 인코딩을 (content, encoding)으로 반환합니다. 없으면 None."""
+        meta = meta or self.load_meta(url)
+        if not meta:
+            return None
+        content_path = self._base_path(url) + meta['file_ext']
+        try:
+            with open(content_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if meta['file_ext'] == '.html.zst':
+            if zstandard is None:
+                logging.error(f"zstd로 압축된 아카이브를 읽으려면 zstandard 모듈이 필요합니다: {url}")
+                return None
+            content = zstandard.ZstdDecompressor().decompress(data)
+        else:
+            content = gzip.decompress(data)
+        return content, meta.get('encoding')
+
+    def store(self, url, content, encoding, etag=None, last_modified=None):
+        """HTML 바이트와 응답 헤더 정보를 저장합니다. encoding은 헤더에 선언된 값(없으면 None)입니다."""
+        base_path = self._base_path(url)
+        if self.compression == 'zstd':
+            file_ext, data = '.html.zst', zstandard.ZstdCompressor(level=10).compress(content)
+        else:
+            file_ext, data = '.html.gz', gzip.compress(content, compresslevel=6)
+
+        meta = {
+            'url': url,
+            'encoding': encoding,
+            'etag': etag,
+            'last_modified': last_modified,
+            'file_ext': file_ext,
+            'content_sha256': hashlib.sha256(content).hexdigest(),
+            'fetched_at': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        # 본문을 먼저 쓰고 메타데이터를 나중에 써서, 메타데이터가 있으면 본문도 있도록 합니다.
+        self._write_atomic(base_path + file_ext, data)
+        self._write_atomic(base_path + '.json', json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+    def touch(self, url, meta):
+        """304 응답을 받은 경우 확인 시각만 갱신합니다."""
+        meta = dict(meta, fetched_at=datetime.now().strftime('%Y-%m-%dT%H:%M:%S'))
+        self._write_atomic(self._base_path(url) + '.json', json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+    def iter_metas(self):
+        """아카이브에 저장된 모든 메타데이터를 순회합니다."""
+        if not os.path.isdir(self.root):
+            return
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith('.json'):
+                    try:
+                        with open(os.path.join(dirpath, filename), 'r', encoding='utf-8') as f:
+                            yield json.load(f)
+                    except (OSError, ValueError):
+                        continue
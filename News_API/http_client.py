@@ -0,0 +1,109 @@
+# E:\workspace\News_API\http_client.py
+
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import config
+
+# brotli 모듈이 있을 때만 'br' 전송 인코딩을 요청합니다 (없으면 urllib3가 해제하지 못함)
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': ACCEPT_ENCODING,
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+def _build_session():
+    """keep-alive 커넥션 풀과 재시도 정책이 설정된 Session을 생성합니다."""
+    retry = Retry(
+        total=config.HTTP_MAX_RETRIES,
+        connect=config.HTTP_MAX_RETRIES,
+        read=config.HTTP_MAX_RETRIES,
+        status=config.HTTP_MAX_RETRIES,
+        backoff_factor=config.HTTP_RETRY_BACKOFF,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=False,
+    )
+    # pool_connections: 보관할 호스트별 풀 개수, pool_maxsize: 호스트 하나당 유지할 커넥션 수
+    adapter = HTTPAdapter(
+        pool_connections=config.HTTP_POOL_HOSTS,
+        pool_maxsize=config.HTTP_POOL_PER_HOST,
+        max_retries=retry,
+        pool_block=False,
+    )
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if config.HTTP_PROXY:
+        session.proxies.update({'http': config.HTTP_PROXY, 'https': config.HTTP_PROXY})
+    return session
+
+def get_session():
+    """프로세스 전체에서 공유하는 Session을 반환합니다 (스레드 안전하게 1회만 생성)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+def http_get(url, **kwargs):
+    """공유 Session으로 GET 요청을 보냅니다. timeout을 주지 않으면 (connect, read) 기본값을 사용합니다."""
+    kwargs.setdefault('timeout', (config.HTTP_CONNECT_TIMEOUT, config.HTTP_READ_TIMEOUT))
+    return get_session().get(url, **kwargs)
+
+def get_pool_stats():
+    """호스트별 요청 수와 새로 연 커넥션 수를 모아 커넥션 재사용률을 계산합니다."""
+    stats = {}
+    if _session is None:
+        return stats
+
+    seen_adapters = set()
+    for adapter in _session.adapters.values():
+        if id(adapter) in seen_adapters:
+            continue
+        seen_adapters.add(id(adapter))
+        # 프록시를 쓰는 경우 커넥션 풀은 proxy_manager 쪽에 만들어집니다.
+        managers = [adapter.poolmanager] + list(adapter.proxy_manager.values())
+        for manager in managers:
+            pools = manager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host_stats = stats.setdefault(pool.host, {'requests': 0, 'connections': 0})
+                host_stats['requests'] += pool.num_requests
+                host_stats['connections'] += pool.num_connections
+
+    for host_stats in stats.values():
+        requests_made = host_stats['requests']
+        host_stats['reuse_rate'] = 1 - host_stats['connections'] / requests_made if requests_made else 0.0
+    return stats
+
+def log_pool_stats():
+    """커넥션 풀 재사용률을 로그로 남깁니다."""
+    stats = get_pool_stats()
+    if not stats:
+        return
+    total_requests = sum(s['requests'] for s in stats.values())
+    total_connections = sum(s['connections'] for s in stats.values())
+    reuse_rate = 1 - total_connections / total_requests if total_requests else 0.0
+    logging.info(
+        f"[HTTP 풀] 요청 {total_requests}회, 새 커넥션 {total_connections}개, "
+        f"재사용률 {reuse_rate * 100:.1f}% ({len(stats)}개 호스트)"
+    )
+    for host, s in sorted(stats.items(), key=lambda item: item[1]['requests'], reverse=True)[:10]:
+        logging.info(f"  - {host}: 요청 {s['requests']}회, 커넥션 {s['connections']}개, 재사용률 {s['reuse_rate'] * 100:.1f}%")
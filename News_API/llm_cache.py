@@ -0,0 +1,104 @@
+# E:\workspace\News_API\llm_cache.py
+
+import os
+import json
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+
+from .api_handler import GEMINI_MODEL_NAME, FAKE_PROMPT_VERSION, FAKE_GENERATION_CONFIG
+
+def cache_key(real_text, prompt_version=FAKE_PROMPT_VERSION, generation_config=None, model_name=GEMINI_MODEL_NAME):
+    """원본 본문 + 프롬프트 버전 + 모델/생성 설정의 sha256. 어느 하나라도 바뀌면 다른 키가 됩니다."""
+    settings = json.dumps(
+        {'model': model_name, 'prompt': prompt_version, 'config': generation_config or FAKE_GENERATION_CONFIG},
+        sort_keys=True
+    )
+    return hashlib.sha256(f"{settings}\n{real_text}".encode('utf-8')).hexdigest()
+
+class LlmCache:
+    """
+    파싱된 가짜뉴스 (제목, 본문)을 SQLite 파일에 저장하는 영구 캐시입니다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 지웁니다 (LRU).
+    생성에 성공한 결과만 저장하므로, 실패한 기사는 다음 실행에서 다시 요청합니다.
+    """
+    def __init__(self, db_path, max_bytes=512 * 1024 * 1024):
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS fakes (
+                key TEXT PRIMARY KEY,
+                fake_title TEXT NOT NULL,
+                fake_body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_fakes_last_used ON fakes (last_used);
+        """)
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM fakes").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """캐시된 (가짜 제목, 가짜 본문)을 반환합니다. 없으면 None."""
+        with self._lock:
+            row = self._conn.execute("SELECT fake_title, fake_body FROM fakes WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE fakes SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return row[0], row[1]
+
+    def put(self, key, fake_title, fake_body):
+        size = len(fake_title.encode('utf-8')) + len(fake_body.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM fakes WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fakes (key, fake_title, fake_body, size, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, fake_title, fake_body, size, now, now)
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """최대 크기의 90%가 될 때까지 오래 사용되지 않은 항목부터 지웁니다. (잠금을 잡은 상태에서 호출)"""
+        target = self.max_bytes * 0.9
+        removed = 0
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM fakes ORDER BY last_used"):
+            if self._total_bytes <= target:
+                break
+            doomed.append((key,))
+            self._total_bytes -= size
+            removed += 1
+        self._conn.executemany("DELETE FROM fakes WHERE key = ?", doomed)
+        logging.info(f"[LLM 캐시] 크기 제한({self.max_bytes / 1024 / 1024:.1f}MB)을 넘어 오래된 항목 {removed}개를 지웠습니다.")
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM fakes").fetchone()[0]
+
+    def report(self):
+        total = self.hits + self.misses
+        if total:
+            logging.info(
+                f"[LLM 캐시] 적중 {self.hits}건 / 조회 {total}건 ({self.hits / total:.0%}), "
+                f"저장 항목 {self.count()}개 ({self._total_bytes / 1024 / 1024:.1f}MB)"
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,225 @@
+# E:\workspace\News_API\llm_engine.py
+
+import time
+import random
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import config
+from .api_handler import (
+    generate_fake_pair, generate_fake_batch, get_token_usage, GenerationError, BatchParseError,
+    FAKE_PROMPT_VERSION, FAKE_BATCH_PROMPT_VERSION,
+)
+
+class AimdLimiter:
+    """
+    AIMD(가산 증가 / 곱셈 감소) 방식으로 동시 요청 수를 조절하는 비동기 리미터입니다.
+    - 응답 지연이 target_latency 이하인 성공이 한 '창(limit개)'만큼 쌓이면 limit을 1 늘립니다.
+    - 지연이 목표를 넘으면 조금(10%) 줄이고, 429/할당량 초과나 타임아웃이면 절반으로 줄입니다.
+    - 429에 Retry-After가 없어도 cooldown초 동안 새 요청을 모두 멈춥니다.
+    """
+    def __init__(self, initial, min_limit, max_limit, target_latency, cooldown=5.0):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.target_latency = target_latency
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.peak = self.limit
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            while True:
+                wait = self._blocked_until - time.monotonic()
+                if wait > 0:
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                await self._condition.wait()
+
+    async def release(self):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self, latency):
+        if latency <= self.target_latency:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.peak = max(self.peak, self.limit)
+        else:
+            self.limit = max(self.min_limit, self.limit * 0.9)
+
+    def on_overload(self, pause=None):
+        """429/타임아웃: 이미 보낸 요청들이 한꺼번에 실패해도 한 번만 줄도록, 지연 시간 안의 연속 감소는 무시합니다."""
+        now = time.monotonic()
+        if now - self._last_decrease >= self.target_latency:
+            self.limit = max(self.min_limit, self.limit / 2)
+            self._last_decrease = now
+        self._blocked_until = max(self._blocked_until, now + (pause if pause is not None else self.cooldown))
+
+class GenerationEngine:
+    """
+    가짜뉴스 생성 요청을 AIMD 동시성 제어 + 지터(jitter) 지수 backoff 재시도로 실행합니다.
+    Gemini 호출은 블로킹이므로 스레드 풀에서 실행하고, 이벤트 루프는 동시성/재시도만 관리합니다.
+    재시도 한도를 넘긴 행은 실패 문자열을 만들지 않고 on_failure로 알립니다.
+    batch_size가 2 이상이면 기사 여러 개를 한 요청(JSON 응답)으로 묶고, 파싱에 실패하거나 빠진 기사는
+    묶음을 반으로 나눠 다시 요청합니다. 한 기사만 남으면 단건 요청으로 처리합니다.
+    결과마다 실제로 사용한 프롬프트 버전(단건 prompt_version / 묶음 batch_prompt_version)을 함께 알려 줍니다.
+    """
+    def __init__(self, generate=generate_fake_pair, initial_concurrency=None, min_concurrency=None,
+                 max_concurrency=None, max_attempts=None, backoff_base=None, backoff_max=None,
+                 timeout=None, target_latency=None, batch_size=None, batch_max_chars=None,
+                 generate_batch=generate_fake_batch, prompt_version=FAKE_PROMPT_VERSION,
+                 batch_prompt_version=FAKE_BATCH_PROMPT_VERSION):
+        self.generate = generate
+        self.generate_batch = generate_batch
+        self.prompt_version = prompt_version
+        self.batch_prompt_version = batch_prompt_version
+        self.batch_size = max(1, batch_size or config.LLM_BATCH_SIZE)
+        self.batch_max_chars = batch_max_chars or config.LLM_BATCH_MAX_CHARS
+        self.initial_concurrency = initial_concurrency or config.LLM_INITIAL_CONCURRENCY
+        self.min_concurrency = min_concurrency or config.LLM_MIN_CONCURRENCY
+        self.max_concurrency = max_concurrency or config.LLM_MAX_CONCURRENCY
+        self.max_attempts = max_attempts or config.LLM_MAX_ATTEMPTS
+        self.backoff_base = backoff_base if backoff_base is not None else config.LLM_BACKOFF_BASE_SECONDS
+        self.backoff_max = backoff_max if backoff_max is not None else config.LLM_BACKOFF_MAX_SECONDS
+        self.timeout = timeout or config.LLM_TIMEOUT_SECONDS
+        self.target_latency = target_latency or config.LLM_TARGET_LATENCY_SECONDS
+        self.stats = {'succeeded': 0, 'failed': 0, 'retries': 0, 'rate_limited': 0, 'requests': 0, 'splits': 0}
+
+    def _backoff(self, attempt):
+        # full jitter: 여러 요청이 같은 순간에 다시 몰리지 않도록 [0, base * 2^attempt] 사이에서 무작위로 기다립니다.
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def _call(self, limiter, executor, generate, argument):
+        """generate(argument, timeout)를 실행하고, 일시적 오류면 backoff 후 재시도합니다."""
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_attempts):
+            await limiter.acquire()
+            self.stats['requests'] += 1
+            started = time.monotonic()
+            try:
+                result = await loop.run_in_executor(executor, generate, argument, self.timeout)
+                limiter.on_success(time.monotonic() - started)
+                return result
+            except GenerationError as e:
+                error = e
+            except Exception as e:
+                error = GenerationError(f"[가짜뉴스 생성 실패: {e.__class__.__name__}]")
+                error.__cause__ = e
+            finally:
+                await limiter.release()
+
+            if not error.retryable or attempt == self.max_attempts - 1:
+                raise error
+            self.stats['retries'] += 1
+            delay = self._backoff(attempt)
+            if error.rate_limited:
+                self.stats['rate_limited'] += 1
+                limiter.on_overload(delay)
+            elif 'DeadlineExceeded' in error.reason or 'Timeout' in error.reason:
+                limiter.on_overload(0)
+            await asyncio.sleep(delay)
+
+    async def _generate(self, limiter, executor, batch):
+        """[(키, 원본 본문), ...] 묶음을 생성해 [(키, 결과 또는 GenerationError, 프롬프트 버전), ...]를 반환합니다."""
+        if len(batch) == 1:
+            key, real_text = batch[0]
+            try:
+                return [(key, await self._call(limiter, executor, self.generate, real_text), self.prompt_version)]
+            except GenerationError as e:
+                return [(key, e, self.prompt_version)]
+
+        try:
+            results = await self._call(limiter, executor, self.generate_batch, [text for _, text in batch])
+        except BatchParseError:
+            results = {}
+        except GenerationError as e:
+            # 재시도 한도를 넘긴 일시적 오류(429 등)는 나눠도 같으므로 묶음 전체를 실패로 처리합니다.
+            if e.retryable:
+                return [(key, e, self.batch_prompt_version) for key, _ in batch]
+            results = {}
+
+        done = [(batch[index][0], fake, self.batch_prompt_version) for index, fake in results.items() if 0 <= index < len(batch)]
+        missing = [item for index, item in enumerate(batch) if index not in results]
+        if missing:
+            self.stats['splits'] += 1
+            middle = (len(missing) + 1) // 2
+            halves = [missing[:middle], missing[middle:]] if len(missing) == len(batch) else [missing]
+            for part in await asyncio.gather(*(self._generate(limiter, executor, half) for half in halves if half)):
+                done.extend(part)
+        return done
+
+    def _make_batches(self, items):
+        """batch_size개 또는 원본 본문 합이 batch_max_chars를 넘지 않는 만큼씩 묶습니다."""
+        batches, current, chars = [], [], 0
+        for key, real_text in items:
+            if current and (len(current) >= self.batch_size or chars + len(real_text) > self.batch_max_chars):
+                batches.append(current)
+                current, chars = [], 0
+            current.append((key, real_text))
+            chars += len(real_text)
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _run(self, items, on_result, on_failure):
+        limiter = AimdLimiter(self.initial_concurrency, self.min_concurrency, self.max_concurrency, self.target_latency)
+        queue = asyncio.Queue()
+        for batch in self._make_batches(items):
+            queue.put_nowait(batch)
+
+        async def worker(executor):
+            while True:
+                try:
+                    batch = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                for key, result, prompt_version in await self._generate(limiter, executor, batch):
+                    if isinstance(result, GenerationError):
+                        self.stats['failed'] += 1
+                        await loop.run_in_executor(executor, on_failure, key, result)
+                    else:
+                        self.stats['succeeded'] += 1
+                        await loop.run_in_executor(executor, on_result, key, result, prompt_version)
+
+        loop = asyncio.get_running_loop()
+        # 콜백용 여유 스레드를 더해 둡니다. 동시 요청 수는 limiter가 제한합니다.
+        with ThreadPoolExecutor(max_workers=self.max_concurrency + 2) as executor:
+            await asyncio.gather(*(worker(executor) for _ in range(self.max_concurrency)))
+        return limiter
+
+    def run(self, items, on_result, on_failure):
+        """
+        items: [(키, 원본 본문), ...]
+        on_result(키, (가짜 제목, 가짜 본문), 프롬프트 버전), on_failure(키, GenerationError)는 스레드 풀에서 호출됩니다.
+        (묶음에서 단건 요청으로 나뉜 기사는 단건 프롬프트 버전으로 알려, 캐시 키가 실제 프롬프트와 맞게 합니다)
+        """
+        items = list(items)
+        usage_before = get_token_usage()
+        started = time.monotonic()
+        limiter = asyncio.run(self._run(items, on_result, on_failure))
+        elapsed = max(time.monotonic() - started, 1e-9)
+        usage = {key: value - usage_before[key] for key, value in get_token_usage().items()}
+        logging.info(
+            f"[LLM 엔진] 성공 {self.stats['succeeded']}건 / 실패 {self.stats['failed']}건, 요청 {self.stats['requests']}회 "
+            f"(묶음 {self.batch_size}개, 분할 {self.stats['splits']}회), "
+            f"재시도 {self.stats['retries']}회 (429/할당량 {self.stats['rate_limited']}회), {elapsed:.1f}초 "
+            f"({self.stats['succeeded'] / elapsed * 60:.1f} fakes/min), 동시 요청 최종 {int(limiter.limit)} / 최대 {int(limiter.peak)}"
+        )
+        if usage['prompt_tokens'] or usage['output_tokens']:
+            logging.info(
+                f"[LLM 엔진] 토큰 사용량: 입력 {usage['prompt_tokens']} / 출력 {usage['output_tokens']} "
+                f"(요청당 입력 {usage['prompt_tokens'] / max(usage['requests'], 1):.0f}, "
+                f"{usage['prompt_tokens'] / elapsed * 60:.0f} input tokens/min)"
+            )
+        return self.stats
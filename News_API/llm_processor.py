@@ -1,26 +1,30 @@
 # E:\workspace\News_API\llm_processor.py
 
-import pandas as pd
 import os
-import glob
 import logging
 import time
+import json
+import argparse
+from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 
 # 상대 경로로 모듈 임포트
 from .config import config
-from .api_handler import generate_fake_version
-from .file_saver import save_labeled_dataset
+from .api_handler import generate_fake_version, FAKE_PROMPT_VERSION, FAKE_BATCH_PROMPT_VERSION
+from .llm_engine import GenerationEngine
+from .llm_cache import LlmCache, cache_key
+from .prompt_compactor import PromptCompactor
+from .record_journal import RecordJournal
+from .file_saver import save_labeled_dataset, store_pairs_in_db
+from util.columnar_store import latest_file, read_table
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def process_row_to_labeled_pair(row):
+def make_labeled_pair(row, fake_title, fake_text):
     """
-    DataFrame의 한 행(Row)을 받아 '진짜'/'가짜' 데이터 쌍을 생성합니다.
+    DataFrame의 한 행(Row)과 생성된 가짜 (제목, 본문)으로 '진짜'/'가짜' 데이터 쌍을 만듭니다.
     """
-    real_text = row['기사본문']
-    
     # '진짜' 데이터 레코드 (라벨 1)
     record_real = {
         'title': row['제목'],
@@ -28,14 +32,10 @@ def process_row_to_labeled_pair(row):
         'author': row['기자'],
         'url': row['URL'],
         'publishedAt': row['게시일'],
-        'text': real_text,
+        'text': row['기사본문'],
         'label': 1  # 진짜 뉴스는 1
     }
 
-    # --- (핵심 수정 3) ---
-    # 'generate_fake_version'이 (제목, 본문)을 반환
-    fake_title, fake_text = generate_fake_version(real_text)
-    
     # '가짜' 데이터 레코드 생성 (라벨 0)
     record_fake = {
         'title': fake_title, # Gemini가 생성한 제목
@@ -46,63 +46,204 @@ def process_row_to_labeled_pair(row):
         'text': fake_text, # 클린업된 본문
         'label': 0  # 가짜 뉴스는 0
     }
-    
+
     return [record_real, record_fake]
 
-def main():
+def process_row_to_labeled_pair(row, prompt_text=None):
+    """
+    DataFrame의 한 행(Row)을 받아 '진짜'/'가짜' 데이터 쌍을 생성합니다.
+    prompt_text를 주면 원본 본문 대신 (압축된) 그 텍스트로 가짜뉴스를 생성합니다.
+    """
+    # --- (핵심 수정 3) ---
+    # 'generate_fake_version'이 (제목, 본문)을 반환
+    fake_title, fake_text = generate_fake_version(prompt_text or row['기사본문'])
+    return make_labeled_pair(row, fake_title, fake_text)
+
+def _process_rows_threads(rows_to_process, prompt_texts, on_pair):
+    """기존 방식: 스레드 10개로 처리하며, 생성 실패도 실패 문자열이 담긴 가짜 행으로 기록합니다."""
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        future_to_row = {
+            executor.submit(process_row_to_labeled_pair, row, prompt_text): row
+            for row, prompt_text in zip(rows_to_process, prompt_texts)
+        }
+        
+        for future in tqdm(as_completed(future_to_row), total=len(rows_to_process), desc="LLM 가공 처리 중"):
+            try:
+                on_pair(future_to_row[future], future.result())
+            except Exception as e:
+                row_title = future_to_row[future].get('title', '알 수 없음')
+                logging.error(f"'{row_title}' 기사 가공 중 예외 발생: {e}", exc_info=True)
+
+def _process_rows_async(rows_to_process, prompt_texts, on_pair, cache=None):
+    """
+    AIMD 엔진으로 처리합니다. 일시적 오류(429, 타임아웃 등)는 재시도하고,
+    끝내 실패한 행은 데이터셋에 넣지 않고 그 행 번호 목록을 반환합니다.
+    cache(LlmCache)가 있으면 캐시에 있는 기사는 LLM을 호출하지 않고, 새로 생성한 결과는 캐시에 저장합니다.
+    캐시 키는 실제로 프롬프트에 들어간 텍스트(prompt_texts) 기준입니다.
+    """
+    failed_rows = []
+    progress = tqdm(total=len(rows_to_process), desc="LLM 가공 처리 중")
+    # 묶음 프롬프트로 만든 결과는 단건 프롬프트 결과와 구분해 캐시합니다.
+    # 저장할 때는 엔진이 알려 준 실제 프롬프트 버전을 씁니다 (묶음에서 단건 요청으로 나뉜 기사는 단건 버전).
+    prompt_version = FAKE_BATCH_PROMPT_VERSION if config.LLM_BATCH_SIZE > 1 else FAKE_PROMPT_VERSION
+
+    def on_result(index, fake, used_prompt_version):
+        row = rows_to_process[index]
+        if cache:
+            cache.put(cache_key(prompt_texts[index], used_prompt_version), *fake)
+        on_pair(row, make_labeled_pair(row, *fake))
+        progress.update(1)
+
+    def on_failure(index, error):
+        failed_rows.append(index)
+        logging.warning(f"'{rows_to_process[index].get('제목', '알 수 없음')}' 기사 가짜뉴스 생성 실패로 제외합니다: {error.reason}")
+        progress.update(1)
+
+    pending = []
+    for index, row in enumerate(rows_to_process):
+        cached = cache.get(cache_key(prompt_texts[index], prompt_version)) if cache else None
+        if cached:
+            on_pair(row, make_labeled_pair(row, *cached))
+            progress.update(1)
+        else:
+            pending.append((index, prompt_texts[index]))
+
+    try:
+        if pending:
+            GenerationEngine().run(pending, on_result, on_failure)
+    finally:
+        progress.close()
+    return failed_rows
+
+def _journal_entry(row, pair):
+    """진짜/가짜 쌍을 저널 한 줄로 묶습니다. 한 줄 단위로 기록되므로 중단되어도 쌍이 반쪽만 남지 않습니다."""
+    published = row['게시일'] if isinstance(row['게시일'], str) else ''
+    return {'url': row['URL'], 'publishedAt': published, 'records': pair}
+
+def _iter_journal_dataset(journal):
+    """저널에서 게시일 역순으로 레코드를 하나씩 꺼냅니다 (생성 결과 전체를 메모리에 올리지 않음)."""
+    for entry in journal.iter_sorted('publishedAt', reverse=True):
+        for record in entry['records']:
+            yield record
+
+def _save_pending_run(raw_file):
+    """가공 중인 원본 파일 경로를 저장해 --resume 시 같은 파일로 이어서 진행합니다."""
+    os.makedirs(os.path.dirname(config.LLM_PENDING_PATH), exist_ok=True)
+    tmp_path = f"{config.LLM_PENDING_PATH}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'raw_file': raw_file}, f, ensure_ascii=False)
+    os.replace(tmp_path, config.LLM_PENDING_PATH)
+
+def _load_pending_run():
+    with open(config.LLM_PENDING_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)['raw_file']
+
+def _set_aside_stale_journal():
+    """--resume 없이 실행했는데 이전 저널이 남아 있으면 지우지 않고 이름을 바꿔 보관합니다."""
+    if os.path.exists(config.LLM_JOURNAL_PATH) and os.path.getsize(config.LLM_JOURNAL_PATH) > 0:
+        backup_path = f"{config.LLM_JOURNAL_PATH}.{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.bak"
+        os.replace(config.LLM_JOURNAL_PATH, backup_path)
+        logging.warning(f"이전 실행의 LLM 가공 저널을 보관했습니다: {backup_path} (이어서 하려면 --resume 옵션 사용)")
+
+def main(argv=None):
     """
     'raw_real_news...' CSV 파일을 읽어 LLM으로 가공하고
     최종 'dataset_...' CSV 파일을 생성합니다.
     """
+    parser = argparse.ArgumentParser(description="원본 뉴스 CSV로 진짜/가짜 라벨 데이터셋을 만듭니다.")
+    parser.add_argument('--no-cache', action='store_true', help="LLM 결과 캐시를 사용하지 않고 모든 기사를 새로 생성")
+    parser.add_argument('--resume', action='store_true', help="중단된 가공 작업을 저널에서 이어서 진행합니다.")
+    args = parser.parse_args(argv)
+
     logging.info("LLM을 이용한 가짜뉴스 생성(가공) 작업을 시작합니다...")
     
     if not config.GEMINI_API_KEY or config.GEMINI_API_KEY == 'YOUR_GEMINI_API_KEY_DEFAULT':
         logging.critical("GEMINI_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
         return
 
-    # 1. 최신 'raw_real_news_...' 파일 찾기
-    raw_files_path = os.path.join(config.SAVE_FOLDER_PATH, 'raw_real_news_*.csv')
-    list_of_raw_files = glob.glob(raw_files_path)
-    if not list_of_raw_files:
-        logging.warning(f"가공할 원본 뉴스 파일이 없습니다. '{raw_files_path}' 경로를 확인하세요.")
-        logging.warning("먼저 '1: 뉴스 데이터 수집'을 실행하세요.")
-        return
+    resuming = args.resume and os.path.exists(config.LLM_PENDING_PATH)
+    if args.resume and not resuming:
+        logging.warning("이어서 진행할 가공 작업이 없어 새로 시작합니다.")
+
+    # 1. 최신 'raw_real_news_...' 파일 찾기 (재개 시에는 중단된 작업의 원본 파일)
+    if resuming:
+        latest_raw_file = _load_pending_run()
+        logging.info(f"[재개] 중단된 가공 작업을 이어서 진행합니다: {latest_raw_file}")
+    else:
+        # CSV와 Parquet(OUTPUT_FORMAT=parquet) 원본 중 가장 최근 파일
+        latest_raw_file = latest_file(config.SAVE_FOLDER_PATH, 'raw_real_news')
+        if not latest_raw_file:
+            raw_files_path = os.path.join(config.SAVE_FOLDER_PATH, 'raw_real_news_*')
+            logging.warning(f"가공할 원본 뉴스 파일이 없습니다. '{raw_files_path}' 경로를 확인하세요.")
+            logging.warning("먼저 '1: 뉴스 데이터 수집'을 실행하세요.")
+            return
 
-    latest_raw_file = max(list_of_raw_files, key=os.path.getctime)
-    logging.info(f"가공할 대상 파일을 찾았습니다: {latest_raw_file}")
+        logging.info(f"가공할 대상 파일을 찾았습니다: {latest_raw_file}")
 
     try:
-        df = pd.read_csv(latest_raw_file)
+        df = read_table(latest_raw_file)
         df.dropna(subset=['기사본문'], inplace=True) # 기사 본문이 없는 행은 제거
         df = df[df['기사본문'] != '[본문 없음]'] # 크롤링 실패한 기사 제거
     except Exception as e:
         logging.error(f"원본 CSV 파일 로드 실패: {e}")
         return
 
-    processed_articles = []
-    
-    # 2. DataFrame의 각 행을 병렬로 처리
-    rows_to_process = df.to_dict('records')
-    
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        future_to_row = {executor.submit(process_row_to_labeled_pair, row): row for row in rows_to_process}
-        
-        for future in tqdm(as_completed(future_to_row), total=len(rows_to_process), desc="LLM 가공 처리 중"):
-            try:
-                processed_articles.extend(future.result())
-            except Exception as e:
-                row_title = future_to_row[future].get('title', '알 수 없음')
-                logging.error(f"'{row_title}' 기사 가공 중 예외 발생: {e}", exc_info=True)
+    if not resuming:
+        _set_aside_stale_journal()
+        _save_pending_run(latest_raw_file)
 
-    processed_articles.sort(key=lambda x: x.get('publishedAt', ''), reverse=True)
-    
-    # 3. 최종 라벨링된 데이터셋 저장
-    if processed_articles:
-        save_labeled_dataset(processed_articles, config.SAVE_FOLDER_PATH)
-    else:
-        logging.warning("최종 처리된 기사가 없어 CSV 파일을 저장하지 않습니다.")
+    # 생성이 끝난 쌍은 즉시 저널(JSONL)에 기록되므로, 중단되어도 남은 행만 다시 생성하면 됩니다.
+    journal = RecordJournal(config.LLM_JOURNAL_PATH)
+    cache = None
+    try:
+        done_urls = journal.keys()
+        rows_to_process = [row for row in df.to_dict('records') if row['URL'] not in done_urls]
+        if resuming and done_urls:
+            logging.info(f"[재개] 이미 가공한 기사 {len(df) - len(rows_to_process)}개를 건너뜁니다.")
+
+        def on_pair(row, pair):
+            journal.append(_journal_entry(row, pair))
+
+        # 프롬프트에 넣을 본문만 줄이고, 데이터셋의 '진짜' 본문은 원문 그대로 저장합니다.
+        prompt_texts = [row['기사본문'] for row in rows_to_process]
+        if config.LLM_COMPACT_ENABLED:
+            compactor = PromptCompactor(config.LLM_INPUT_TOKEN_BUDGET)
+            prompt_texts = [compactor.compact(text) for text in prompt_texts]
+            compactor.report()
+
+        # 2. DataFrame의 각 행을 병렬로 처리
+        failed_rows = []
+        if config.LLM_ENGINE == 'threads':
+            _process_rows_threads(rows_to_process, prompt_texts, on_pair)
+        else:
+            # 캐시는 재시도 끝에 성공한 결과만 저장하는 async 엔진에서만 사용합니다 (threads는 실패 문자열도 결과로 반환).
+            if config.LLM_CACHE_ENABLED and not args.no_cache:
+                cache = LlmCache(config.LLM_CACHE_PATH, int(config.LLM_CACHE_MAX_MB * 1024 * 1024))
+            failed_rows = _process_rows_async(rows_to_process, prompt_texts, on_pair, cache)
+
+        # 3. 최종 라벨링된 데이터셋 저장 (저널에서 게시일 역순으로 스트리밍)
+        saved_file = save_labeled_dataset(_iter_journal_dataset(journal), config.SAVE_FOLDER_PATH)
+        if saved_file and config.ARTICLE_DB_ENABLED:
+            store_pairs_in_db(entry['records'] for entry in journal.iter_records())
+        if saved_file and failed_rows:
+            # 저널과 작업 기록을 남겨 두면 --resume 시 실패한 기사만 다시 생성해 전체 데이터셋을 새로 저장합니다.
+            logging.warning(f"{len(failed_rows)}개 기사는 재시도 후에도 생성에 실패해 이번 데이터셋에서 제외했습니다. "
+                            f"'python -m News_API.llm_processor --resume'으로 실패한 기사만 다시 시도할 수 있습니다.")
+        elif saved_file:
+            journal.remove()
+            os.remove(config.LLM_PENDING_PATH)
+        else:
+            logging.warning("최종 처리된 기사가 없어 CSV 파일을 저장하지 않습니다.")
+
+        logging.info("LLM을 이용한 가공 작업이 성공적으로 완료되었습니다.")
 
-    logging.info("LLM을 이용한 가공 작업이 성공적으로 완료되었습니다.")
+    except KeyboardInterrupt:
+        logging.warning("사용자에 의해 중단되었습니다. 'python -m News_API.llm_processor --resume'으로 이어서 진행할 수 있습니다.")
+    finally:
+        journal.close()
+        if cache:
+            cache.report()
+            cache.close()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,29 +1,45 @@
 # E:\workspace\News_API\main.py
 
+import os
+import json
 import time
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import threading
+from datetime import datetime
+from collections import deque
+from urllib.parse import urlparse
 from tqdm import tqdm
 
 # 상대 경로로 모듈 임포트
 # --- (핵심 수정 3) config 객체 하나만 임포트 ---
 from .config import config 
-from .api_handler import fetch_articles, generate_fake_version
-from .crawler import crawl_article
-from .file_saver import save_raw_real_news, save_feedback_template_csv
+from .api_handler import fetch_articles_page, generate_fake_version
+from .crawler import crawl_article, get_selector_stats, SITE_SPECIFIC_SELECTORS
+from .async_collector import collect_articles_async
+from .http_client import log_pool_stats
+from .url_index import UrlIndex
+from .query_planner import QueryPlanner
+from .date_windows import WindowPlanner, covered_since, note_gap
+from .feed_discovery import FeedDiscovery
+from .crawl_scheduler import DomainScheduler
+from .record_journal import RecordJournal
+from .crawl_pipeline import TwoStageCrawler
+from .file_saver import save_raw_real_news, save_feedback_template_csv, store_articles_in_db
+from util.near_dup import NearDupIndex, filter_near_duplicates
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def process_article(article):
-    """(1. 수집 단계) '진짜 뉴스' 기사 1개를 크롤링하고 데이터 정리"""
+FEED_QUERY = '[RSS/사이트맵]'
+
+def make_record(article, real_text, author_name_from_crawl):
+    """News API 기사 정보와 크롤링 결과를 합쳐 '진짜 뉴스' 레코드를 만듭니다."""
     url = article.get('url', '')
     original_title = article.get('title', '')
     source_name = article.get('source', {}).get('name', '')
     published_at = article.get('publishedAt', '')
     author_name_from_api = article.get('author', None)
 
-    real_text, author_name_from_crawl = crawl_article(url)
-    
     final_author_name = author_name_from_crawl
     if author_name_from_crawl == '[기자 정보 없음]' and author_name_from_api:
         final_author_name = author_name_from_api
@@ -35,70 +51,439 @@ def process_article(article):
     
     return record_real
 
-def main():
+def process_article(article):
+    """(1. 수집 단계) '진짜 뉴스' 기사 1개를 크롤링하고 데이터 정리"""
+    real_text, author_name_from_crawl = crawl_article(article.get('url', ''))
+    return make_record(article, real_text, author_name_from_crawl)
+
+def start_crawl(journal, progress, max_pending=None, on_record=None):
+    """
+    본문 크롤러를 시작하고 (submit(기사), finish()) 함수 쌍을 반환합니다.
+    도메인별 동시 요청 제한/backoff가 적용된 스케줄러를 사용하므로 느린 도메인이 전체를 막지 않습니다.
+    완료된 레코드는 메모리에 모으지 않고 즉시 journal에 추가한 뒤 on_record(레코드)를 호출합니다.
+    CRAWL_PIPELINE=process이면 다운로드(스레드)와 본문 추출(프로세스 풀)을 분리해 실행합니다.
+    max_pending을 주면 크롤링 대기 기사가 그 수를 넘을 때 submit()이 블록됩니다.
+    """
+    def write_record(record):
+        journal.append(record)
+        if on_record:
+            on_record(record)
+
+    if config.CRAWL_PIPELINE == 'process':
+        def on_result(article, real_text, author_name_from_crawl):
+            write_record(make_record(article, real_text, author_name_from_crawl))
+            progress.update(1)
+
+        crawler = TwoStageCrawler(on_result, max_pending=max_pending)
+        return crawler.submit, crawler.join
+
+    def on_done(record, error):
+        if error:
+            logging.error(f"기사 크롤링 중 예외 발생: {error}", exc_info=error)
+        else:
+            write_record(record)
+        progress.update(1)
+
+    scheduler = DomainScheduler(
+        max_workers=config.CRAWL_WORKERS,
+        per_domain_limit=config.CRAWL_PER_DOMAIN_LIMIT,
+        backoff_base=config.CRAWL_BACKOFF_BASE_SECONDS,
+        backoff_max=config.CRAWL_BACKOFF_MAX_SECONDS,
+        is_failure=lambda record: record.get('text') == '[본문 없음]',
+        max_pending=max_pending,
+    )
+
+    def submit(article):
+        domain = urlparse(article.get('url', '')).netloc
+        scheduler.submit(domain, process_article, article, callback=on_done)
+
+    def finish():
+        scheduler.join()
+        scheduler.report()
+
+    return submit, finish
+
+def _save_selector_stats():
+    selector_stats = get_selector_stats()
+    if selector_stats:
+        selector_stats.save()
+        selector_stats.report()
+
+def crawl_articles(articles, journal):
+    """기사 목록 전체를 크롤링해 journal에 기록합니다."""
+    progress = tqdm(total=len(articles), desc="뉴스 크롤링 처리 중", unit="article")
+    submit, finish = start_crawl(journal, progress)
+    for article in articles:
+        submit(article)
+    finish()
+    progress.close()
+    _save_selector_stats()
+
+def _update_watermarks(url_index, articles_by_query, gaps=None):
+    """
+    검색어별로 이번에 본 가장 최근 publishedAt을 워터마크로 저장합니다.
+    다음 실행은 '워터마크 ~ 현재'만 조회하므로, 그 사이에 놓친 기사가 없도록 워터마크를 아래 시각까지만 올립니다.
+    - gaps({검색어: 시각}): PAGE_LIMIT에서 잘렸거나 API 요청이 실패한 구간에서 빠짐없이 받은 시작 시각
+    - 본문 크롤링에 실패해 URL 인덱스에 들어가지 않은 기사의 publishedAt (다음 실행에서 다시 받아 크롤링)
+    (URL 인덱스를 갱신한 뒤에 호출해야 합니다. 워터마크는 뒤로 가지 않습니다)
+    """
+    for query, articles in articles_by_query.items():
+        dated = [a for a in articles if a.get('publishedAt') and a.get('url')]
+        unseen_urls = url_index.filter_unseen(a['url'] for a in dated)
+        published = [a['publishedAt'] for a in dated if a['url'] not in unseen_urls]
+        if not published:
+            continue
+        limits = [a['publishedAt'] for a in dated if a['url'] in unseen_urls]
+        if gaps and query in gaps:
+            limits.append(gaps[query])
+        url_index.update_watermark(query, min([max(published)] + limits))
+
+def build_scan_plan(url_index=None, planner=None, windows=None):
+    """
+    검색어별로 조회할 날짜 범위 목록을 만듭니다.
+    증분 수집 모드에서 워터마크가 있는 검색어는 '워터마크 ~ 현재' 구간 하나만 조회합니다.
+    planner가 있으면 과거 요청당 새 기사 수가 높은 검색어부터 조회합니다.
+    windows가 있으면 검색어별로 학습된 날짜 구간을 사용합니다.
+    """
+    now = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+    queries = planner.order(config.QUERIES) if planner else config.QUERIES
+    scan_plan = {}
+    for query in queries:
+        watermark = url_index.get_watermark(query) if url_index else None
+        if watermark:
+            scan_plan[query] = [{"from_date": watermark, "to_date": now}]
+        elif windows:
+            scan_plan[query] = windows.plan(query)
+        else:
+            scan_plan[query] = list(config.DATE_RANGES_TO_SCAN)
+    return scan_plan
+
+def _describe_scan_plan(scan_plan):
+    """조회 계획의 크기 ('N개 검색어, (검색어, 날짜 범위) M쌍')"""
+    pairs = sum(len(date_ranges) for date_ranges in scan_plan.values())
+    return f"{len(scan_plan)}개 검색어, (검색어, 날짜 범위) {pairs}쌍"
+
+def _make_query_planner(url_index=None):
+    """QUERY_PLANNER_ENABLED일 때만 검색어 계획기를 만듭니다."""
+    if not config.QUERY_PLANNER_ENABLED:
+        return None
+    return QueryPlanner(config.QUERY_PLANNER_PATH, config.QUERY_MIN_YIELD, known_index=url_index)
+
+def _make_window_planner():
+    """ADAPTIVE_WINDOWS일 때만 적응형 날짜 구간 계획기를 만듭니다."""
+    if not config.ADAPTIVE_WINDOWS:
+        return None
+    return WindowPlanner(
+        config.ADAPTIVE_WINDOWS_PATH, config.DATE_RANGES_TO_SCAN, config.PAGE_SIZE, config.SORT_BY,
+        config.ADAPTIVE_MIN_WINDOW_HOURS, config.ADAPTIVE_MAX_SPLITS,
+    )
+
+def _finish_planners(planner, windows):
+    for finished in (planner, windows):
+        if finished:
+            finished.report()
+            finished.save()
+
+def collect_articles_sync(scan_plan, on_page=None, planner=None, windows=None, gaps=None):
+    """
+    scan_plan({검색어: [날짜 범위, ...]})을 순서대로 조회해 {검색어: [기사, ...]}로 반환합니다.
+    on_page가 주어지면 페이지를 받을 때마다 on_page(검색어, 페이지 기사)를 호출합니다.
+    planner(QueryPlanner)가 새 URL 비율이 낮다고 판단하면 다음 페이지를 요청하지 않습니다.
+    windows(WindowPlanner)가 있으면 PAGE_LIMIT에서 잘린 구간을 하위 구간으로 나눠 바로 이어서 조회합니다.
+    gaps(dict)가 주어지면 끝까지 받지 못한 구간을 note_gap으로 기록합니다 (워터마크 계산용).
+    """
+    articles_by_query = {}
+    for query in tqdm(scan_plan, desc="전체 카테고리 진행", unit="query"):
+        logging.info(f"'{query}' 카테고리 뉴스 수집 시작...")
+        query_articles = articles_by_query.setdefault(query, [])
+        pending_ranges = deque(scan_plan[query])
+        while pending_ranges:
+            date_range = pending_ranges.popleft()
+            from_date = date_range["from_date"]
+            to_date = date_range["to_date"]
+            range_articles = []
+            truncated = False
+            failed = False
+            for page_num in range(1, config.PAGE_LIMIT + 1):
+                articles_per_page, status, _ = fetch_articles_page(
+                    query, config.LANGUAGE, config.SOURCES, config.SORT_BY, config.PAGE_SIZE,
+                    from_date=from_date, to_date=to_date, page=page_num
+                )
+                if status is None or status >= 400:
+                    failed = True
+                    break
+                keep_paging = planner.record_page(query, articles_per_page) if planner else True
+                if articles_per_page:
+                    range_articles.extend(articles_per_page)
+                    if on_page:
+                        on_page(query, articles_per_page)
+                else:
+                    break 
+                if not keep_paging:
+                    break
+                truncated = page_num == config.PAGE_LIMIT and len(articles_per_page) >= config.PAGE_SIZE
+                time.sleep(1)
+            query_articles.extend(range_articles)
+            follow_up = windows.complete(query, date_range, range_articles, truncated) if windows else []
+            pending_ranges.extendleft(reversed(follow_up))
+            if failed or (truncated and not follow_up):
+                note_gap(gaps, query, covered_since(date_range, range_articles, config.SORT_BY))
+        time.sleep(2)
+    return articles_by_query
+
+def _make_feed_discovery(url_index=None):
+    """DISCOVERY_MODE가 'feeds' 또는 'both'일 때만 RSS/사이트맵 수집기를 만듭니다."""
+    if config.DISCOVERY_MODE not in ('feeds', 'both'):
+        return None
+    return FeedDiscovery(
+        config.FEED_STATE_PATH, SITE_SPECIFIC_SELECTORS, feed_urls=config.FEED_URLS,
+        max_feeds_per_domain=config.FEED_MAX_PER_DOMAIN, max_age_days=config.FEED_MAX_AGE_DAYS,
+        sitemap_children=config.FEED_SITEMAP_CHILDREN, rediscover_days=config.FEED_REDISCOVER_DAYS,
+        workers=config.FEED_WORKERS, max_undated=config.FEED_MAX_UNDATED, known_index=url_index,
+    )
+
+def collect_unique_articles(url_index=None, feeds=None, gaps=None):
+    """
+    News API(와 RSS/사이트맵 피드)로 기사 목록을 수집해 URL 기준으로 중복을 제거합니다.
+    (고유 기사 목록, {검색어: [기사, ...]})를 반환하고, 끝까지 받지 못한 구간은 gaps에 기록합니다.
+    """
+    articles_by_query = {}
+    if config.DISCOVERY_MODE != 'feeds':
+        planner = _make_query_planner(url_index)
+        windows = _make_window_planner()
+        scan_plan = build_scan_plan(url_index, planner, windows)
+        
+        # 계획기/적응형 구간/워터마크가 반영된 실제 조회 계획의 크기를 알립니다.
+        print(f"총 {_describe_scan_plan(scan_plan)}, 범위당 최대 {config.PAGE_LIMIT}페이지 수집을 시작합니다.")
+        
+        if config.ASYNC_COLLECTION:
+            articles_by_query = collect_articles_async(scan_plan, planner=planner, windows=windows, gaps=gaps)
+        else:
+            articles_by_query = collect_articles_sync(scan_plan, planner=planner, windows=windows, gaps=gaps)
+        _finish_planners(planner, windows)
+
+    feed_articles = feeds.discover() if feeds else []
+    all_articles = [article for articles in articles_by_query.values() for article in articles] + feed_articles
+    unique_articles = list({article['url']: article for article in all_articles}.values())
+    logging.info(f"총 {len(unique_articles)}개의 고유한 원본 기사를 가져왔습니다.")
+
+    if url_index:
+        unseen_urls = url_index.filter_unseen(article['url'] for article in unique_articles)
+        skipped = len(unique_articles) - len(unseen_urls)
+        unique_articles = [article for article in unique_articles if article['url'] in unseen_urls]
+        logging.info(f"[증분 수집] 이미 수집한 기사 {skipped}개를 건너뜁니다. 새 기사: {len(unique_articles)}개")
+
+    return unique_articles, articles_by_query
+
+def collect_and_crawl(url_index, journal, feeds=None, gaps=None):
+    """
+    News API 페이지를 받는 즉시 URL 중복 제거 후 크롤러에 넘겨, API 수집과 본문 크롤링을 겹쳐 실행합니다.
+    크롤링 대기 기사가 CRAWL_QUEUE_SIZE를 넘으면 API 수집도 잠시 멈춥니다 (backpressure).
+    feeds가 있으면 RSS/사이트맵 기사를 먼저 크롤러에 넘깁니다.
+    (고유 기사 목록, {검색어: [기사, ...]})를 반환하고, 끝까지 받지 못한 구간은 gaps에 기록합니다.
+    """
+    started = time.monotonic()
+    first_record_seconds = []
+    lock = threading.Lock()
+    seen_urls = set()
+    unique_articles = []
+    skipped = 0
+
+    progress = tqdm(total=0, desc="뉴스 크롤링 처리 중 (API 수집 병행)", unit="article")
+
+    def on_record(record):
+        if not first_record_seconds:
+            first_record_seconds.append(time.monotonic() - started)
+
+    submit, finish = start_crawl(journal, progress, max_pending=config.CRAWL_QUEUE_SIZE, on_record=on_record)
+
+    def on_page(query, page_articles):
+        nonlocal skipped
+        with lock:
+            new_articles = []
+            for article in page_articles:
+                url = article.get('url')
+                if url and url not in seen_urls:
+                    seen_urls.add(url)
+                    new_articles.append(article)
+            if url_index and new_articles:
+                unseen_urls = url_index.filter_unseen(article['url'] for article in new_articles)
+                skipped += len(new_articles) - len(unseen_urls)
+                new_articles = [article for article in new_articles if article['url'] in unseen_urls]
+            unique_articles.extend(new_articles)
+            progress.total += len(new_articles)
+            progress.refresh()
+        # 크롤링 큐가 가득 차 있으면 여기서 블록되어 API 수집도 함께 쉬게 됩니다.
+        for article in new_articles:
+            submit(article)
+
+    try:
+        articles_by_query = {}
+        if feeds:
+            on_page(FEED_QUERY, feeds.discover())
+        if config.DISCOVERY_MODE != 'feeds':
+            planner = _make_query_planner(url_index)
+            windows = _make_window_planner()
+            scan_plan = build_scan_plan(url_index, planner, windows)
+            # 진행 표시줄이 이미 떠 있으므로 tqdm.write로 줄을 깨뜨리지 않고 출력합니다.
+            tqdm.write(f"총 {_describe_scan_plan(scan_plan)}, 범위당 최대 {config.PAGE_LIMIT}페이지 수집과 크롤링을 함께 시작합니다.")
+            if config.ASYNC_COLLECTION:
+                articles_by_query = collect_articles_async(scan_plan, on_page=on_page, planner=planner, windows=windows, gaps=gaps)
+            else:
+                articles_by_query = collect_articles_sync(scan_plan, on_page=on_page, planner=planner, windows=windows, gaps=gaps)
+            _finish_planners(planner, windows)
+        logging.info(f"[겹쳐 실행] API 수집 완료 ({time.monotonic() - started:.1f}초). 총 {len(unique_articles)}개의 고유한 원본 기사, 남은 크롤링을 기다립니다...")
+        if url_index:
+            logging.info(f"[증분 수집] 이미 수집한 기사 {skipped}개를 건너뛰었습니다.")
+        # API 수집이 끝나면 기사 목록을 저장해, 남은 크롤링 도중 중단되어도 --resume으로 이어서 할 수 있습니다.
+        if unique_articles:
+            save_feedback_template_csv(unique_articles, config.SAVE_FOLDER_PATH)
+            _save_pending_articles(unique_articles)
+    finally:
+        finish()
+        progress.close()
+    _save_selector_stats()
+
+    if first_record_seconds:
+        logging.info(f"[겹쳐 실행] 첫 레코드까지 {first_record_seconds[0]:.1f}초, 전체 {time.monotonic() - started:.1f}초")
+    return unique_articles, articles_by_query
+
+def _save_pending_articles(articles):
+    """크롤링할 기사 목록을 저장해 --resume 시 News API를 다시 호출하지 않도록 합니다."""
+    os.makedirs(os.path.dirname(config.CRAWL_PENDING_PATH), exist_ok=True)
+    tmp_path = f"{config.CRAWL_PENDING_PATH}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(articles, f, ensure_ascii=False)
+    os.replace(tmp_path, config.CRAWL_PENDING_PATH)
+
+def _load_pending_articles():
+    with open(config.CRAWL_PENDING_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _set_aside_stale_journal():
+    """--resume 없이 실행했는데 이전 저널이 남아 있으면 지우지 않고 이름을 바꿔 보관합니다."""
+    if os.path.exists(config.CRAWL_JOURNAL_PATH) and os.path.getsize(config.CRAWL_JOURNAL_PATH) > 0:
+        backup_path = f"{config.CRAWL_JOURNAL_PATH}.{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.bak"
+        os.replace(config.CRAWL_JOURNAL_PATH, backup_path)
+        logging.warning(f"이전 실행의 크롤링 저널을 보관했습니다: {backup_path} (이어서 하려면 --resume 옵션 사용)")
+
+def drop_near_duplicates(records, dropped_urls):
+    """
+    본문이 이미 수집한 기사(이전 실행 포함)와 거의 같은 전재 기사를 빼고 내보냅니다.
+    뺀 기사의 URL은 dropped_urls에 모읍니다. (URL 인덱스에는 그대로 넣어 다시 크롤링하지 않음)
+    """
+    index = NearDupIndex(config.NEAR_DUP_INDEX_PATH, config.NEAR_DUP_THRESHOLD)
+
+    def on_duplicate(record, match):
+        dropped_urls.add(record.get('url'))
+        logging.debug(f"[유사 중복] {record.get('url')} ~ {match[0]} (유사도 {match[1]:.2f})")
+
+    try:
+        yield from filter_near_duplicates(records, index, lambda r: r.get('text'), lambda r: r.get('url'), on_duplicate)
+        logging.info(
+            f"[유사 중복] 기사 {index.stats['checked']}개 중 {index.stats['duplicates']}개를 전재/유사 중복으로 제외했습니다 "
+            f"(유사도 {config.NEAR_DUP_THRESHOLD} 이상, 인덱스 누적 {index.count()}개)"
+        )
+    finally:
+        index.close()
+
+def main(argv=None):
     """메인 실행 함수 (데이터 수집 전용)"""
+    parser = argparse.ArgumentParser(description="News API로 원본 뉴스 데이터를 수집합니다.")
+    parser.add_argument('--resume', action='store_true', help="중단된 크롤링을 저널에서 이어서 진행합니다.")
+    args = parser.parse_args(argv)
+
     logging.info("원본 뉴스 데이터 수집을 시작합니다...")
+    resuming = args.resume and os.path.exists(config.CRAWL_PENDING_PATH)
+    if args.resume and not resuming:
+        logging.warning("이어서 진행할 크롤링 작업이 없어 새로 수집합니다.")
     
-    if not config.NEWS_API_KEY or config.NEWS_API_KEY == 'YOUR_NEWS_API_KEY_DEFAULT':
+    uses_news_api = config.DISCOVERY_MODE != 'feeds'
+    if not resuming and uses_news_api and (not config.NEWS_API_KEY or config.NEWS_API_KEY == 'YOUR_NEWS_API_KEY_DEFAULT'):
         logging.critical("NEWS_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
         return
 
+    url_index = UrlIndex(config.URL_INDEX_PATH) if config.INCREMENTAL_COLLECTION else None
+    feeds = None if resuming else _make_feed_discovery(url_index)
+    journal = None
     try:
-        all_articles = []
-        
-        # --- (핵심 수정 4) config.QUERIES, config.DATE_RANGES_TO_SCAN 등으로 접근 ---
-        print(f"총 {len(config.QUERIES)}개 검색어, {len(config.DATE_RANGES_TO_SCAN)}개 날짜 범위, 최대 {config.PAGE_LIMIT}페이지 수집을 시작합니다.")
-        
-        for query in tqdm(config.QUERIES, desc="전체 카테고리 진행", unit="query"):
-            logging.info(f"'{query}' 카테고리 뉴스 수집 시작...")
-            for date_range in config.DATE_RANGES_TO_SCAN:
-                from_date = date_range["from_date"]
-                to_date = date_range["to_date"]
-                for page_num in range(1, config.PAGE_LIMIT + 1):
-                    articles_per_page = fetch_articles(
-                        query, config.LANGUAGE, config.SOURCES, config.SORT_BY, config.PAGE_SIZE,
-                        from_date=from_date, to_date=to_date, page=page_num
-                    )
-                    if articles_per_page:
-                        all_articles.extend(articles_per_page)
-                    else:
-                        break 
-                    time.sleep(1)
-            time.sleep(2)
-
-        unique_articles = list({article['url']: article for article in all_articles}.values())
-        logging.info(f"총 {len(unique_articles)}개의 고유한 원본 기사를 가져왔습니다.")
-
-        if not unique_articles:
-            logging.warning("처리할 고유 기사가 없습니다.")
-            return
-
-        save_feedback_template_csv(unique_articles, config.SAVE_FOLDER_PATH)
-
-        logging.info("이제 각 기사의 본문을 크롤링합니다...")
-        collected_articles = []
-        batches = [unique_articles[i:i + config.BATCH_SIZE] for i in range(0, len(unique_articles), config.BATCH_SIZE)]
-
-        for i, batch in enumerate(tqdm(batches, desc="뉴스 크롤링 처리 중", unit="batch")):
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                future_to_article = {executor.submit(process_article, article): article for article in batch}
-                for future in as_completed(future_to_article):
-                    try:
-                        collected_articles.append(future.result())
-                    except Exception as e:
-                        logging.error(f"기사 크롤링 중 예외 발생: {e}", exc_info=True)
-
-        collected_articles.sort(key=lambda x: x.get('publishedAt', ''), reverse=True)
-        
-        if collected_articles:
-            save_raw_real_news(collected_articles, config.SAVE_FOLDER_PATH)
+        articles_by_query = None
+        gaps = {}
+        if resuming:
+            unique_articles = _load_pending_articles()
+            logging.info(f"[재개] 저장된 기사 목록 {len(unique_articles)}개로 크롤링을 이어서 진행합니다.")
         else:
+            _set_aside_stale_journal()
+            if config.OVERLAPPED_COLLECTION:
+                # API 페이지를 받는 대로 크롤링까지 끝내므로 아래 크롤링 단계에서는 남은 기사가 없습니다.
+                journal = RecordJournal(config.CRAWL_JOURNAL_PATH)
+                unique_articles, articles_by_query = collect_and_crawl(url_index, journal, feeds, gaps)
+            else:
+                unique_articles, articles_by_query = collect_unique_articles(url_index, feeds, gaps)
+
+            if not unique_articles:
+                logging.warning("처리할 고유 기사가 없습니다.")
+                if url_index:
+                    _update_watermarks(url_index, articles_by_query, gaps)
+                if feeds:
+                    feeds.save()
+                return
+
+            if not config.OVERLAPPED_COLLECTION:
+                save_feedback_template_csv(unique_articles, config.SAVE_FOLDER_PATH)
+                _save_pending_articles(unique_articles)
+
+        # 크롤링이 끝난 기사는 즉시 저널(JSONL)에 기록되므로, 중단되어도 남은 기사만 다시 크롤링하면 됩니다.
+        journal = journal or RecordJournal(config.CRAWL_JOURNAL_PATH)
+        done_urls = journal.keys()
+        remaining_articles = [article for article in unique_articles if article.get('url') not in done_urls]
+        if resuming and done_urls:
+            logging.info(f"[재개] 이미 크롤링한 기사 {len(unique_articles) - len(remaining_articles)}개를 건너뜁니다.")
+
+        if remaining_articles:
+            logging.info("이제 각 기사의 본문을 크롤링합니다...")
+            crawl_articles(remaining_articles, journal)
+
+        # 저널에서 게시일 역순으로 스트리밍하여 최종 CSV를 만듭니다 (본문 전체를 메모리에 올리지 않음)
+        dropped_urls = set()
+        records = journal.iter_sorted('publishedAt', reverse=True)
+        if config.NEAR_DUP_ENABLED:
+            records = drop_near_duplicates(records, dropped_urls)
+        saved_file = save_raw_real_news(records, config.SAVE_FOLDER_PATH)
+        if not saved_file:
             logging.warning("최종 수집된 기사가 없어 CSV 파일을 저장하지 않습니다.")
+        elif config.ARTICLE_DB_ENABLED:
+            store_articles_in_db(r for r in journal.iter_records() if r.get('url') not in dropped_urls)
+
+        # 원본 CSV가 저장된 뒤에만 인덱스/워터마크를 갱신합니다 (실패 시 다음 실행에서 다시 수집)
+        # 본문 크롤링에 실패한 기사는 인덱스에 넣지 않고 워터마크도 그 기사 이전까지만 올려 다음 실행에서 다시 시도합니다.
+        if url_index and saved_file:
+            url_index.add_many(r for r in journal.iter_records() if r.get('text') != '[본문 없음]')
+            if articles_by_query:
+                _update_watermarks(url_index, articles_by_query, gaps)
+            logging.info(f"[증분 수집] URL 인덱스 갱신 완료 (누적 {url_index.count()}개)")
+
+        # 피드의 조건부 요청 헤더/워터마크도 CSV가 저장된 뒤에만 저장합니다 (실패 시 다음 실행에서 같은 기사를 다시 받음)
+        # 본문 크롤링에 실패한 피드 기사가 있으면 피드 워터마크도 그 기사 전까지만 올립니다.
+        if feeds and saved_file:
+            feeds.save(r.get('url') for r in journal.iter_records() if r.get('text') == '[본문 없음]')
+
+        if saved_file:
+            journal.remove()
+            os.remove(config.CRAWL_PENDING_PATH)
 
+        log_pool_stats()
         logging.info("원본 뉴스 데이터 수집이 성공적으로 완료되었습니다.")
 
+    except KeyboardInterrupt:
+        logging.warning("사용자에 의해 중단되었습니다. 'python -m News_API.main --resume'으로 이어서 진행할 수 있습니다.")
     except Exception as e:
         logging.critical(f"프로세스 실행 중 치명적인 오류 발생: {e}", exc_info=True)
+    finally:
+        if journal:
+            journal.close()
+        if url_index:
+            url_index.close()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
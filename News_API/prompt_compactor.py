@@ -0,0 +1,106 @@
+# E:\workspace\News_API\prompt_compactor.py
+
+import re
+import math
+import logging
+
+_SENTENCE_END = re.compile(r'(?<=[.!?。”"])\s+')
+_URL = re.compile(r'(https?://|www\.)\S+')
+_EMAIL = re.compile(r'\S+@\S+\.\S+')
+_HASHTAGS = re.compile(r'(?:^|\s)(?:#[^\s#]+\s*){2,}$')
+_WHITESPACE = re.compile(r'\s+')
+_HANGUL = re.compile(r'[가-힣]')
+
+# <p> 폴백으로 함께 긁힌 구독 안내, 저작권 문구, 공유 버튼 등. 긴 문장은 본문일 수 있어 짧은 문장에만 적용합니다.
+# '카카오톡', '페이스북', '구독' 같은 단어는 실제 기사 문장에도 나오므로 단어가 아니라 상투 문구의 형태로만 찾습니다.
+_BOILERPLATE = re.compile(
+    r'무단\s*전재|재배포\s*금지|저작권자\s*[ⓒ©(]|copyright\s*(?:ⓒ|©|\(c\)|\d{4})|ⓒ|©|all rights reserved|'
+    r'구독하기|구독\s*신청|뉴스레터\s*(?:구독|신청)|제보하기|기사\s*제보|'
+    r'(?:카카오톡|카톡|페이스북|facebook|twitter|트위터|linkedin)\s*(?:으로\s*|에\s*)?(?:공유|제보|채널\s*추가)|'
+    r'공유하기|like this|loading\.\.\.|앱\s*다운(?:로드)?\s*받기|바로가기$|'
+    r'^관련\s*기사(?:\s*[:▶>].*)?$|^많이\s*본\s*(?:뉴스|기사)|^▶|^☞|^related$',
+    re.IGNORECASE
+)
+BOILERPLATE_MAX_CHARS = 200
+
+def estimate_tokens(text):
+    """
+    Gemini 입력 토큰 수의 근사값입니다 (한글 약 1.4자, 그 외 약 4자당 1토큰).
+    실제 사용량은 응답의 usage_metadata로 따로 집계됩니다.
+    """
+    if not text:
+        return 0
+    hangul = len(_HANGUL.findall(text))
+    return math.ceil(hangul / 1.4 + (len(text) - hangul) / 4)
+
+def split_sentences(text):
+    return [sentence.strip() for sentence in _SENTENCE_END.split(text) if sentence.strip()]
+
+def strip_boilerplate(text):
+    """URL/이메일/해시태그를 지우고, 짧은 상투 문장과 반복된 문장을 제거합니다."""
+    text = _URL.sub(' ', text)
+    text = _EMAIL.sub(' ', text)
+    text = _HASHTAGS.sub(' ', text)
+    kept, seen = [], set()
+    for sentence in split_sentences(_WHITESPACE.sub(' ', text)):
+        if len(sentence) <= BOILERPLATE_MAX_CHARS and _BOILERPLATE.search(sentence):
+            continue
+        if sentence in seen:
+            continue
+        seen.add(sentence)
+        kept.append(sentence)
+    return ' '.join(kept)
+
+def trim_to_budget(text, token_budget):
+    """기사 앞부분(리드)부터 문장 단위로 token_budget 안에 들어가는 만큼만 남깁니다."""
+    if estimate_tokens(text) <= token_budget:
+        return text
+    kept, used = [], 0
+    for sentence in split_sentences(text):
+        tokens = estimate_tokens(sentence)
+        if used + tokens > token_budget:
+            if not kept:
+                # 첫 문장부터 예산을 넘으면 글자 수 비율로 자릅니다.
+                kept.append(sentence[:max(1, int(len(sentence) * token_budget / tokens))])
+            break
+        kept.append(sentence)
+        used += tokens
+    return ' '.join(kept)
+
+class PromptCompactor:
+    """
+    LLM에 보내기 전에 원본 본문을 줄입니다. (데이터셋의 '진짜' 본문은 그대로 둡니다)
+    상투 문구 제거 후 token_budget(근사 토큰 수)을 넘으면 앞부분부터 문장 단위로 자르며,
+    전/후 토큰 수를 누적해 report()로 남깁니다.
+    """
+    def __init__(self, token_budget=1500, strip=True):
+        self.token_budget = token_budget
+        self.strip = strip
+        self.stats = {'articles': 0, 'tokens_before': 0, 'tokens_after': 0, 'stripped': 0, 'trimmed': 0}
+
+    def compact(self, text):
+        before = estimate_tokens(text)
+        compacted = strip_boilerplate(text) if self.strip else text
+        stripped_tokens = estimate_tokens(compacted)
+        if self.token_budget:
+            compacted = trim_to_budget(compacted, self.token_budget)
+        after = estimate_tokens(compacted)
+
+        self.stats['articles'] += 1
+        self.stats['tokens_before'] += before
+        self.stats['tokens_after'] += after
+        self.stats['stripped'] += stripped_tokens < before
+        self.stats['trimmed'] += after < stripped_tokens
+        # 줄일 것이 없었다면 원문을 그대로 보내 캐시 키도 바뀌지 않게 합니다.
+        return compacted if after < before else text
+
+    def report(self):
+        stats = self.stats
+        if not stats['articles']:
+            return
+        saved = stats['tokens_before'] - stats['tokens_after']
+        logging.info(
+            f"[프롬프트 압축] 기사 {stats['articles']}개, 추정 입력 토큰 {stats['tokens_before']} -> {stats['tokens_after']} "
+            f"(-{saved / max(stats['tokens_before'], 1):.0%}), 상투 문구 제거 {stats['stripped']}개, "
+            f"예산({self.token_budget}토큰) 초과로 자름 {stats['trimmed']}개"
+        )
@@ -0,0 +1,108 @@
+# E:\workspace\News_API\query_planner.py
+
+import os
+import json
+import logging
+import threading
+
+class QueryPlanner:
+    """
+    News API 요청 할당량을 아끼기 위한 검색어 계획기입니다.
+    - 페이지마다 '이번 실행에서 처음 본 URL 비율(yield)'을 계산해, min_yield 미만이면 그 (검색어, 날짜 범위)의 다음 페이지를 요청하지 않습니다.
+    - 검색어별 누적 '요청당 새 기사 수'를 파일에 저장하고, 다음 실행에서는 이 값이 높은 검색어부터 조회합니다.
+    known_index(UrlIndex)를 주면 이전 실행에서 이미 수집한 URL도 새 기사로 세지 않습니다.
+    """
+    def __init__(self, path, min_yield=0.2, known_index=None):
+        self.path = path
+        self.min_yield = min_yield
+        self.known_index = known_index
+        self._lock = threading.Lock()
+        self._seen_urls = set()
+        self._history = {}
+        self._run = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._history = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"검색어 수집 효율 파일을 읽지 못해 새로 시작합니다: {self.path} / {e}")
+            self._history = {}
+
+    def save(self):
+        """이번 실행의 통계를 누적해 저장합니다."""
+        with self._lock:
+            if not self._run:
+                return
+            for query, run in self._run.items():
+                total = self._history.setdefault(query, {'requests': 0, 'articles': 0, 'new': 0, 'early_stops': 0})
+                for key in total:
+                    total[key] += run[key]
+            self._run = {}
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._history, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+
+    def _yield_per_request(self, query):
+        stats = self._history.get(query)
+        if not stats or not stats['requests']:
+            return None
+        return stats['new'] / stats['requests']
+
+    def order(self, queries):
+        """
+        과거 요청당 새 기사 수가 높은 순서로 검색어를 정렬합니다.
+        기록이 없는 검색어는 가장 먼저 조회하고, 동률이면 원래 순서를 유지합니다.
+        """
+        with self._lock:
+            def sort_key(query):
+                value = self._yield_per_request(query)
+                return float('-inf') if value is None else -value
+            return sorted(queries, key=sort_key)
+
+    def record_page(self, query, page_articles):
+        """
+        받은 페이지를 기록하고, 같은 (검색어, 날짜 범위)의 다음 페이지를 계속 요청할지 반환합니다.
+        빈 페이지(요청 실패 포함)도 요청 1회로 기록합니다.
+        """
+        urls = [article.get('url') for article in page_articles if article.get('url')]
+        with self._lock:
+            new_urls = {url for url in urls if url not in self._seen_urls}
+            self._seen_urls.update(new_urls)
+        if self.known_index and new_urls:
+            new_urls = self.known_index.filter_unseen(new_urls)
+
+        page_yield = len(new_urls) / len(urls) if urls else 0.0
+        keep_paging = page_yield >= self.min_yield
+        with self._lock:
+            run = self._run.setdefault(query, {'requests': 0, 'articles': 0, 'new': 0, 'early_stops': 0})
+            run['requests'] += 1
+            run['articles'] += len(urls)
+            run['new'] += len(new_urls)
+            if urls and not keep_paging:
+                run['early_stops'] += 1
+        return keep_paging
+
+    def report(self, top_n=5):
+        """이번 실행의 요청당 고유 기사 수를 로그로 남깁니다. save() 전에 호출해야 합니다."""
+        with self._lock:
+            runs = dict(self._run)
+        requests_made = sum(run['requests'] for run in runs.values())
+        if not requests_made:
+            return
+        new_total = sum(run['new'] for run in runs.values())
+        early_stops = sum(run['early_stops'] for run in runs.values())
+        logging.info(
+            f"[검색어 계획] 요청 {requests_made}회, 고유 기사 {new_total}개 "
+            f"(요청당 {new_total / requests_made:.1f}개), 조기 중단 {early_stops}회 (기준 yield {self.min_yield:.0%})"
+        )
+        ranked = sorted(runs.items(), key=lambda item: item[1]['new'] / max(item[1]['requests'], 1))
+        for query, run in ranked[:top_n]:
+            logging.info(
+                f"  - 효율 낮은 검색어 '{query}': 요청 {run['requests']}회, 새 기사 {run['new']}개 / 받은 기사 {run['articles']}개"
+            )
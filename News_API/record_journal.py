@@ -0,0 +1,98 @@
+# E:\workspace\News_API\record_journal.py
+
+import os
+import json
+import threading
+
+class RecordJournal:
+    """
+    처리가 끝난 레코드를 한 줄에 하나씩(JSONL) 즉시 디스크에 추가하는 저널입니다.
+    중단된 작업을 이어서 할 때 이미 처리한 키(기본값: 'url')를 건너뛰는 데 사용합니다.
+    """
+    def __init__(self, path, key='url'):
+        self.path = path
+        self.key = key
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._repair_tail()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _repair_tail(self):
+        """비정상 종료로 마지막 줄이 잘려 있으면 마지막 줄바꿈 위치까지 잘라냅니다."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+            # 뒤에서부터 마지막 줄바꿈을 찾음
+            pos = size - 1
+            while pos > 0:
+                step = min(4096, pos)
+                f.seek(pos - step)
+                chunk = f.read(step)
+                idx = chunk.rfind(b'\n')
+                if idx != -1:
+                    f.truncate(pos - step + idx + 1)
+                    return
+                pos -= step
+            f.truncate(0)
+
+    def append(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def _iter_lines(self):
+        """(파일 오프셋, 레코드)를 순회합니다. 파싱할 수 없는 줄은 건너뜁니다."""
+        with self._lock:
+            self._file.flush()
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for raw_line in f:
+                line_offset = offset
+                offset += len(raw_line)
+                try:
+                    yield line_offset, json.loads(raw_line)
+                except ValueError:
+                    continue
+
+    def iter_records(self):
+        for _, record in self._iter_lines():
+            yield record
+
+    def keys(self):
+        """저널에 기록된 키 집합을 반환합니다."""
+        return {record.get(self.key) for record in self.iter_records()}
+
+    def count(self):
+        return sum(1 for _ in self._iter_lines())
+
+    def iter_sorted(self, sort_key, reverse=False):
+        """
+        sort_key 기준으로 정렬된 순서로 레코드를 순회합니다.
+        메모리에는 (정렬 키, 파일 오프셋)만 올리고, 레코드 본문은 파일에서 하나씩 다시 읽습니다.
+        같은 키끼리는 기록된 순서를 유지합니다 (list.sort와 동일한 안정 정렬).
+        """
+        index = [(record.get(sort_key, ''), offset) for offset, record in self._iter_lines()]
+        index.sort(key=lambda item: item[0], reverse=reverse)
+        with open(self.path, 'rb') as f:
+            for _, offset in index:
+                f.seek(offset)
+                yield json.loads(f.readline())
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def remove(self):
+        """작업이 끝난 저널 파일을 삭제합니다."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
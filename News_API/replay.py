@@ -0,0 +1,88 @@
+# E:\workspace\News_API\replay.py
+
+import os
+import logging
+import argparse
+from tqdm import tqdm
+
+# 상대 경로로 모듈 임포트
+from .config import config
+from .crawler import extract_article_from_bytes
+from .html_archive import HtmlArchive
+from .file_saver import save_raw_real_news, store_articles_in_db
+from util.columnar_store import latest_file, iter_rows
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def find_latest_raw_file():
+    return latest_file(config.SAVE_FOLDER_PATH, 'raw_real_news')
+
+def replay(raw_file, archive):
+    """
+    raw_real_news CSV의 각 행을 아카이브에 저장된 HTML로 다시 추출합니다.
+    아카이브에 없는 기사는 기존 본문/기자 정보를 그대로 유지합니다.
+    """
+    # CSV(DictReader)와 같이 빈 값은 ''인 문자열 행으로 맞춥니다.
+    rows = [{key: '' if value is None else str(value) for key, value in row.items()} for row in iter_rows(raw_file)]
+
+    records = []
+    stats = {'replayed': 0, 'missing': 0, 'changed': 0}
+    for row in tqdm(rows, desc="아카이브 재추출 중", unit="article"):
+        record = {
+            'title': row.get('제목', ''), 'source': row.get('출처', ''), 'author': row.get('기자', ''),
+            'url': row.get('URL', ''), 'publishedAt': row.get('게시일', ''), 'text': row.get('기사본문', ''),
+        }
+        archived = archive.load_content(record['url']) if record['url'] else None
+        if not archived:
+            stats['missing'] += 1
+            records.append(record)
+            continue
+
+        content, encoding = archived
+        try:
+            text, author = extract_article_from_bytes(content, encoding, record['url'])
+        except Exception as e:
+            logging.error(f"재추출 실패 - URL: {record['url']} / 오류: {e}", exc_info=True)
+            stats['missing'] += 1
+            records.append(record)
+            continue
+
+        if text != record['text']:
+            stats['changed'] += 1
+        record['text'] = text
+        # 크롤링으로 기자를 찾지 못하면 기존 값(News API의 author일 수 있음)을 유지합니다.
+        if author != '[기자 정보 없음]':
+            record['author'] = author
+        stats['replayed'] += 1
+        records.append(record)
+
+    return records, stats
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 아카이브로 기사 본문/기자 정보를 오프라인 재추출합니다.")
+    parser.add_argument('--file', type=str, help="재추출할 raw_real_news CSV/Parquet 경로 (기본값: 최신 파일)")
+    parser.add_argument('--archive', type=str, default=config.HTML_ARCHIVE_PATH, help="HTML 아카이브 폴더 경로")
+    args = parser.parse_args()
+
+    raw_file = args.file or find_latest_raw_file()
+    if not raw_file or not os.path.exists(raw_file):
+        logging.warning(f"재추출할 원본 뉴스 파일이 없습니다: {raw_file}")
+        return
+    if not os.path.isdir(args.archive):
+        logging.warning(f"HTML 아카이브 폴더가 없습니다: {args.archive} (HTML_ARCHIVE_ENABLED=true로 수집하세요)")
+        return
+
+    logging.info(f"재추출 대상 파일: {raw_file}")
+    records, stats = replay(raw_file, HtmlArchive(args.archive))
+    logging.info(
+        f"재추출 {stats['replayed']}개 (본문 변경 {stats['changed']}개), "
+        f"아카이브 없음 {stats['missing']}개"
+    )
+
+    records.sort(key=lambda x: x.get('publishedAt', ''), reverse=True)
+    saved_file = save_raw_real_news(records, config.SAVE_FOLDER_PATH)
+    if saved_file and config.ARTICLE_DB_ENABLED:
+        store_articles_in_db(records)
+
+if __name__ == '__main__':
+    main()
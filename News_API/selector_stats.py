@@ -0,0 +1,117 @@
+# E:\workspace\News_API\selector_stats.py
+
+import os
+import json
+import logging
+import threading
+
+class SelectorStats:
+    """
+    도메인(urlparse(url).netloc)별로 어떤 본문/기자 선택자가 성공했는지 기록하고,
+    과거에 가장 많이 성공한 선택자를 먼저 시도하도록 선택자 순서를 정해 줍니다.
+    본문 선택자가 모두 실패해 <p> 폴백을 쓴 횟수도 함께 기록합니다.
+    여러 프로세스가 함께 수집할 때는 각자 이번 실행의 증가분만 save_delta()로 따로 저장하고, 한 곳에서 merge()로 합칩니다.
+    """
+    def __init__(self, path, min_pages=5):
+        self.path = path
+        self.min_pages = min_pages
+        self._lock = threading.Lock()
+        self._data = {}
+        self._added = {}  # 이번 실행에서 기록한 증가분 (save_delta용)
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"선택자 통계 파일을 읽지 못해 새로 시작합니다: {self.path} / {e}")
+            self._data = {}
+
+    @staticmethod
+    def _write(path, data):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # 같은 파일을 여러 프로세스가 저장해도 임시 파일이 겹치지 않도록 pid를 붙입니다.
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self._write(self.path, self._data)
+            self._dirty = False
+
+    def save_delta(self, path):
+        """이번 실행에서 기록한 증가분만 path에 저장합니다 (분산 수집 워커용)."""
+        with self._lock:
+            if self._added:
+                self._write(path, self._added)
+
+    def merge(self, path):
+        """save_delta()로 저장한 증가분 파일을 통계에 더합니다."""
+        with open(path, 'r', encoding='utf-8') as f:
+            delta = json.load(f)
+        with self._lock:
+            for domain, added in delta.items():
+                stats = self._domain(self._data, domain)
+                stats['pages'] += added['pages']
+                stats['fallback'] += added['fallback']
+                for kind in ('body', 'author'):
+                    for selector, hits in added[kind].items():
+                        stats[kind][selector] = stats[kind].get(selector, 0) + hits
+            self._dirty = self._dirty or bool(delta)
+
+    @staticmethod
+    def _domain(data, domain):
+        return data.setdefault(domain, {'pages': 0, 'fallback': 0, 'body': {}, 'author': {}})
+
+    def order(self, domain, selectors, kind):
+        """
+        kind('body'/'author') 선택자를 성공 횟수가 많은 순서로 정렬해 반환합니다 (동률이면 원래 순서 유지).
+        관측된 페이지 수가 min_pages 미만이면 원래 순서를 그대로 사용합니다.
+        """
+        with self._lock:
+            stats = self._data.get(domain)
+            if not stats or stats['pages'] < self.min_pages:
+                return list(selectors)
+            hits = stats[kind]
+            return sorted(selectors, key=lambda selector: -hits.get(selector, 0))
+
+    def record(self, domain, body_selector, author_selector):
+        """한 페이지의 추출 결과를 기록합니다. body_selector가 None이면 <p> 폴백으로 간주합니다."""
+        with self._lock:
+            for data in (self._data, self._added):
+                stats = self._domain(data, domain)
+                stats['pages'] += 1
+                if body_selector:
+                    stats['body'][body_selector] = stats['body'].get(body_selector, 0) + 1
+                else:
+                    stats['fallback'] += 1
+                if author_selector:
+                    stats['author'][author_selector] = stats['author'].get(author_selector, 0) + 1
+            self._dirty = True
+
+    def fallback_domains(self, min_ratio=0.5):
+        """<p> 폴백 비율이 min_ratio 이상인 도메인을 (도메인, 페이지 수, 폴백 비율) 목록으로 반환합니다."""
+        with self._lock:
+            flagged = [
+                (domain, s['pages'], s['fallback'] / s['pages'])
+                for domain, s in self._data.items()
+                if s['pages'] >= self.min_pages and s['fallback'] / s['pages'] >= min_ratio
+            ]
+        return sorted(flagged, key=lambda item: item[1], reverse=True)
+
+    def report(self, top_n=10):
+        """<p> 폴백에 의존하는 도메인을 SITE_SPECIFIC_SELECTORS 추가 후보로 로그에 남깁니다."""
+        flagged = self.fallback_domains()
+        if not flagged:
+            return
+        logging.warning(f"[선택자 통계] 본문 선택자가 대부분 실패하는 도메인 {len(flagged)}개 (SITE_SPECIFIC_SELECTORS 추가 후보):")
+        for domain, pages, ratio in flagged[:top_n]:
+            logging.warning(f"  - {domain}: {pages}페이지 중 {ratio * 100:.0f}% <p> 폴백")
@@ -0,0 +1,311 @@
+# E:\workspace\News_API\sharded.py
+
+import os
+import glob
+import time
+import shutil
+import socket
+import logging
+import argparse
+import multiprocessing
+
+# 상대 경로로 모듈 임포트
+from .config import config
+from .api_handler import fetch_articles_page
+from .work_queue import WorkQueue
+from .record_journal import RecordJournal
+from .url_index import UrlIndex
+from .file_saver import save_raw_real_news, save_feedback_template_csv, store_articles_in_db
+from .crawler import get_selector_stats
+from .date_windows import covered_since, note_gap
+from .main import build_scan_plan, start_crawl, drop_near_duplicates, _update_watermarks
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+QUEUE_FILENAME = 'work_queue.sqlite3'
+
+def _open_queue(run_dir):
+    return WorkQueue(os.path.join(run_dir, QUEUE_FILENAME), config.SHARD_LEASE_SECONDS, config.SHARD_MAX_ATTEMPTS)
+
+def _api_key(task):
+    return f"{task['query']}|{task['from_date']}|{task['to_date']}|{task['page']}"
+
+def init_run(run_dir, fresh=False):
+    """
+    작업 큐를 만들고 (검색어, 날짜 범위) 그리드의 첫 페이지를 API 작업으로 등록합니다.
+    다음 페이지는 앞 페이지가 꽉 찼을 때 워커가 등록합니다.
+    날짜 범위는 실행 시각(datetime.now())에 따라 달라지므로, 이미 API 작업이 있는 큐에 다시 실행하면
+    그리드를 새로 등록하지 않고 기존 작업을 그대로 이어서 처리합니다. (처음부터 다시 하려면 fresh=True)
+    """
+    if fresh and os.path.exists(run_dir):
+        shutil.rmtree(run_dir)
+    os.makedirs(run_dir, exist_ok=True)
+
+    queue = _open_queue(run_dir)
+    counts = queue.counts()
+    if counts.get('api'):
+        logging.info(f"[분산 수집] 기존 작업 큐를 이어서 사용합니다: {run_dir} (현재 {counts})")
+        queue.close()
+        return
+
+    url_index = UrlIndex(config.URL_INDEX_PATH) if config.INCREMENTAL_COLLECTION else None
+    try:
+        scan_plan = build_scan_plan(url_index)
+    finally:
+        if url_index:
+            url_index.close()
+
+    tasks = [
+        {'query': query, 'from_date': date_range['from_date'], 'to_date': date_range['to_date'], 'page': 1}
+        for query, date_ranges in scan_plan.items() for date_range in date_ranges
+    ]
+    added = queue.add_many('api', [(_api_key(task), task) for task in tasks])
+    logging.info(f"[분산 수집] 작업 큐 준비 완료: {run_dir} (API 작업 {added}개 추가, 현재 {queue.counts()})")
+    queue.close()
+
+def _range_key(task):
+    return (task['query'], task['from_date'], task['to_date'])
+
+def _handle_api_task(queue, task_id, task, url_index, pages):
+    """
+    API 페이지 하나를 받아 기사 URL을 크롤링 작업으로, 꽉 찬 페이지면 다음 페이지를 API 작업으로 등록합니다.
+    받은 페이지의 (URL, publishedAt)과 잘림/실패 여부는 pages 저널에 남겨 merge 단계에서 워터마크를 계산합니다.
+    네트워크 오류나 5xx는 시도 횟수를 세며 다시 대기열에 넣고, SHARD_MAX_ATTEMPTS를 넘으면 failed가 됩니다.
+    """
+    page_articles, status, retry_after = fetch_articles_page(
+        task['query'], config.LANGUAGE, config.SOURCES, config.SORT_BY, config.PAGE_SIZE,
+        from_date=task['from_date'], to_date=task['to_date'], page=task['page']
+    )
+    if status == 429:
+        queue.release(task_id, retry_after or config.API_429_BACKOFF_SECONDS)
+        return
+    if status is None or status >= 500:
+        if queue.release(task_id, config.API_429_BACKOFF_SECONDS, count_attempt=True):
+            logging.warning(f"[분산 수집] API 요청 실패(status={status}), 잠시 뒤 다시 시도합니다: {_api_key(task)}")
+        else:
+            logging.error(f"[분산 수집] API 요청이 재시도 한도를 넘어 실패했습니다: {_api_key(task)}")
+        return
+
+    articles = [article for article in page_articles if article.get('url')]
+    if url_index and articles:
+        unseen_urls = url_index.filter_unseen(article['url'] for article in articles)
+        articles = [article for article in articles if article['url'] in unseen_urls]
+    queue.add_many('crawl', [(article['url'], article) for article in articles])
+
+    full_page = len(page_articles) >= config.PAGE_SIZE
+    if full_page and task['page'] < config.PAGE_LIMIT:
+        next_task = dict(task, page=task['page'] + 1)
+        queue.add_many('api', [(_api_key(next_task), next_task)])
+    pages.append(dict(
+        task,
+        articles=[{'url': a.get('url'), 'publishedAt': a.get('publishedAt')} for a in page_articles],
+        truncated=full_page and task['page'] >= config.PAGE_LIMIT,
+        failed=status >= 400,  # 400/426 등 다시 시도해도 같은 응답이 오는 오류
+    ))
+    queue.complete([task_id])
+
+def _save_worker_selector_stats(run_dir, worker_id):
+    """선택자 통계는 워커마다 이번 실행의 증가분만 따로 저장하고, merge 단계에서 한 번에 합칩니다."""
+    selector_stats = get_selector_stats()
+    if selector_stats:
+        selector_stats.save_delta(os.path.join(run_dir, f"selector_stats_{worker_id}.json"))
+
+def run_worker(run_dir, worker_id):
+    """
+    큐가 빌 때까지 작업을 가져와 처리하는 워커 하나를 실행합니다.
+    API 작업을 먼저 처리하고, 없으면 크롤링 작업을 가져와 도메인 스케줄러로 크롤링합니다.
+    크롤링 결과는 워커별 저널(worker_<id>.jsonl)에 즉시 기록되며, 기록된 작업만 완료로 표시합니다.
+    """
+    queue = _open_queue(run_dir)
+    journal = RecordJournal(os.path.join(run_dir, f"worker_{worker_id}.jsonl"))
+    pages = RecordJournal(os.path.join(run_dir, f"pages_{worker_id}.jsonl"))
+    url_index = UrlIndex(config.URL_INDEX_PATH) if config.INCREMENTAL_COLLECTION else None
+    task_ids = {}
+    crawled = [0]
+
+    class _Progress:
+        def update(self, n):
+            crawled[0] += n
+
+    def on_record(record):
+        task_id = task_ids.pop(record.get('url'), None)
+        if task_id is not None:
+            queue.complete([task_id])
+
+    # 임대한 크롤링 작업이 스케줄러에서 오래 기다리다 임대가 만료되지 않도록 대기 수를 워커 수의 2배로 제한합니다.
+    max_pending = config.CRAWL_WORKERS * 2
+    submit, finish = start_crawl(journal, _Progress(), max_pending=max_pending, on_record=on_record)
+    started = time.monotonic()
+    api_requests = 0
+    try:
+        while True:
+            api_tasks = queue.lease('api', worker_id, 1)
+            if api_tasks:
+                for task_id, task in api_tasks:
+                    _handle_api_task(queue, task_id, task, url_index, pages)
+                    api_requests += 1
+                time.sleep(1)
+                continue
+
+            crawl_tasks = queue.lease('crawl', worker_id, config.CRAWL_WORKERS)
+            if crawl_tasks:
+                for task_id, article in crawl_tasks:
+                    task_ids[article['url']] = task_id
+                    submit(article)
+                continue
+
+            if queue.is_drained():
+                break
+            # 다른 워커(또는 내 스케줄러)가 처리 중인 작업이 새 작업을 만들 수 있으므로 잠시 기다립니다.
+            time.sleep(config.SHARD_POLL_SECONDS)
+    finally:
+        finish()
+        _save_worker_selector_stats(run_dir, worker_id)
+        journal.close()
+        pages.close()
+        queue.close()
+        if url_index:
+            url_index.close()
+
+    elapsed = max(time.monotonic() - started, 1e-9)
+    logging.info(
+        f"[분산 수집] 워커 {worker_id} 종료: API 요청 {api_requests}회, 기사 {crawled[0]}개, "
+        f"{elapsed:.1f}초 ({crawled[0] / elapsed:.2f} articles/sec)"
+    )
+
+def _read_pages(run_dir, queue):
+    """
+    워커별 페이지 기록에서 ({검색어: [기사]}, 끝까지 받지 못한 구간 gaps)를 만듭니다 (워터마크 계산용).
+    PAGE_LIMIT에서 잘렸거나 실패한 페이지, 재시도 한도를 넘었거나 아직 처리되지 않은 API 작업이 받지 못한 구간입니다.
+    """
+    articles_by_query = {}
+    range_articles = {}
+    incomplete = []
+    for path in sorted(glob.glob(os.path.join(run_dir, 'pages_*.jsonl'))):
+        pages = RecordJournal(path)
+        for entry in pages.iter_records():
+            articles_by_query.setdefault(entry['query'], []).extend(entry['articles'])
+            range_articles.setdefault(_range_key(entry), []).extend(entry['articles'])
+            if entry['truncated'] or entry['failed']:
+                incomplete.append(entry)
+        pages.close()
+    incomplete.extend(queue.iter_payloads('api', states=('pending', 'leased', 'failed')))
+
+    gaps = {}
+    for task in incomplete:
+        note_gap(gaps, task['query'], covered_since(task, range_articles.get(_range_key(task), []), config.SORT_BY))
+    return articles_by_query, gaps
+
+def _merge_selector_stats(run_dir):
+    """워커별 선택자 통계 증가분을 공유 통계 파일에 합칩니다 (합친 증가분 파일은 지움)."""
+    selector_stats = get_selector_stats()
+    if not selector_stats:
+        return
+    for path in sorted(glob.glob(os.path.join(run_dir, 'selector_stats_*.json'))):
+        selector_stats.merge(path)
+        os.remove(path)
+    selector_stats.save()
+    selector_stats.report()
+
+def merge_run(run_dir, keep=False):
+    """
+    워커별 저널을 URL 기준으로 합쳐(먼저 기록된 것 우선) 원본 CSV와 피드백 템플릿을 저장합니다.
+    증분 수집 모드이면 URL 인덱스와 검색어별 워터마크도 갱신합니다.
+    """
+    queue = _open_queue(run_dir)
+    counts = queue.counts()
+    if not queue.is_drained():
+        logging.warning(f"[분산 수집] 아직 끝나지 않은 작업이 있습니다: {counts}")
+    failed = sum(states.get('failed', 0) for states in counts.values())
+    if failed:
+        logging.warning(f"[분산 수집] {failed}개 작업이 재시도 한도를 넘어 실패했습니다.")
+
+    merged_path = os.path.join(run_dir, 'merged.jsonl')
+    if os.path.exists(merged_path):
+        os.remove(merged_path)
+    merged = RecordJournal(merged_path)
+    seen_urls = set()
+    worker_counts = {}
+    for path in sorted(glob.glob(os.path.join(run_dir, 'worker_*.jsonl'))):
+        worker_journal = RecordJournal(path)
+        written = 0
+        for record in worker_journal.iter_records():
+            if record.get('url') in seen_urls:
+                continue
+            seen_urls.add(record.get('url'))
+            merged.append(record)
+            written += 1
+        worker_journal.close()
+        worker_counts[os.path.basename(path)] = written
+    logging.info(f"[분산 수집] 워커 저널 {len(worker_counts)}개 병합: {worker_counts}")
+
+    save_feedback_template_csv(list(queue.iter_payloads('crawl')), config.SAVE_FOLDER_PATH)
+    dropped_urls = set()
+    records = merged.iter_sorted('publishedAt', reverse=True)
+    if config.NEAR_DUP_ENABLED:
+        records = drop_near_duplicates(records, dropped_urls)
+    saved_file = save_raw_real_news(records, config.SAVE_FOLDER_PATH)
+    articles_by_query, gaps = _read_pages(run_dir, queue)
+    queue.close()
+    _merge_selector_stats(run_dir)
+
+    if saved_file and config.ARTICLE_DB_ENABLED:
+        store_articles_in_db(r for r in merged.iter_records() if r.get('url') not in dropped_urls)
+    if saved_file and config.INCREMENTAL_COLLECTION:
+        url_index = UrlIndex(config.URL_INDEX_PATH)
+        try:
+            url_index.add_many(r for r in merged.iter_records() if r.get('text') != '[본문 없음]')
+            _update_watermarks(url_index, articles_by_query, gaps)
+        finally:
+            url_index.close()
+    merged.close()
+
+    if saved_file and not keep:
+        shutil.rmtree(run_dir)
+    return saved_file
+
+def _default_worker_id(index=0):
+    return f"{socket.gethostname()}-{os.getpid()}-{index}"
+
+def run_local(run_dir, workers):
+    """한 호스트에서 init -> 워커 프로세스 N개 -> merge를 차례로 실행합니다."""
+    started = time.monotonic()
+    init_run(run_dir)
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(run_dir, _default_worker_id(i)), name=f"shard-worker-{i}")
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    saved_file = merge_run(run_dir)
+    logging.info(f"[분산 수집] 워커 {workers}개, 전체 {time.monotonic() - started:.1f}초, 결과: {saved_file}")
+    return saved_file
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="작업 큐를 공유하는 여러 워커 프로세스로 뉴스를 수집합니다.")
+    parser.add_argument('command', choices=['init', 'worker', 'merge', 'run'],
+                        help="init: 큐 생성, worker: 워커 실행(여러 호스트 가능), merge: 결과 병합, run: 한 호스트에서 전체 실행")
+    parser.add_argument('--run-dir', type=str, default=config.SHARD_DIR, help="작업 큐와 워커 저널을 둘 공유 폴더")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="run 명령에서 띄울 워커 프로세스 수")
+    parser.add_argument('--worker-id', type=str, default=None, help="worker 명령의 워커 이름 (기본값: 호스트명-pid)")
+    parser.add_argument('--fresh', action='store_true', help="init 시 기존 작업 큐를 지우고 새로 시작")
+    parser.add_argument('--keep', action='store_true', help="merge 후 작업 폴더를 지우지 않음")
+    args = parser.parse_args(argv)
+
+    if args.command in ('init', 'run') and (not config.NEWS_API_KEY or config.NEWS_API_KEY == 'YOUR_NEWS_API_KEY_DEFAULT'):
+        logging.critical("NEWS_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+        return
+
+    if args.command == 'init':
+        init_run(args.run_dir, fresh=args.fresh)
+    elif args.command == 'worker':
+        run_worker(args.run_dir, args.worker_id or _default_worker_id())
+    elif args.command == 'merge':
+        merge_run(args.run_dir, keep=args.keep)
+    else:
+        run_local(args.run_dir, args.workers)
+
+if __name__ == '__main__':
+    main()
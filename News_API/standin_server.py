@@ -0,0 +1,286 @@
+# E:\workspace\News_API\standin_server.py
+
+import re
+import json
+import time
+import random
+import logging
+import zlib
+import argparse
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# 상대 경로로 모듈 임포트
+from .crawler import SITE_SPECIFIC_SELECTORS
+from .html_archive import HtmlArchive
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+_SIMPLE_SELECTOR = re.compile(r'^([a-zA-Z][\w-]*)?(?:#([\w-]+))?(?:\.([\w-]+))?(?:\[(\w+)="([^"]+)"\])?$')
+
+def _timestamp(value):
+    """News API의 from/to 값(로컬 시각 문자열)을 유닉스 시각으로 바꿉니다."""
+    if not value:
+        return None
+    return int(time.mktime(time.strptime(value[:19], '%Y-%m-%dT%H:%M:%S')))
+
+def selector_to_tag(selector, inner_html):
+    """'div.art_body', '#dic_area' 같은 단순 CSS 선택자에 매칭되는 HTML 요소를 만듭니다."""
+    match = _SIMPLE_SELECTOR.match(selector.split(' ')[-1])
+    if not match:
+        return f'<article>{inner_html}</article>'
+    tag, element_id, class_name, attr_name, attr_value = match.groups()
+    tag = tag or 'div'
+    attrs = ''
+    if element_id:
+        attrs += f' id="{element_id}"'
+    if class_name:
+        attrs += f' class="{class_name}"'
+    if attr_name:
+        attrs += f' {attr_name}="{attr_value}"'
+    return f'<{tag}{attrs}>{inner_html}</{tag}>'
+
+class StandinState:
+    """
+    News API(/v2/everything)와 언론사 기사 페이지를 흉내 내는 오프라인 서버의 설정과 통계입니다.
+    - 검색어별 기사는 평균 7일에 results_per_query개 간격으로 존재하며, 밀도는 검색어마다 다릅니다.
+    - 기사 ID는 (검색어, 게시 시각)의 해시를 pool_size로 나눈 값이라, 검색어 사이에 자연스럽게 중복이 생깁니다.
+    - 기사 URL은 http://<SITE_SPECIFIC_SELECTORS 도메인>/article/<ID> 형식이며, 서버를 HTTP 프록시로 지정해 받습니다.
+    - 각 도메인은 robots.txt(뉴스 사이트맵), 홈페이지(RSS 링크), /rss.xml, /sitemap-news.xml도 제공합니다 (ETag 지원).
+    """
+    def __init__(self, results_per_query=150, pool_size=2000, latency_ms=50.0, error_rate=0.0,
+                 api_429_rate=0.0, archive_path=None, seed=42):
+        self.results_per_query = results_per_query
+        self.pool_size = pool_size
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.api_429_rate = api_429_rate
+        self.domains = sorted(SITE_SPECIFIC_SELECTORS)
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.recorded = self._load_recorded(archive_path)
+
+        self.lock = threading.Lock()
+        self.counts = defaultdict(int)
+
+    def _load_recorded(self, archive_path):
+        """HTML 아카이브가 있으면 도메인별로 실제 저장된 페이지를 사용합니다."""
+        recorded = defaultdict(list)
+        if not archive_path:
+            return recorded
+        archive = HtmlArchive(archive_path)
+        for meta in archive.iter_metas():
+            domain = urlparse(meta['url']).netloc
+            if domain in SITE_SPECIFIC_SELECTORS:
+                loaded = archive.load_content(meta['url'], meta)
+                if loaded:
+                    recorded[domain].append(loaded[0])
+        if recorded:
+            logging.info(f"[Stand-in] 아카이브에서 {sum(len(v) for v in recorded.values())}개 페이지를 불러왔습니다.")
+        return recorded
+
+    def roll(self, rate):
+        with self.random_lock:
+            return self.random.random() < rate
+
+    def sleep_latency(self):
+        if self.latency_ms <= 0:
+            return
+        with self.random_lock:
+            delay = self.random.uniform(0.5, 1.5) * self.latency_ms / 1000
+        time.sleep(delay)
+
+    def count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    def article_id(self, query, published):
+        return zlib.crc32(f"{query}|{published}".encode('utf-8')) % self.pool_size
+
+    def interval_seconds(self, query):
+        """검색어별 기사 간격(초). 검색어마다 밀도가 0.25~4배로 달라 바쁜/조용한 주제를 흉내 냅니다."""
+        factor = (0.25, 0.5, 1, 2, 4)[zlib.crc32(query.encode('utf-8')) % 5]
+        per_day = max(self.results_per_query / 7 * factor, 0.01)
+        return max(int(86400 / per_day), 1)
+
+    def everything(self, params):
+        """
+        News API /v2/everything 응답을 만듭니다.
+        검색어별 기사는 고정된 시간 간격으로 존재하므로, 날짜 구간을 어떻게 나눠 조회해도 같은 기사가 나옵니다.
+        """
+        query = params.get('q', [''])[0]
+        now = int(time.time())
+        to_ts = _timestamp(params.get('to', [''])[0]) or now
+        from_ts = _timestamp(params.get('from', [''])[0]) or to_ts - 7 * 86400
+        page = int(params.get('page', ['1'])[0])
+        page_size = int(params.get('pageSize', ['100'])[0])
+
+        interval = self.interval_seconds(query)
+        newest = to_ts // interval
+        oldest = -(-from_ts // interval)
+        total = max(0, newest - oldest + 1)
+
+        start = (page - 1) * page_size
+        articles = []
+        for slot in range(newest - start, max(newest - start - page_size, oldest - 1), -1):
+            published = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(slot * interval))
+            article_id = self.article_id(query, published)
+            domain = self.domains[article_id % len(self.domains)]
+            articles.append({
+                'source': {'id': None, 'name': domain},
+                'author': None,
+                'title': f"[stand-in] {query} 기사 {article_id}",
+                'description': f"{query} 관련 기사 {article_id} 요약",
+                'url': f"http://{domain}/article/{article_id}",
+                'publishedAt': published,
+                'content': None,
+            })
+        return {'status': 'ok', 'totalResults': total, 'articles': articles}
+
+    def feed_items(self, domain, count=20, interval=3600):
+        """도메인별 최근 기사 count개를 (게시 시각, 기사 ID)로 반환합니다. 기사는 interval초마다 하나씩 올라옵니다."""
+        newest = int(time.time()) // interval
+        items = []
+        for slot in range(newest, newest - count, -1):
+            published = time.gmtime(slot * interval)
+            items.append((published, zlib.crc32(f"{domain}|{slot}".encode('utf-8')) % self.pool_size))
+        return items
+
+    def feed(self, domain, kind):
+        """RSS 2.0 또는 뉴스 사이트맵 XML과 ETag를 반환합니다."""
+        items = self.feed_items(domain)
+        etag = f'"{kind}-{time.strftime("%Y%m%d%H", items[0][0])}"'
+        if kind == 'rss':
+            entries = ''.join(
+                f"<item><title>{domain} 피드 기사 {article_id}</title><link>http://{domain}/article/{article_id}</link>"
+                f"<pubDate>{time.strftime('%a, %d %b %Y %H:%M:%S +0000', published)}</pubDate><author>홍길동 기자</author></item>"
+                for published, article_id in items
+            )
+            body = f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>{domain}</title>{entries}</channel></rss>'
+        else:
+            entries = ''.join(
+                f"<url><loc>http://{domain}/article/{article_id}</loc><news:news><news:title>{domain} 사이트맵 기사 {article_id}</news:title>"
+                f"<news:publication_date>{time.strftime('%Y-%m-%dT%H:%M:%SZ', published)}</news:publication_date></news:news></url>"
+                for published, article_id in items
+            )
+            body = (
+                '<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+                f'xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">{entries}</urlset>'
+            )
+        return body.encode('utf-8'), etag
+
+    def article_html(self, domain, article_id):
+        recorded = self.recorded.get(domain)
+        if recorded:
+            return recorded[article_id % len(recorded)]
+        paragraphs = ''.join(
+            f"<p>{domain} 기사 {article_id}의 {n}번째 문단입니다. 오프라인 벤치마크용 본문 내용입니다.</p>"
+            for n in range(1, 9)
+        )
+        body = selector_to_tag(SITE_SPECIFIC_SELECTORS[domain][0], paragraphs + '<script>var ad = 1;</script>')
+        return (
+            '<html><head><meta charset="utf-8"><title>stand-in</title></head><body>'
+            '<nav><p>메뉴</p></nav>'
+            f'{body}<div class="byline_area">홍길동 기자</div>'
+            '</body></html>'
+        ).encode('utf-8')
+
+def make_handler(state):
+    class StandinHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, body, content_type, etag=None):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            if status == 429:
+                self.send_header('Retry-After', '1')
+            if etag:
+                self.send_header('ETag', etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_feed(self, host, kind):
+            state.count('feed_requests')
+            body, etag = state.feed(host, kind)
+            if self.headers.get('If-None-Match') == etag:
+                state.count('feed_not_modified')
+                return self._send(304, b'', 'application/xml', etag)
+            return self._send(200, body, 'application/xml; charset=utf-8', etag)
+
+        def do_GET(self):
+            # 프록시로 받은 요청은 절대 URL(http://host/path) 형태입니다.
+            parsed = urlparse(self.path)
+            host = parsed.netloc or self.headers.get('Host', '')
+            host = host.split(':')[0]
+
+            if parsed.path.endswith('/v2/everything'):
+                state.count('api_requests')
+                state.sleep_latency()
+                if state.roll(state.api_429_rate):
+                    state.count('api_429')
+                    return self._send(429, b'{"status":"error","code":"rateLimited","message":"stand-in 429"}', 'application/json')
+                body = json.dumps(state.everything(parse_qs(parsed.query)), ensure_ascii=False).encode('utf-8')
+                return self._send(200, body, 'application/json; charset=utf-8')
+
+            if host in SITE_SPECIFIC_SELECTORS:
+                if parsed.path == '/robots.txt':
+                    body = f"User-agent: *\nAllow: /\nSitemap: http://{host}/sitemap-news.xml\n".encode('utf-8')
+                    return self._send(200, body, 'text/plain; charset=utf-8')
+                if parsed.path == '/':
+                    body = f'<html><head><link rel="alternate" type="application/rss+xml" href="/rss.xml"></head><body>{host}</body></html>'
+                    return self._send(200, body.encode('utf-8'), 'text/html; charset=utf-8')
+                if parsed.path in ('/rss.xml', '/sitemap-news.xml'):
+                    return self._send_feed(host, 'rss' if parsed.path == '/rss.xml' else 'sitemap')
+
+            match = re.match(r'^/article/(\d+)$', parsed.path)
+            if host in SITE_SPECIFIC_SELECTORS and match:
+                state.count('article_requests')
+                state.sleep_latency()
+                if state.roll(state.error_rate):
+                    state.count('article_errors')
+                    return self._send(503, b'stand-in error', 'text/plain')
+                return self._send(200, state.article_html(host, int(match.group(1))), 'text/html; charset=utf-8')
+
+            state.count('not_found')
+            self._send(404, b'not found', 'text/plain')
+
+    return StandinHandler
+
+def start_server(state, host='127.0.0.1', port=0):
+    """백그라운드 스레드에서 stand-in 서버를 띄우고 (서버, 주소 URL)을 반환합니다."""
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="standin-server", daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description="News API / 언론사 페이지를 흉내 내는 오프라인 stand-in 서버를 실행합니다.")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--results-per-query', type=int, default=150, help="검색어당 7일 평균 News API 결과 수")
+    parser.add_argument('--pool-size', type=int, default=2000, help="고유 기사 수 (작을수록 검색어 간 중복 증가)")
+    parser.add_argument('--latency-ms', type=float, default=50.0, help="요청당 평균 지연 시간(ms)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="기사 페이지 503 응답 비율")
+    parser.add_argument('--api-429-rate', type=float, default=0.0, help="News API 429 응답 비율")
+    parser.add_argument('--archive', type=str, default=None, help="실제 기사 HTML을 제공할 HTML 아카이브 경로")
+    args = parser.parse_args()
+
+    state = StandinState(args.results_per_query, args.pool_size, args.latency_ms, args.error_rate,
+                         args.api_429_rate, args.archive)
+    server, url = start_server(state, port=args.port)
+    print(f"stand-in 서버 실행 중: {url}")
+    print(f"  NEWS_API_URL={url}/v2/everything HTTP_PROXY_URL={url} 로 설정하고 수집을 실행하세요. (종료: Ctrl+C)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# E:\workspace\News_API\url_index.py
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+class UrlIndex:
+    """
+    이미 수집(크롤링)한 기사 URL과 검색어별 워터마크(마지막으로 본 publishedAt)를
+    SQLite 파일에 저장하는 영구 인덱스입니다.
+    """
+    def __init__(self, db_path):
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS seen_urls (
+                url TEXT PRIMARY KEY,
+                published_at TEXT,
+                crawled_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS watermarks (
+                query TEXT PRIMARY KEY,
+                last_published_at TEXT NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def filter_unseen(self, urls):
+        """주어진 URL 중 아직 인덱스에 없는 URL의 집합을 반환합니다."""
+        urls = list(urls)
+        seen = set()
+        with self._lock:
+            # SQLite 변수 개수 제한을 피하기 위해 나누어 조회
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(f"SELECT url FROM seen_urls WHERE url IN ({placeholders})", chunk)
+                seen.update(row[0] for row in rows)
+        return set(urls) - seen
+
+    def contains(self, url):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM seen_urls WHERE url = ?", (url,)).fetchone() is not None
+
+    def add_many(self, records):
+        """크롤링을 마친 기사 레코드({'url', 'publishedAt', ...})를 인덱스에 추가합니다."""
+        now = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+        rows = [(r.get('url', ''), r.get('publishedAt', ''), now) for r in records if r.get('url')]
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO seen_urls (url, published_at, crawled_at) VALUES (?, ?, ?)", rows)
+            self._conn.commit()
+
+    def get_watermark(self, query):
+        with self._lock:
+            row = self._conn.execute("SELECT last_published_at FROM watermarks WHERE query = ?", (query,)).fetchone()
+        return row[0] if row else None
+
+    def update_watermark(self, query, published_at):
+        """워터마크는 앞으로만 이동합니다 (ISO 8601 문자열 비교)."""
+        if not published_at:
+            return
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO watermarks (query, last_published_at) VALUES (?, ?)
+                ON CONFLICT(query) DO UPDATE SET last_published_at = excluded.last_published_at
+                WHERE excluded.last_published_at > watermarks.last_published_at
+            """, (query, published_at))
+            self._conn.commit()
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen_urls").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
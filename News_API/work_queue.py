@@ -0,0 +1,142 @@
+# E:\workspace\News_API\work_queue.py
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+class WorkQueue:
+    """
+    여러 프로세스(같은 파일 시스템을 공유하는 여러 호스트 포함)가 함께 쓰는 SQLite 기반 작업 큐입니다.
+    - 작업은 (kind, key)로 한 번만 등록됩니다 (같은 URL을 여러 검색어가 찾아도 크롤링 작업은 하나).
+    - 워커는 작업을 lease_seconds 동안 임대(lease)하며, 완료하지 못하고 죽으면 임대가 만료되어 다른 워커가 가져갑니다.
+    - max_attempts번 임대되고도 끝나지 않은 작업은 failed로 표시합니다.
+    (네트워크 파일 시스템에서는 SQLite 잠금이 보장되지 않을 수 있으므로, 여러 호스트에서는 잠금을 지원하는 공유 볼륨을 사용하세요.)
+    """
+    def __init__(self, db_path, lease_seconds=300, max_attempts=3):
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=60, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=60000")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                owner TEXT,
+                lease_expires REAL NOT NULL DEFAULT 0,
+                not_before REAL NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                UNIQUE (kind, key)
+            );
+            CREATE INDEX IF NOT EXISTS idx_tasks_kind_state ON tasks (kind, state);
+        """)
+
+    def add_many(self, kind, items):
+        """(key, payload) 목록을 등록하고 새로 추가된 작업 수를 반환합니다. 이미 있는 key는 무시합니다."""
+        rows = [(kind, key, json.dumps(payload, ensure_ascii=False)) for key, payload in items]
+        if not rows:
+            return 0
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("INSERT OR IGNORE INTO tasks (kind, key, payload) VALUES (?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._conn.total_changes - before
+
+    def lease(self, kind, owner, limit=1):
+        """대기 중이거나 임대가 만료된 작업을 최대 limit개 임대해 [(id, payload), ...]로 반환합니다."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE tasks SET state = 'failed' WHERE kind = ? AND state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                    (kind, now, self.max_attempts)
+                )
+                rows = self._conn.execute(
+                    "SELECT id, payload FROM tasks WHERE kind = ? AND "
+                    "((state = 'pending' AND not_before <= ?) OR (state = 'leased' AND lease_expires < ?)) "
+                    "ORDER BY id LIMIT ?",
+                    (kind, now, now, limit)
+                ).fetchall()
+                if rows:
+                    self._conn.executemany(
+                        "UPDATE tasks SET state = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                        [(owner, now + self.lease_seconds, task_id) for task_id, _ in rows]
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [(task_id, json.loads(payload)) for task_id, payload in rows]
+
+    def complete(self, task_ids):
+        task_ids = list(task_ids)
+        if not task_ids:
+            return
+        with self._lock:
+            self._conn.executemany("UPDATE tasks SET state = 'done', owner = NULL WHERE id = ?", [(i,) for i in task_ids])
+
+    def release(self, task_id, delay=0.0, count_attempt=False):
+        """
+        작업을 실행하지 못한 것으로 되돌려 delay초 뒤부터 다시 임대되게 합니다.
+        - count_attempt=False (예: 429): 시도 횟수를 늘리지 않습니다.
+        - count_attempt=True (예: 네트워크 오류, 5xx): 이번 임대를 시도로 세고, max_attempts에 도달했으면 failed로 표시합니다.
+        다시 임대될 수 있으면 True, failed가 되었으면 False를 반환합니다.
+        """
+        with self._lock:
+            if count_attempt:
+                self._conn.execute(
+                    "UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                    "owner = NULL, not_before = ? WHERE id = ?",
+                    (self.max_attempts, time.time() + delay, task_id)
+                )
+                row = self._conn.execute("SELECT state FROM tasks WHERE id = ?", (task_id,)).fetchone()
+                return row is not None and row[0] == 'pending'
+            self._conn.execute(
+                "UPDATE tasks SET state = 'pending', owner = NULL, not_before = ?, attempts = MAX(attempts - 1, 0) WHERE id = ?",
+                (time.time() + delay, task_id)
+            )
+            return True
+
+    def is_drained(self):
+        """대기 중이거나 실행 중인 작업이 하나도 없으면 True."""
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM tasks WHERE state IN ('pending', 'leased')").fetchone()
+        return row[0] == 0
+
+    def counts(self):
+        """{kind: {state: 개수}}를 반환합니다."""
+        counts = {}
+        with self._lock:
+            for kind, state, count in self._conn.execute("SELECT kind, state, COUNT(*) FROM tasks GROUP BY kind, state"):
+                counts.setdefault(kind, {})[state] = count
+        return counts
+
+    def iter_payloads(self, kind, states=None):
+        """kind 작업의 payload를 등록 순서대로 순회합니다. states를 주면 그 상태의 작업만 순회합니다."""
+        query = "SELECT payload FROM tasks WHERE kind = ?"
+        params = [kind]
+        if states:
+            query += f" AND state IN ({','.join('?' * len(states))})"
+            params.extend(states)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY id", params).fetchall()
+        for (payload,) in rows:
+            yield json.loads(payload)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -130,6 +130,8 @@ def manage_datasets():
         print("\n--- 🛠️ 데이터셋 관리 메뉴 ---")
         print("  1: 데이터셋 병합 (Merge)")
         print("  2: 데이터셋 삭제 (Delete)")
+        print("  3: 기사 DB로 가져오기 (Import)")
+        print("  4: 기사 DB에서 데이터셋 추출 (Export)")
         print("  b: 이전 메뉴로 돌아가기")
         choice = input("선택: ")
         
@@ -137,7 +139,8 @@ def manage_datasets():
             selection_str = input("병합할 데이터셋 번호를 쉼표(,)로 구분하여 입력하세요 (예: 1,3,4): ")
             try:
                 selected_indices = [int(i.strip()) - 1 for i in selection_str.split(',')]
-                dataset_manager.merge_datasets(selected_indices, datasets)
+                near_dup = input("본문이 거의 같은 (전재) 기사도 제거할까요? (y/N): ")
+                dataset_manager.merge_datasets(selected_indices, datasets, 0.8 if near_dup.lower() == 'y' else None)
             except ValueError:
                 print("[오류] 숫자와 쉼표만 사용하여 올바르게 입력해주세요.")
         elif choice == '2':
@@ -153,6 +156,17 @@ def manage_datasets():
                 print("[오류] 숫자와 쉼표만 사용하여 올바르게 입력해주세요.")
             except Exception as e:
                 print(f"\n[오류] 작업 실행 중 오류가 발생했습니다: {e}")
+        elif choice == '3':
+            selection_str = input("DB로 가져올 데이터셋 번호를 쉼표(,)로 구분하여 입력하세요 (예: 1,3,4): ")
+            try:
+                selected_indices = [int(i.strip()) - 1 for i in selection_str.split(',')]
+                dataset_manager.import_to_db(selected_indices, datasets)
+            except ValueError:
+                print("[오류] 숫자와 쉼표만 사용하여 올바르게 입력해주세요.")
+        elif choice == '4':
+            source = input("출처 (전체: Enter): ").strip()
+            since = input("게시일 시작 (예: 2025-09-01, 전체: Enter): ").strip()
+            dataset_manager.export_from_db(source=source, since=since)
                 
         elif choice.lower() == 'b':
             break
@@ -7,6 +7,8 @@ import glob
 from datetime import datetime
 import argparse
 
+from util.article_db import ArticleDB
+
 LABEL_SCORE_MAP = {0: 1.0, 1: 0.6, 2: -0.15, 3: -0.85}
 MIN_ARTICLES_SOURCE = 3
 MIN_ARTICLES_AUTHOR = 3
@@ -99,7 +101,7 @@ class CredibilityModel:
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Media 신뢰도 모델을 학습합니다.")
     parser.add_argument('--alpha', type=float, default=0.7, help='반영 비율 (0.0 ~ 1.0)')
-    parser.add_argument('--file', type=str, help='학습에 사용할 피드백 CSV 파일 경로')
+    parser.add_argument('--file', type=str, help='학습에 사용할 피드백 CSV 파일 또는 기사 DB(.sqlite3) 경로')
     args = parser.parse_args()
 
     model = CredibilityModel(INITIAL_WEIGHTS_FILE)
@@ -113,7 +115,15 @@ if __name__ == "__main__":
     if feedback_file_to_use and os.path.exists(feedback_file_to_use):
         print(f"\n[INFO] 피드백 파일 '{feedback_file_to_use}'로 업데이트 시작.")
         try:
-            new_labeled_data = pd.read_csv(feedback_file_to_use)
+            if feedback_file_to_use.endswith(('.sqlite3', '.db')):
+                # 기사 DB에 모아 둔 피드백 라벨 전체를 사용합니다.
+                db = ArticleDB(feedback_file_to_use)
+                try:
+                    new_labeled_data = db.read_feedback()
+                finally:
+                    db.close()
+            else:
+                new_labeled_data = pd.read_csv(feedback_file_to_use)
             model.update_with_feedback(new_labeled_data, args.alpha)
             print("\n--- 최종 언론사 가중치 ---")
             final_source_ranking, final_author_ranking = model.get_rankings()
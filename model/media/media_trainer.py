@@ -6,6 +6,8 @@ import os
 import argparse
 from datetime import datetime
 
+from util.article_db import load_training_frame
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # 학습 데이터 CSV에 있는 컬럼명과 일치해야 합니다.
 SOURCE_COLUMN_NAME = '출처'
@@ -20,22 +22,22 @@ MIN_ARTICLES_SOURCE = 3
 MIN_ARTICLES_AUTHOR = 3
 ALPHA = 0.7 # 기본 알파값
 
-def train(csv_file_path):
+def train(csv_file_path, **filters):
     print(f"--- [Media] 학습 데이터 로드: '{os.path.basename(csv_file_path)}' ---")
     if not os.path.exists(csv_file_path):
         print(f"파일을 찾을 수 없습니다: {csv_file_path}")
         return
         
     try:
-        df = pd.read_csv(csv_file_path, encoding='utf-8-sig')
+        # 출처/기자/라벨 세 컬럼만 읽습니다 (기사 본문은 필요 없음).
+        df = load_training_frame(csv_file_path, [SOURCE_COLUMN_NAME, AUTHOR_COLUMN_NAME, LABEL_COLUMN_NAME], **filters)
+    except ValueError as e:
+        print(f"필요한 컬럼('{SOURCE_COLUMN_NAME}', '{AUTHOR_COLUMN_NAME}', '{LABEL_COLUMN_NAME}')이 없습니다: {e}")
+        return
     except Exception as e:
         print(f"CSV 파일 로드 실패: {e}")
         return
 
-    if not all(col in df.columns for col in [SOURCE_COLUMN_NAME, AUTHOR_COLUMN_NAME, LABEL_COLUMN_NAME]):
-        print(f"필요한 컬럼('{SOURCE_COLUMN_NAME}', '{AUTHOR_COLUMN_NAME}', '{LABEL_COLUMN_NAME}')이 없습니다.")
-        return
-
     print("--- [Media] 언론사/기자 신뢰도 가중치 학습 시작 ---")
     df['score'] = df[LABEL_COLUMN_NAME].apply(lambda x: 1 if x == 1 else -1)
 
@@ -86,6 +88,8 @@ def train(csv_file_path):
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="[Media] 출처 신뢰도 모델을 학습합니다.")
-    parser.add_argument('--file', type=str, required=True, help='학습에 사용할 CSV 파일의 전체 경로')
+    parser.add_argument('--file', type=str, required=True, help='학습에 사용할 CSV/Parquet 파일 또는 기사 DB(.sqlite3)의 전체 경로')
+    parser.add_argument('--source', type=str, help='이 출처의 기사만 사용 (기사 DB/CSV/Parquet)')
+    parser.add_argument('--since', type=str, help='이 게시일(예: 2025-09-01) 이후 기사만 사용 (기사 DB/CSV/Parquet)')
     args = parser.parse_args()
-    train(args.file)
\ No newline at end of file
+    train(args.file, source=args.source, since=args.since)
\ No newline at end of file
@@ -16,6 +16,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # tokenizer.py 파일에서 okt_tokenizer 함수를 가져옵니다.
 from tokenizer import okt_tokenizer 
+from util.article_db import load_training_frame
 
 # --- 설정 ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -23,7 +24,7 @@ OUTPUT_MODEL_FILE = os.path.join(BASE_DIR, 'tokken_model_pipeline.pkl')
 TEXT_COLUMN_NAME = '기사본문'
 LABEL_COLUMN_NAME = '진위여부(1:진짜, 0:가짜)'
 
-def train(csv_file_path):
+def train(csv_file_path, **filters):
     """
     주어진 CSV 데이터를 로드하여 TF-IDF + 로지스틱 회귀 모델을 학습하고,
     모델 파이프라인 전체를 .pkl 파일로 저장합니다.
@@ -34,16 +35,17 @@ def train(csv_file_path):
         return
 
     try:
-        df = pd.read_csv(csv_file_path, encoding='utf-8-sig')
+        # 학습에는 본문과 라벨만 필요하므로 두 컬럼만 읽습니다 (Parquet이면 나머지 컬럼은 읽지도 않음).
+        df = load_training_frame(csv_file_path, [TEXT_COLUMN_NAME, LABEL_COLUMN_NAME], **filters)
         df.dropna(subset=[TEXT_COLUMN_NAME, LABEL_COLUMN_NAME], inplace=True)
         print(f"총 {len(df)}개의 (진짜/가짜) 기사 데이터 로드 완료.")
+    except ValueError as e:
+        # 지정한 컬럼이 파일에 없으면 read_table(usecols/columns)이 ValueError를 냅니다.
+        print(f"[오류] 필요한 컬럼('{TEXT_COLUMN_NAME}', '{LABEL_COLUMN_NAME}')이 없습니다: {e}")
+        return
     except Exception as e:
         print(f"[오류] CSV 파일 로드 실패: {e}")
         return
-
-    if TEXT_COLUMN_NAME not in df.columns or LABEL_COLUMN_NAME not in df.columns:
-        print(f"[오류] 필요한 컬럼('{TEXT_COLUMN_NAME}', '{LABEL_COLUMN_NAME}')이 없습니다.")
-        return
     
     if len(df) < 10:
         print(f"[오류] 데이터가 10개 미만({len(df)}개)입니다. 학습을 진행할 수 없습니다.")
@@ -95,6 +97,8 @@ def train(csv_file_path):
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="[Tokken 2.0] 텍스트 분류 모델을 학습합니다.")
-    parser.add_argument('--file', type=str, required=True, help='학습에 사용할 CSV 파일의 전체 경로')
+    parser.add_argument('--file', type=str, required=True, help='학습에 사용할 CSV/Parquet 파일 또는 기사 DB(.sqlite3)의 전체 경로')
+    parser.add_argument('--source', type=str, help='이 출처의 기사만 사용 (기사 DB/CSV/Parquet)')
+    parser.add_argument('--since', type=str, help='이 게시일(예: 2025-09-01) 이후 기사만 사용 (기사 DB/CSV/Parquet)')
     args = parser.parse_args()
-    train(args.file)
\ No newline at end of file
+    train(args.file, source=args.source, since=args.since)
\ No newline at end of file
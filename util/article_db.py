@@ -0,0 +1,482 @@
+# E:\workspace\util\article_db.py
+
+import os
+import csv
+import hashlib
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from util.columnar_store import (
+    DATASET_COLUMNS, LABEL_COLUMN, PYARROW_AVAILABLE, iter_rows, read_table, write_parquet
+)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# News_API 설정(ARTICLE_DB_PATH)과 같은 기본 위치. 모델 학습/데이터셋 관리에서도 같은 파일을 씁니다.
+DEFAULT_DB_PATH = os.getenv('ARTICLE_DB_PATH', os.path.join(BASE_DIR, '..', 'News_API', 'state', 'articles.sqlite3'))
+
+# 학습 데이터셋(한글 컬럼) -> SQL 식. '번호'는 내보낼 때 순서대로 다시 매깁니다.
+_DATASET_SQL = {
+    '제목': 'title', '출처': 'source', '기자': 'author', 'URL': 'url',
+    '게시일': 'published_at', '기사본문': 'body', LABEL_COLUMN: 'label',
+}
+
+_INSERT_BATCH = 1000
+
+# News_API.api_handler가 생성에 실패한 가짜뉴스 본문에 넣는 문구 (엔진/오류 종류와 관계없이 이것으로 시작)
+FAILED_FAKE_PREFIX = '[가짜뉴스 생성 실패'
+
+def _text(value):
+    """NaN/None은 ''로, 나머지는 문자열로 맞춥니다. (pandas 행과 JSON 레코드를 같이 받기 위함)"""
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return str(value)
+
+def _label(value):
+    if value is None or value == '' or (isinstance(value, float) and value != value):
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+def _chunks(rows, size=_INSERT_BATCH):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class ArticleDB:
+    """
+    수집한 기사와 라벨, 생성된 가짜뉴스를 한 SQLite 파일에 저장하는 기사 저장소입니다.
+    - articles: URL당 한 행 (출처/기자/게시일/라벨 인덱스). label은 데이터셋 라벨(1: 진짜, 0: 가짜), 라벨이 없으면 NULL
+    - fakes: 원본 기사(article_id)에 연결된 LLM 생성 가짜뉴스 (데이터셋으로 내보낼 때 라벨 0)
+    - feedback: 피드백 템플릿으로 사람이 매긴 신뢰도 라벨(0~3)과 사유
+    CSV 폴더 전체를 읽지 않고 인덱스로 필요한 기사만 조회/추출합니다.
+    """
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL UNIQUE,
+                title TEXT NOT NULL DEFAULT '',
+                source TEXT NOT NULL DEFAULT '',
+                author TEXT NOT NULL DEFAULT '',
+                published_at TEXT NOT NULL DEFAULT '',
+                body TEXT NOT NULL DEFAULT '',
+                label INTEGER,
+                collected_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (source, published_at);
+            CREATE INDEX IF NOT EXISTS idx_articles_author ON articles (author);
+            CREATE INDEX IF NOT EXISTS idx_articles_published_at ON articles (published_at);
+            CREATE INDEX IF NOT EXISTS idx_articles_label ON articles (label, published_at);
+
+            CREATE TABLE IF NOT EXISTS fakes (
+                id INTEGER PRIMARY KEY,
+                article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+                title TEXT NOT NULL,
+                body TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                UNIQUE (article_id, content_hash)
+            );
+
+            CREATE TABLE IF NOT EXISTS feedback (
+                article_id INTEGER PRIMARY KEY REFERENCES articles (id) ON DELETE CASCADE,
+                label INTEGER NOT NULL,
+                reason TEXT NOT NULL DEFAULT '',
+                updated_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_feedback_label ON feedback (label);
+        """)
+        self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # 쓰기 (대량 삽입)
+    # ------------------------------------------------------------------
+    def _upsert(self, rows):
+        """(url, title, source, author, published_at, body, label, collected_at) 행들을 넣습니다. (잠금을 잡은 상태에서 호출)"""
+        # 빈 값으로 기존 값을 덮어쓰지 않고, 라벨이 없는 레코드(원본 수집)는 기존 라벨을 유지합니다.
+        self._conn.executemany("""
+            INSERT INTO articles (url, title, source, author, published_at, body, label, collected_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                title = COALESCE(NULLIF(excluded.title, ''), articles.title),
+                source = COALESCE(NULLIF(excluded.source, ''), articles.source),
+                author = COALESCE(NULLIF(excluded.author, ''), articles.author),
+                published_at = COALESCE(NULLIF(excluded.published_at, ''), articles.published_at),
+                body = COALESCE(NULLIF(excluded.body, ''), articles.body),
+                label = COALESCE(excluded.label, articles.label)
+        """, rows)
+
+    def upsert_articles(self, records, label=None):
+        """
+        크롤링 레코드({'url', 'title', 'source', 'author', 'publishedAt', 'text', ['label']})를 대량으로 넣습니다.
+        이미 있는 URL은 갱신합니다. records는 제너레이터여도 되며 1000개씩 나눠 한 트랜잭션으로 씁니다.
+        """
+        now = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+        count = 0
+        for chunk in _chunks(r for r in records if r.get('url')):
+            rows = [(
+                _text(r['url']), _text(r.get('title')), _text(r.get('source')), _text(r.get('author')),
+                _text(r.get('publishedAt')), _text(r.get('text')),
+                _label(r.get('label')) if label is None else label, now
+            ) for r in chunk]
+            with self._lock:
+                self._upsert(rows)
+                self._conn.commit()
+            count += len(rows)
+        return count
+
+    def _insert_fakes(self, fakes, now):
+        """
+        (원본 URL, 가짜 제목, 가짜 본문) 행들을 원본 기사에 연결해 넣습니다. (잠금을 잡은 상태에서 호출)
+        생성 실패 문자열로 채워진 가짜는 학습 데이터가 아니므로 넣지 않습니다.
+        """
+        rows = []
+        for url, title, body in fakes:
+            if body.startswith(FAILED_FAKE_PREFIX):
+                continue
+            content_hash = hashlib.sha1(f"{title}\n{body}".encode('utf-8')).hexdigest()
+            rows.append((title, body, content_hash, now, url))
+        self._conn.executemany("""
+            INSERT OR IGNORE INTO fakes (article_id, title, body, content_hash, created_at)
+            SELECT id, ?, ?, ?, ? FROM articles WHERE url = ?
+        """, rows)
+
+    def add_pairs(self, pairs):
+        """
+        LLM 가공 결과 [(진짜 레코드, 가짜 레코드), ...]를 넣습니다.
+        진짜 기사는 라벨 1로 갱신하고, 가짜는 원본에 연결해 fakes에 넣습니다. (같은 가짜는 한 번만 저장)
+        """
+        now = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+        count = 0
+        for chunk in _chunks(pairs):
+            reals = [(
+                _text(real['url']), _text(real.get('title')), _text(real.get('source')), _text(real.get('author')),
+                _text(real.get('publishedAt')), _text(real.get('text')), 1, now
+            ) for real, _ in chunk]
+            fakes = [(_text(real['url']), _text(fake.get('title')), _text(fake.get('text'))) for real, fake in chunk]
+            with self._lock:
+                self._upsert(reals)
+                self._insert_fakes(fakes, now)
+                self._conn.commit()
+            count += len(chunk)
+        return count
+
+    def add_feedback(self, rows):
+        """피드백 템플릿 행({'url', 'source', 'author', 'title', 'publishedAt', 'content', 'label', 'reason'})을 넣습니다."""
+        now = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+        count = 0
+        for chunk in _chunks(r for r in rows if r.get('url') and _label(r.get('label')) is not None):
+            articles = [(
+                _text(r['url']), _text(r.get('title')), _text(r.get('source')), _text(r.get('author')),
+                _text(r.get('publishedAt')), '', None, now
+            ) for r in chunk]
+            with self._lock:
+                self._upsert(articles)
+                self._conn.executemany("""
+                    INSERT INTO feedback (article_id, label, reason, updated_at)
+                    SELECT id, ?, ?, ? FROM articles WHERE url = ?
+                    ON CONFLICT(article_id) DO UPDATE SET
+                        label = excluded.label, reason = excluded.reason, updated_at = excluded.updated_at
+                """, [(_label(r['label']), _text(r.get('reason')), now, _text(r['url'])) for r in chunk])
+                self._conn.commit()
+            count += len(chunk)
+        return count
+
+    def import_file(self, path):
+        """
+        기존 CSV/Parquet 파일을 가져오고 {'articles', 'fakes', 'feedback'} 건수를 반환합니다.
+        - 학습 데이터셋(라벨 컬럼 있음): 라벨 1 행은 기사, 같은 URL의 라벨 0 행은 그 기사의 가짜뉴스
+          (진짜 행이 없는 라벨 0 행은 라벨 0 기사로 저장)
+        - 원본 수집 파일(raw_real_news): 라벨 없는 기사
+        - 피드백 템플릿(url/label/reason): 사람이 매긴 라벨
+        """
+        stats = {'articles': 0, 'fakes': 0, 'feedback': 0}
+        rows = iter_rows(path)
+        first = next(rows, None)
+        if first is None:
+            return stats
+        rows = _prepend(first, rows)
+
+        if 'url' in first and 'URL' not in first:
+            stats['feedback'] = self.add_feedback(rows)
+            return stats
+
+        def to_record(row):
+            return {
+                'url': row.get('URL'), 'title': row.get('제목'), 'source': row.get('출처'), 'author': row.get('기자'),
+                'publishedAt': row.get('게시일'), 'text': row.get('기사본문'), 'label': row.get(LABEL_COLUMN),
+            }
+
+        if LABEL_COLUMN not in first:
+            stats['articles'] = self.upsert_articles(to_record(row) for row in rows)
+            return stats
+
+        # 데이터셋은 진짜 행 뒤에 같은 URL의 가짜 행이 오므로, 진짜 행을 먼저 넣고 가짜를 연결합니다.
+        for chunk in _chunks(rows):
+            # 생성 실패 문자열로 채워진 가짜 행(이전 threads 엔진 데이터셋)은 가져오지 않습니다.
+            records = [r for r in map(to_record, chunk)
+                       if not (_label(r['label']) == 0 and _text(r['text']).startswith(FAILED_FAKE_PREFIX))]
+            reals = [r for r in records if _label(r['label']) != 0]
+            stats['articles'] += self.upsert_articles(reals)
+            urls = {_text(r['url']) for r in reals} | self._existing_real_urls(
+                {_text(r['url']) for r in records if _label(r['label']) == 0})
+            fakes = [(_text(r['url']), _text(r['title']), _text(r['text']))
+                     for r in records if _label(r['label']) == 0 and _text(r['url']) in urls]
+            orphans = [r for r in records if _label(r['label']) == 0 and _text(r['url']) not in urls]
+            if fakes:
+                with self._lock:
+                    self._insert_fakes(fakes, datetime.now().strftime('%Y-%m-%dT%H:%M:%S'))
+                    self._conn.commit()
+            stats['fakes'] += len(fakes)
+            stats['articles'] += self.upsert_articles(orphans)
+        return stats
+
+    def _existing_real_urls(self, urls):
+        urls = list(urls)
+        found = set()
+        with self._lock:
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                found.update(row[0] for row in self._conn.execute(
+                    f"SELECT url FROM articles WHERE label = 1 AND url IN ({placeholders})", chunk))
+        return found
+
+    # ------------------------------------------------------------------
+    # 읽기 (인덱스 조회)
+    # ------------------------------------------------------------------
+    def get(self, url):
+        """URL 하나의 기사(+ 'fakes' 목록, 'feedback')를 반환합니다. 없으면 None."""
+        with self._lock:
+            self._conn.row_factory = sqlite3.Row
+            try:
+                article = self._conn.execute("SELECT * FROM articles WHERE url = ?", (url,)).fetchone()
+                if article is None:
+                    return None
+                result = dict(article)
+                result['fakes'] = [dict(row) for row in self._conn.execute(
+                    "SELECT title, body, created_at FROM fakes WHERE article_id = ? ORDER BY id", (article['id'],))]
+                feedback = self._conn.execute(
+                    "SELECT label, reason FROM feedback WHERE article_id = ?", (article['id'],)).fetchone()
+                result['feedback'] = dict(feedback) if feedback else None
+            finally:
+                self._conn.row_factory = None
+        return result
+
+    def contains(self, url):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM articles WHERE url = ?", (url,)).fetchone() is not None
+
+    @staticmethod
+    def _where(source=None, author=None, since=None, until=None):
+        """기사 필터 -> (WHERE 절, 파라미터). 게시일은 ISO 8601 문자열 비교입니다 (until은 포함하지 않음)."""
+        clauses, params = [], []
+        for column, value in (('a.source', source), ('a.author', author)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("a.published_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("a.published_at < ?")
+            params.append(until)
+        return (' AND '.join(clauses) or '1'), params
+
+    def _dataset_query(self, columns, label=None, **filters):
+        """학습 데이터셋(진짜 행 + 그 기사의 가짜 행) SQL. 필요한 컬럼만 읽어 본문을 건너뛸 수 있게 합니다."""
+        where, params = self._where(**filters)
+        wanted = [c for c in columns if c in _DATASET_SQL]
+        real = ', '.join(f"a.{_DATASET_SQL[c]}" for c in wanted if c != LABEL_COLUMN)
+        fake_columns = {'제목': 'f.title', '기사본문': 'f.body'}
+        fake = ', '.join(fake_columns.get(c, f"a.{_DATASET_SQL[c]}") for c in wanted if c != LABEL_COLUMN)
+        real = f"{real}, " if real else ''
+        fake = f"{fake}, " if fake else ''
+        sql = f"""
+            SELECT * FROM (
+                SELECT {real}a.label AS label, a.published_at AS _published, a.id AS _id, 0 AS _order
+                FROM articles a WHERE a.label IS NOT NULL AND {where}
+                UNION ALL
+                SELECT {fake}0 AS label, a.published_at, a.id, f.id
+                FROM fakes f JOIN articles a ON a.id = f.article_id WHERE {where}
+            )
+        """
+        params = params + params
+        if label is not None:
+            sql += " WHERE label = ?"
+            params.append(int(label))
+        # 기존 가공 결과 CSV와 같이 게시일 역순, 진짜 행 바로 뒤에 가짜 행
+        sql += " ORDER BY _published DESC, _id, _order"
+        return sql, params, wanted
+
+    def iter_dataset(self, columns=DATASET_COLUMNS, label=None, batch_rows=1000, **filters):
+        """
+        학습 데이터셋 행({한글 컬럼명: 값})을 순회합니다. 파일 전체를 메모리에 올리지 않습니다.
+        filters: source, author, since, until (게시일 ISO 문자열), label: 1(진짜)/0(가짜)
+        """
+        sql, params, wanted = self._dataset_query(columns, label, **filters)
+        # 별도 커서로 읽어 쓰기 작업과 잠금을 오래 공유하지 않게 합니다.
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute(sql, params)
+            number = 0
+            output = [c for c in wanted if c != LABEL_COLUMN]
+            while True:
+                batch = cursor.fetchmany(batch_rows)
+                if not batch:
+                    break
+                for row in batch:
+                    number += 1
+                    record = dict(zip(output, row))
+                    if LABEL_COLUMN in wanted:
+                        record[LABEL_COLUMN] = row[len(output)]
+                    if '번호' in columns:
+                        record['번호'] = number
+                    yield {c: record[c] for c in columns if c in record}
+        finally:
+            conn.close()
+
+    def read_frame(self, columns, label=None, **filters):
+        """학습용 DataFrame을 반환합니다 (필요한 컬럼만, 인덱스 조회)."""
+        missing = [c for c in columns if c not in _DATASET_SQL and c != '번호']
+        if missing:
+            raise ValueError(f"DB에 없는 컬럼입니다: {missing}")
+        return pd.DataFrame.from_records(self.iter_dataset(columns, label, **filters), columns=columns)
+
+    def read_feedback(self, **filters):
+        """피드백 라벨을 media_score가 쓰는 컬럼(source/author/title/url/publishedAt/label/reason)으로 반환합니다."""
+        where, params = self._where(**filters)
+        with self._lock:
+            return pd.read_sql_query(f"""
+                SELECT a.source, a.author, a.title, a.url, a.published_at AS publishedAt, fb.label, fb.reason
+                FROM feedback fb JOIN articles a ON a.id = fb.article_id WHERE {where}
+            """, self._conn, params=params)
+
+    def export_dataset(self, path, **filters):
+        """학습 데이터셋을 CSV 또는 Parquet(확장자로 판단)으로 내보내고 행 수를 반환합니다."""
+        rows = self.iter_dataset(DATASET_COLUMNS, **filters)
+        if path.endswith('.parquet'):
+            return write_parquet(rows, path, DATASET_COLUMNS)
+        count = 0
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=DATASET_COLUMNS)
+                writer.writeheader()
+                for count, row in enumerate(rows, 1):
+                    writer.writerow(row)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return count
+
+    def stats(self):
+        with self._lock:
+            query = lambda sql: self._conn.execute(sql).fetchone()[0]
+            return {
+                'articles': query("SELECT COUNT(*) FROM articles"),
+                'labeled': query("SELECT COUNT(*) FROM articles WHERE label IS NOT NULL"),
+                'fakes': query("SELECT COUNT(*) FROM fakes"),
+                'feedback': query("SELECT COUNT(*) FROM feedback"),
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def _prepend(first, rows):
+    yield first
+    yield from rows
+
+# load_training_frame 필터 -> CSV/Parquet 컬럼
+_FILTER_COLUMNS = {'source': '출처', 'author': '기자', 'since': '게시일', 'until': '게시일', 'label': LABEL_COLUMN}
+
+def load_training_frame(path, columns, **filters):
+    """
+    학습 스크립트용: path가 .sqlite3/.db면 기사 DB에서, 아니면 CSV/Parquet 파일에서 columns만 읽습니다.
+    CSV/Parquet에도 기사 DB와 같은 필터(출처/기자 일치, 게시일 since 이상 until 미만, 라벨)를 적용합니다.
+    """
+    if path.endswith(('.sqlite3', '.db')):
+        db = ArticleDB(path)
+        try:
+            return db.read_frame(columns, **filters)
+        finally:
+            db.close()
+
+    filters = {key: value for key, value in filters.items() if value is not None and value != ''}
+    unknown = [key for key in filters if key not in _FILTER_COLUMNS]
+    if unknown:
+        raise TypeError(f"지원하지 않는 필터입니다: {unknown}")
+    # 필터에만 필요한 컬럼도 함께 읽은 뒤, 거르고 나서 columns만 남깁니다.
+    extra = [c for c in dict.fromkeys(_FILTER_COLUMNS[key] for key in filters) if c not in columns]
+    df = read_table(path, columns + extra)
+    for key, value in filters.items():
+        column = df[_FILTER_COLUMNS[key]]
+        if key == 'since':
+            df = df[column.notna() & (column.astype(str) >= value)]
+        elif key == 'until':
+            df = df[column.notna() & (column.astype(str) < value)]
+        elif key == 'label':
+            df = df[pd.to_numeric(column, errors='coerce') == int(value)]
+        else:
+            df = df[column == value]
+    if filters:
+        print(f"[필터] {filters} 조건에 맞는 {len(df)}행을 사용합니다.")
+    return df[columns].reset_index(drop=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="기사 DB(SQLite)로 기존 파일을 가져오거나 학습 데이터셋을 추출합니다.")
+    parser.add_argument('command', choices=['import', 'export', 'stats', 'get'],
+                        help="import: CSV/Parquet 가져오기, export: 데이터셋 추출, stats: 건수, get: URL 조회")
+    parser.add_argument('paths', nargs='*', help="import할 파일들 / export할 파일 경로(.csv/.parquet) / get할 URL")
+    parser.add_argument('--db', type=str, default=DEFAULT_DB_PATH, help="기사 DB 경로")
+    parser.add_argument('--source', type=str, help="출처 필터")
+    parser.add_argument('--author', type=str, help="기자 필터")
+    parser.add_argument('--since', type=str, help="게시일 시작 (예: 2025-09-01)")
+    parser.add_argument('--until', type=str, help="게시일 끝 (포함하지 않음)")
+    parser.add_argument('--label', type=int, choices=[0, 1], help="라벨 필터 (1: 진짜, 0: 가짜)")
+    args = parser.parse_args()
+
+    db = ArticleDB(args.db)
+    try:
+        if args.command == 'import':
+            for path in args.paths:
+                print(f"'{os.path.basename(path)}' 가져오기 완료: {db.import_file(path)}")
+        elif args.command == 'export':
+            if not args.paths:
+                print("[오류] 내보낼 파일 경로를 지정하세요.")
+                return
+            if args.paths[0].endswith('.parquet') and not PYARROW_AVAILABLE:
+                print("[오류] pyarrow가 설치되어 있지 않습니다. (pip install pyarrow)")
+                return
+            count = db.export_dataset(args.paths[0], label=args.label, source=args.source,
+                                      author=args.author, since=args.since, until=args.until)
+            print(f"총 {count}행을 '{args.paths[0]}'로 내보냈습니다.")
+        elif args.command == 'get':
+            for url in args.paths:
+                print(db.get(url))
+        print(f"기사 DB 현황: {db.stats()}")
+    finally:
+        db.close()
+
+if __name__ == '__main__':
+    main()
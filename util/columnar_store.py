@@ -0,0 +1,210 @@
+# E:\workspace\util\columnar_store.py
+
+import os
+import glob
+import time
+import argparse
+
+import pandas as pd
+
+# pyarrow가 설치되어 있을 때만 Parquet을 사용합니다 (없으면 CSV만 읽고 씁니다)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+RAW_COLUMNS = ['번호', '제목', '출처', '기자', 'URL', '게시일', '기사본문']
+LABEL_COLUMN = '진위여부(1:진짜, 0:가짜)'
+DATASET_COLUMNS = RAW_COLUMNS + [LABEL_COLUMN]
+
+# 같은 값이 반복되는 출처/기자는 사전(dictionary) 인코딩으로 저장합니다.
+DICTIONARY_COLUMNS = ('출처', '기자')
+INTEGER_COLUMNS = {'번호': 'int64', LABEL_COLUMN: 'int8'}
+
+DATA_EXTENSIONS = ('.csv', '.parquet')
+
+def _arrow_type(column):
+    if column in DICTIONARY_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    if column in INTEGER_COLUMNS:
+        return pa.int64() if INTEGER_COLUMNS[column] == 'int64' else pa.int8()
+    return pa.string()
+
+def schema_for(columns):
+    return pa.schema([pa.field(column, _arrow_type(column)) for column in columns])
+
+def _to_int(value):
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return None
+
+def _to_str(value):
+    if value is None or (isinstance(value, float) and value != value):  # NaN
+        return None
+    return str(value)
+
+def _build_batch(rows, columns, schema):
+    arrays = []
+    for column, field in zip(columns, schema):
+        values = [row.get(column) for row in rows]
+        if column in INTEGER_COLUMNS:
+            arrays.append(pa.array([_to_int(v) for v in values], type=field.type))
+        elif column in DICTIONARY_COLUMNS:
+            arrays.append(pa.array([_to_str(v) for v in values], type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array([_to_str(v) for v in values], type=pa.string()))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def write_parquet(rows, path, columns, compression='zstd', chunk_rows=5000):
+    """
+    {한글 컬럼명: 값} 행들을 chunk_rows개씩 Parquet row group으로 나눠 씁니다. (제너레이터도 가능, 메모리 사용량 일정)
+    쓴 행 수를 반환합니다. 임시 파일에 쓴 뒤 이름을 바꾸므로 다른 프로세스가 쓰다 만 파일을 읽지 않습니다.
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow가 설치되어 있지 않아 Parquet으로 저장할 수 없습니다. (pip install pyarrow)")
+    schema = schema_for(columns)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    count = 0
+    try:
+        with pq.ParquetWriter(tmp_path, schema, compression=compression) as writer:
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= chunk_rows:
+                    writer.write_batch(_build_batch(chunk, columns, schema))
+                    count += len(chunk)
+                    chunk = []
+            if chunk:
+                writer.write_batch(_build_batch(chunk, columns, schema))
+                count += len(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return count
+
+def read_table(path, columns=None):
+    """
+    CSV(utf-8-sig) 또는 Parquet 데이터셋을 DataFrame으로 읽습니다.
+    columns를 주면 그 컬럼만 읽습니다 (Parquet은 나머지 컬럼을 디스크에서 읽지도 않음).
+    사전 인코딩 컬럼은 기존 CSV와 같은 문자열(object) 컬럼으로 돌려줍니다.
+    """
+    if path.endswith('.parquet'):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow가 설치되어 있지 않아 Parquet 파일을 읽을 수 없습니다. (pip install pyarrow)")
+        df = pq.read_table(path, columns=columns).to_pandas()
+        for column in df.columns:
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype(object)
+        return df
+    return pd.read_csv(path, usecols=columns, encoding='utf-8-sig')
+
+def iter_rows(path, columns=None, batch_rows=5000):
+    """데이터셋을 {컬럼명: 값} 행 단위로 순회합니다. 파일 전체를 메모리에 올리지 않습니다."""
+    if path.endswith('.parquet'):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow가 설치되어 있지 않아 Parquet 파일을 읽을 수 없습니다. (pip install pyarrow)")
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=batch_rows, columns=columns):
+            yield from batch.to_pylist()
+        return
+    for chunk in pd.read_csv(path, usecols=columns, encoding='utf-8-sig', chunksize=batch_rows):
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        yield from chunk.to_dict('records')
+
+def read_columns(path):
+    """데이터를 읽지 않고 CSV 헤더 / Parquet 스키마에서 컬럼명만 읽습니다."""
+    if path.endswith('.parquet'):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow가 설치되어 있지 않아 Parquet 파일을 읽을 수 없습니다. (pip install pyarrow)")
+        return pq.ParquetFile(path).schema_arrow.names
+    return list(pd.read_csv(path, nrows=0, encoding='utf-8-sig').columns)
+
+def export_csv(parquet_path, csv_path=None):
+    """Parquet 데이터셋을 수동 검수(피드백) 작업용 utf-8-sig CSV로 내보내고 경로를 반환합니다."""
+    csv_path = csv_path or f"{os.path.splitext(parquet_path)[0]}.csv"
+    columns = pq.ParquetFile(parquet_path).schema_arrow.names
+    tmp_path = f"{csv_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+            header = True
+            for batch in pq.ParquetFile(parquet_path).iter_batches(batch_size=5000):
+                batch.to_pandas(integer_object_nulls=True)[columns].to_csv(f, index=False, header=header)
+                header = False
+        os.replace(tmp_path, csv_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return csv_path
+
+def convert_csv(csv_path, parquet_path=None, compression='zstd'):
+    """기존 CSV 데이터셋을 Parquet으로 변환하고 (경로, 행 수)를 반환합니다."""
+    parquet_path = parquet_path or f"{os.path.splitext(csv_path)[0]}.parquet"
+    columns = read_columns(csv_path)
+    count = write_parquet(iter_rows(csv_path), parquet_path, columns, compression=compression)
+    return parquet_path, count
+
+def latest_file(folder, prefix):
+    """
+    folder에서 'prefix_*.csv' / 'prefix_*.parquet' 중 가장 최근에 만들어진 파일을 반환합니다.
+    OUTPUT_FORMAT=both로 저장된 CSV/Parquet 쌍이면 (CSV가 나중에 만들어져도) Parquet을 고릅니다.
+    """
+    files = [path for ext in DATA_EXTENSIONS for path in glob.glob(os.path.join(folder, f"{prefix}_*{ext}"))]
+    if not files:
+        return None
+    latest = max(files, key=os.path.getctime)
+    parquet_path = f"{os.path.splitext(latest)[0]}.parquet"
+    return parquet_path if parquet_path in files else latest
+
+def _benchmark(csv_path, columns, repeat):
+    parquet_path, count = convert_csv(csv_path, f"{os.path.splitext(csv_path)[0]}.bench.parquet")
+    try:
+        def timed(path):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                read_table(path, columns)
+            return (time.perf_counter() - start) / repeat
+
+        csv_size, parquet_size = os.path.getsize(csv_path), os.path.getsize(parquet_path)
+        csv_time, parquet_time = timed(csv_path), timed(parquet_path)
+        print(f"\n--- CSV / Parquet 비교: {count}행, 읽은 컬럼 {columns} ---")
+        print(f"  > 파일 크기: CSV {csv_size / 1024 / 1024:.2f} MB, Parquet {parquet_size / 1024 / 1024:.2f} MB "
+              f"({csv_size / max(parquet_size, 1):.1f}배 작음)")
+        print(f"  > 읽기 시간: CSV {csv_time * 1000:.1f} ms, Parquet {parquet_time * 1000:.1f} ms "
+              f"({csv_time / max(parquet_time, 1e-9):.1f}배 빠름)")
+    finally:
+        os.remove(parquet_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV 데이터셋과 Parquet(컬럼 저장) 데이터셋을 변환/비교합니다.")
+    parser.add_argument('command', choices=['convert', 'export', 'bench'],
+                        help="convert: CSV -> Parquet, export: Parquet -> CSV (피드백 검수용), bench: 크기/읽기 속도 비교")
+    parser.add_argument('files', nargs='+', help="대상 파일 경로")
+    # 라벨 컬럼명에 쉼표가 들어 있어 쉼표 구분 대신 공백으로 구분된 목록으로 받습니다.
+    parser.add_argument('--columns', nargs='+', default=['기사본문', LABEL_COLUMN], help="bench에서 읽을 컬럼 목록")
+    parser.add_argument('--repeat', type=int, default=3, help="bench 반복 횟수")
+    args = parser.parse_args()
+
+    if not PYARROW_AVAILABLE:
+        print("[오류] pyarrow가 설치되어 있지 않습니다. (pip install pyarrow)")
+        return
+
+    for path in args.files:
+        if args.command == 'convert':
+            parquet_path, count = convert_csv(path)
+            print(f"{count}행 변환 완료: {parquet_path}")
+        elif args.command == 'export':
+            print(f"CSV 내보내기 완료: {export_csv(path)}")
+        else:
+            _benchmark(path, args.columns, args.repeat)
+
+if __name__ == '__main__':
+    main()
@@ -1,99 +1,310 @@
 # E:\workspace\util\convert_json_to_csv.py
 
 import os
+import csv
 import json
-import pandas as pd
+import time
+import signal
+import tarfile
+import zipfile
+import argparse
+from collections import deque
 from datetime import datetime
-import csv # csv 모듈 import
+from concurrent.futures import ProcessPoolExecutor
+
+from util.columnar_store import RAW_COLUMNS, PYARROW_AVAILABLE, convert_csv
+
+# orjson이 설치되어 있으면 더 빠른 파서를 사용합니다 (없으면 표준 json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # --- 설정 ---
-# 원본 JSON 파일들이 들어있는 폴더 경로 (수정 필요)
-JSON_SOURCE_FOLDER = r'E:\workspace\Data_Set\News_JSONs' 
-# 변환된 CSV 파일을 저장할 경로
-OUTPUT_FOLDER = r'E:\workspace\Data_Set\articles'
-OUTPUT_FILENAME = f"raw_real_news_from_json_{datetime.now().strftime('%Y-%m-%d')}.csv"
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# 변환된 파일을 저장할 기본 경로 (수집 결과와 같은 articles 폴더 -> LLM 가공 단계에서 바로 사용)
+OUTPUT_FOLDER = os.path.join(BASE_DIR, '..', 'News_API', 'articles')
+OUTPUT_PREFIX = 'raw_real_news_from_json'
+STATE_FILENAME = '.json_ingest_state.json'
+
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+MAX_ERROR_EXAMPLES = 10
 
-def convert_json_to_csv():
+def _loads(raw):
+    """bytes -> dict. UTF-8 BOM이 붙은 파일도 읽습니다."""
+    if raw.startswith(b'\xef\xbb\xbf'):
+        raw = raw[3:]
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+def parse_article(data, name):
     """
-    지정된 폴더(JSON_SOURCE_FOLDER)의 모든 JSON 파일을 읽어
-    'raw_real_news...' CSV 파일로 변환합니다.
+    JSON 한 건(sourceDataInfo 구조)을 기사 레코드로 바꿉니다. 본문이 없으면 None.
+    (게시일은 변환 실행 시각으로 채웁니다 - 원본 JSON에 게시 시각이 없음)
     """
-    print(f"---  JSON 데이터 변환 시작 ---")
-    print(f"원본 폴더: {JSON_SOURCE_FOLDER}")
-    
-    if not os.path.exists(JSON_SOURCE_FOLDER):
-        print(f"[오류] 원본 폴더를 찾을 수 없습니다: {JSON_SOURCE_FOLDER}")
-        print("스크립트 상단의 JSON_SOURCE_FOLDER 변수 경로를 수정해주세요.")
-        return
+    info = data.get('sourceDataInfo', {})
 
-    all_articles = []
-    
-    for filename in os.listdir(JSON_SOURCE_FOLDER):
-        if filename.endswith('.json'):
-            file_path = os.path.join(JSON_SOURCE_FOLDER, filename)
-            
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # 보여주신 JSON 구조에 맞게 데이터 추출
-                info = data.get('sourceDataInfo', {})
-                
-                # 기사 본문 추출
-                content = info.get('newsContent', '')
-                if not content:
-                    # newsContent가 비어있으면 sentenceInfo를 합칩니다.
-                    sentences = [s.get('sentenceContent', '') for s in info.get('sentenceInfo', [])]
-                    content = "\n".join(sentences)
-                    
-                if not content.strip():
-                    print(f"[경고] {filename} 파일에 기사 본문이 없습니다. 건너뜁니다.")
-                    continue
-                    
-                article = {
-                    'title': info.get('newsTitle', '제목 없음'),
-                    'source': info.get('newsCategory', 'JSON 데이터'), # 출처 대신 카테고리
-                    'author': '[정보 없음]', # JSON에 기자 정보가 없음
-                    'url': f"json://{info.get('newsID', filename)}",
-                    'publishedAt': datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'), # 임시로 현재 시간
-                    'text': content
-                }
-                all_articles.append(article)
-                
-            except Exception as e:
-                print(f"[오류] {filename} 파일 처리 중 오류 발생: {e}")
-
-    if not all_articles:
-        print("변환할 기사가 없습니다.")
+    # 기사 본문 추출
+    content = info.get('newsContent', '')
+    if not content:
+        # newsContent가 비어있으면 sentenceInfo를 합칩니다.
+        sentences = [s.get('sentenceContent', '') for s in info.get('sentenceInfo', [])]
+        content = "\n".join(sentences)
+
+    if not content.strip():
+        return None
+
+    return {
+        'title': info.get('newsTitle', '제목 없음'),
+        'source': info.get('newsCategory', 'JSON 데이터'), # 출처 대신 카테고리
+        'author': '[정보 없음]', # JSON에 기자 정보가 없음
+        'url': f"json://{info.get('newsID', os.path.basename(name))}",
+        'text': content
+    }
+
+# ----------------------------------------------------------------------
+# 작업 목록 (항상 같은 순서로 만들어 --resume 시 앞의 작업을 건너뛸 수 있게 함)
+# ----------------------------------------------------------------------
+def _is_archive(path):
+    return path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+def _walk_json_files(folder):
+    """폴더를 재귀적으로 이름순으로 훑어 .json 파일 경로를 내보냅니다 (목록 전체를 메모리에 올리지 않음)."""
+    with os.scandir(folder) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from _walk_json_files(entry.path)
+        elif entry.name.lower().endswith('.json'):
+            yield entry.path
+
+def _batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def iter_tasks(sources, chunk_files):
+    """
+    원본(폴더/압축 파일)을 chunk_files개씩 묶은 작업으로 나눕니다.
+    - 폴더와 zip: 작업에는 경로/멤버 이름만 담고, 워커 프로세스가 직접 읽습니다.
+    - tar(.gz): 순차적으로만 읽을 수 있어 이 프로세스가 풀어 (이름, 바이트)로 넘깁니다.
+    """
+    for source in sources:
+        if os.path.isdir(source):
+            for batch in _batched(_walk_json_files(source), chunk_files):
+                yield ('files', None, batch)
+        elif source.lower().endswith('.zip'):
+            with zipfile.ZipFile(source) as archive:
+                names = [info.filename for info in archive.infolist()
+                         if not info.is_dir() and info.filename.lower().endswith('.json')]
+            for batch in _batched(names, chunk_files):
+                yield ('zip', source, batch)
+        elif _is_archive(source):
+            with tarfile.open(source, 'r:*') as archive:
+                def blobs():
+                    for member in archive:
+                        if member.isfile() and member.name.lower().endswith('.json'):
+                            yield member.name, archive.extractfile(member).read()
+                for batch in _batched(blobs(), chunk_files):
+                    yield ('blobs', source, batch)
+        elif source.lower().endswith('.json'):
+            yield ('files', None, [source])
+        else:
+            print(f"[경고] 지원하지 않는 원본이라 건너뜁니다: {source}")
+
+# ----------------------------------------------------------------------
+# 워커 (프로세스 풀에서 실행)
+# ----------------------------------------------------------------------
+_open_zips = {}
+
+def _init_worker():
+    # Ctrl+C는 메인 프로세스만 처리합니다 (워커마다 KeyboardInterrupt 스택이 찍히지 않도록).
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def _read_member(kind, container, member):
+    """작업의 멤버 하나를 (이름, 바이트)로 읽습니다."""
+    if kind == 'files':
+        with open(member, 'rb') as f:
+            return member, f.read()
+    if kind == 'zip':
+        # 큰 zip의 목차를 작업마다 다시 읽지 않도록 워커별로 열어 둡니다.
+        archive = _open_zips.get(container)
+        if archive is None:
+            archive = _open_zips[container] = zipfile.ZipFile(container)
+        return member, archive.read(member)
+    return member
+
+def parse_task(task):
+    """작업 하나를 파싱해 (레코드 목록, 본문 없음 건수, [(파일명, 오류)])를 반환합니다."""
+    kind, container, members = task
+    records, empty, errors = [], 0, []
+    for member in members:
+        name = member[0] if kind == 'blobs' else member
+        try:
+            name, raw = _read_member(kind, container, member)
+            article = parse_article(_loads(raw), name)
+        except Exception as e:
+            errors.append((name, f"{e.__class__.__name__}: {e}"))
+            continue
+        if article is None:
+            empty += 1
+        else:
+            records.append(article)
+    return records, empty, errors
+
+# ----------------------------------------------------------------------
+# 진행 상태 (--resume)
+# ----------------------------------------------------------------------
+def _save_state(state_path, state):
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, state_path)
+
+def _new_state(sources, output_folder, output_format, chunk_files):
+    timestamp = datetime.now()
+    output_path = os.path.join(output_folder, f"{OUTPUT_PREFIX}_{timestamp.strftime('%Y-%m-%d_%H-%M-%S')}.{output_format}")
+    return {
+        'sources': [os.path.abspath(source) for source in sources],
+        'chunk_files': chunk_files,
+        'format': output_format,
+        'output_path': output_path,
+        # 점으로 시작하는 이름이라 변환 중에도 latest_file('raw_real_news_*')에 잡히지 않습니다.
+        'partial_path': os.path.join(output_folder, f".{os.path.basename(output_path)}.partial"),
+        'published_at': timestamp.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'tasks_done': 0, 'rows': 0, 'empty': 0, 'errors': 0, 'offset': 0,
+    }
+
+def _check_resumable(state, sources, chunk_files):
+    if state['sources'] != [os.path.abspath(source) for source in sources] or state['chunk_files'] != chunk_files:
+        raise ValueError("이전 실행과 원본 목록/--chunk-files가 달라 이어서 진행할 수 없습니다. --resume 없이 다시 실행하세요.")
+
+# ----------------------------------------------------------------------
+# 실행
+# ----------------------------------------------------------------------
+def _iter_results(tasks, workers):
+    """작업 순서대로 결과를 내보냅니다. 동시에 처리 중인 작업은 workers*2개로 제한해 메모리 사용량을 일정하게 유지합니다."""
+    if workers <= 1:
+        for task in tasks:
+            yield parse_task(task)
         return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(parse_task, task))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def convert_json_to_csv(sources, output_folder=OUTPUT_FOLDER, output_format='csv', workers=None,
+                        chunk_files=256, resume=False):
+    """
+    JSON 기사 파일(폴더 / zip / tar 압축 파일)을 프로세스 풀로 병렬 파싱해 'raw_real_news_from_json_*' 파일로 저장합니다.
+    결과는 작업(chunk_files개 파일) 단위로 바로 써서 메모리 사용량이 일정하며,
+    중단되면 resume=True로 마지막으로 기록된 작업 다음부터 이어서 진행합니다.
+    """
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if output_format == 'parquet' and not PYARROW_AVAILABLE:
+        print("[경고] pyarrow가 설치되어 있지 않아 CSV로 저장합니다. (pip install pyarrow)")
+        output_format = 'csv'
+
+    os.makedirs(output_folder, exist_ok=True)
+    state_path = os.path.join(output_folder, STATE_FILENAME)
+    if resume:
+        if not os.path.exists(state_path):
+            print(f"[오류] 이어서 진행할 변환 기록이 없습니다: {state_path}")
+            return None
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        _check_resumable(state, sources, chunk_files)
+        print(f"[재개] 작업 {state['tasks_done']}개 ({state['rows']}건)를 건너뛰고 이어서 진행합니다.")
+    else:
+        missing = [source for source in sources if not os.path.exists(source)]
+        if missing:
+            print(f"[오류] 원본을 찾을 수 없습니다: {missing}")
+            return None
+        state = _new_state(sources, output_folder, output_format, chunk_files)
 
-    # --- CSV 파일로 저장 ---
-    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-    output_path = os.path.join(OUTPUT_FOLDER, OUTPUT_FILENAME)
-    
-    # file_saver.py의 save_raw_real_news 함수와 동일한 헤더 사용
-    fieldnames = ['번호', '제목', '출처', '기자', 'URL', '게시일', '기사본문']
-    
-    try:
-        with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+    print(f"---  JSON 데이터 변환 시작 (워커 {workers}개, 파서: {'orjson' if ORJSON_AVAILABLE else 'json'}) ---")
+    started = time.perf_counter()
+    rows_at_start = state['rows']
+    error_examples = []
+
+    tasks = iter_tasks(sources, chunk_files)
+    for _ in range(state['tasks_done']):
+        next(tasks, None)
+
+    # 중간 결과는 CSV에 이어 쓰고, 마지막으로 기록된 위치(offset) 뒤의 쓰다 만 내용은 잘라냅니다.
+    mode = 'r+' if state['offset'] else 'w'
+    with open(state['partial_path'], mode, encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RAW_COLUMNS)
+        if state['offset']:
+            f.seek(state['offset'])
+            f.truncate()
+        else:
             writer.writeheader()
-            for i, article in enumerate(all_articles, 1):
-                writer.writerow({
-                    '번호': i,
-                    '제목': article.get('title', ''),
-                    '출처': article.get('source', ''),
-                    '기자': article.get('author', ''),
-                    'URL': article.get('url', ''),
-                    '게시일': article.get('publishedAt', ''),
-                    '기사본문': article.get('text', '')
-                })
-        print(f"\n--- ✅ 변환 완료 ---")
-        print(f"총 {len(all_articles)}개의 '진짜 뉴스' 원본이 아래 파일로 저장되었습니다:")
-        print(output_path)
-    except Exception as e:
-        print(f"CSV 파일 저장 중 오류 발생: {e}")
+        try:
+            for records, empty, errors in _iter_results(tasks, workers):
+                for article in records:
+                    state['rows'] += 1
+                    writer.writerow({
+                        '번호': state['rows'], '제목': article['title'], '출처': article['source'],
+                        '기자': article['author'], 'URL': article['url'],
+                        '게시일': state['published_at'], '기사본문': article['text'],
+                    })
+                f.flush()
+                state['tasks_done'] += 1
+                state['empty'] += empty
+                state['errors'] += len(errors)
+                state['offset'] = f.tell()
+                _save_state(state_path, state)
+                error_examples.extend(errors[:MAX_ERROR_EXAMPLES - len(error_examples)])
+                if state['tasks_done'] % 20 == 0:
+                    elapsed = max(time.perf_counter() - started, 1e-9)
+                    print(f"  > 작업 {state['tasks_done']}개, {state['rows']}건 ({(state['rows'] - rows_at_start) / elapsed:.0f}건/초)")
+        except KeyboardInterrupt:
+            print("\n사용자에 의해 중단되었습니다. 같은 원본으로 '--resume'을 붙여 다시 실행하면 이어서 진행합니다.")
+            return None
+
+    for name, error in error_examples:
+        print(f"[오류] {name} 파일 처리 중 오류 발생: {error}")
+
+    if not state['rows']:
+        print("변환할 기사가 없습니다.")
+        os.remove(state['partial_path'])
+        os.remove(state_path)
+        return None
+
+    if state['format'] == 'parquet':
+        convert_csv(state['partial_path'], state['output_path'])
+        os.remove(state['partial_path'])
+    else:
+        os.replace(state['partial_path'], state['output_path'])
+    os.remove(state_path)
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(f"\n--- ✅ 변환 완료 ---")
+    print(f"총 {state['rows']}개의 '진짜 뉴스' 원본이 아래 파일로 저장되었습니다 "
+          f"(본문 없음 {state['empty']}개, 오류 {state['errors']}개 건너뜀, 이번 실행 {(state['rows'] - rows_at_start) / elapsed:.0f}건/초):")
+    print(state['output_path'])
+    return state['output_path']
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 기사 파일(폴더/zip/tar)을 병렬로 읽어 raw_real_news 형식의 CSV/Parquet으로 변환합니다.")
+    parser.add_argument('sources', nargs='+', help="JSON 파일이 들어 있는 폴더 또는 압축 파일(.zip/.tar/.tar.gz)")
+    parser.add_argument('--output-folder', type=str, default=OUTPUT_FOLDER, help="결과 파일을 저장할 폴더 (기본값: News_API/articles)")
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv', help="결과 파일 형식")
+    parser.add_argument('--workers', type=int, default=None, help="파싱 프로세스 수 (기본값: CPU 코어 수, 1이면 단일 프로세스)")
+    parser.add_argument('--chunk-files', type=int, default=256, help="워커에 한 번에 넘길 파일 수 (진행 상태도 이 단위로 기록)")
+    parser.add_argument('--resume', action='store_true', help="중단된 변환을 이어서 진행")
+    args = parser.parse_args()
+    convert_json_to_csv(args.sources, args.output_folder, args.format, args.workers, args.chunk_files, args.resume)
 
 if __name__ == '__main__':
-    # JSON_SOURCE_FOLDER 경로를 실제 JSON 파일들이 있는 폴더로 수정하고 실행하세요.
-    convert_json_to_csv()
\ No newline at end of file
+    main()
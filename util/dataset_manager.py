@@ -1,21 +1,31 @@
 # E:\workspace\util\dataset_manager.py
 
 import os
-import pandas as pd
+import csv
+import hashlib
+import sqlite3
 from datetime import datetime
 
+from News_API.config import config
+from util.columnar_store import DATA_EXTENSIONS, PYARROW_AVAILABLE, iter_rows, read_columns, write_parquet
+from util.article_db import ArticleDB
+from util.near_dup import NearDupIndex, filter_near_duplicates
+
 # 데이터셋이 저장된 articles 폴더의 절대 경로
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ARTICLES_PATH = os.path.join(BASE_DIR, '..', 'News_API', 'articles')
 
+# 병합 시 한 번에 읽는 행 수 (메모리 사용량은 이 값에 비례)
+MERGE_CHUNK_ROWS = int(os.getenv('MERGE_CHUNK_ROWS', 5000))
+
 def get_datasets():
-    """articles 폴더에 있는 모든 CSV 파일 목록 가져오기."""
+    """articles 폴더에 있는 모든 CSV/Parquet 파일 목록 가져오기."""
     if not os.path.exists(ARTICLES_PATH):
         print(f"[경고] 데이터셋 폴더를 찾을 수 없습니다: {ARTICLES_PATH}")
         return []
     
-    # .csv로 끝나는 파일만 필터링
-    files = [f for f in os.listdir(ARTICLES_PATH) if f.endswith('.csv')]
+    # .csv / .parquet로 끝나는 파일만 필터링
+    files = [f for f in os.listdir(ARTICLES_PATH) if f.endswith(DATA_EXTENSIONS)]
     # 최신 파일이 위로 오도록 정렬
     files.sort(reverse=True)
     return files
@@ -31,46 +41,146 @@ def display_datasets(file_list):
         print(f"  [{i+1}] {filename}")
     print("-" * 35)
 
-def merge_datasets(selected_indices, file_list):
-    """선택된 여러 데이터셋을 하나로 병합."""
+class _SeenUrls:
+    """
+    병합 중 이미 나온 URL을 기억하는 디스크(SQLite 임시 파일) 집합입니다.
+    URL 대신 64비트 해시(blake2b)를 정수 기본키로 저장하므로, 입력이 아무리 커도 메모리 사용량은 일정합니다.
+    """
+    def __init__(self, folder):
+        self.path = os.path.join(folder, f".merge_seen_{os.getpid()}.sqlite3")
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (h INTEGER PRIMARY KEY)")
+
+    @staticmethod
+    def hash(url):
+        # NaN/빈 URL도 drop_duplicates처럼 하나의 값으로 취급합니다.
+        digest = hashlib.blake2b(('' if url is None else str(url)).encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big', signed=True)
+
+    def filter_new(self, rows):
+        """rows 중 처음 나온 URL의 행만 (순서대로) 반환하고, 그 URL을 집합에 추가합니다."""
+        hashes = [self.hash(row.get('URL')) for row in rows]
+        unique = list(set(hashes))
+        seen = set()
+        for i in range(0, len(unique), 500):
+            chunk = unique[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            seen.update(h for (h,) in self._conn.execute(f"SELECT h FROM seen WHERE h IN ({placeholders})", chunk))
+        kept, added = [], []
+        for row, h in zip(rows, hashes):
+            if h in seen:
+                continue
+            seen.add(h)
+            added.append((h,))
+            kept.append(row)
+        self._conn.executemany("INSERT INTO seen (h) VALUES (?)", added)
+        self._conn.commit()
+        return kept
+
+    def close(self):
+        self._conn.close()
+        os.remove(self.path)
+
+def _iter_merged_rows(file_paths, stats, chunk_rows=MERGE_CHUNK_ROWS):
+    """선택한 파일들을 순서대로 chunk_rows행씩 읽어, URL 기준으로 처음 나온 행만 내보냅니다 (keep='first')."""
+    seen = _SeenUrls(ARTICLES_PATH)
+    try:
+        for file_path in file_paths:
+            print(f"'{os.path.basename(file_path)}' 파일 병합 중...")
+            chunk = []
+            for row in iter_rows(file_path, batch_rows=chunk_rows):
+                chunk.append(row)
+                if len(chunk) >= chunk_rows:
+                    stats['read'] += len(chunk)
+                    yield from seen.filter_new(chunk)
+                    chunk = []
+            if chunk:
+                stats['read'] += len(chunk)
+                yield from seen.filter_new(chunk)
+    finally:
+        seen.close()
+
+def _write_merged_csv(rows, path, columns):
+    """행을 받는 즉시 CSV에 씁니다. 임시 파일에 쓴 뒤 성공했을 때만 최종 이름으로 바꿉니다."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    count = 0
+    try:
+        with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, restval='')
+            writer.writeheader()
+            for count, row in enumerate(rows, 1):
+                writer.writerow(row)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return count
+
+def merge_datasets(selected_indices, file_list, near_dup_threshold=None):
+    """
+    선택된 여러 데이터셋을 하나로 병합.
+    파일을 통째로 읽지 않고 청크 단위로 읽어 바로 쓰며, URL 중복은 디스크 해시 집합으로 걸러
+    입력 크기와 관계없이 메모리 사용량이 일정합니다. (먼저 선택한 파일의 행을 남김)
+    near_dup_threshold를 주면 URL은 달라도 본문이 거의 같은 (전재) 기사도 먼저 나온 행만 남깁니다.
+    """
     if not selected_indices:
         print("선택된 데이터셋이 없습니다.")
         return
 
-    dataframes = []
+    file_paths = []
+    columns = []
     for i in selected_indices:
         if 0 <= i < len(file_list):
             file_path = os.path.join(ARTICLES_PATH, file_list[i])
-            print(f"'{file_list[i]}' 파일 로드 중...")
+            # 헤더만 먼저 읽어, 깨진 파일은 병합을 시작하기 전에 알립니다.
             try:
-                df = pd.read_csv(file_path)
-                dataframes.append(df)
+                for column in read_columns(file_path):
+                    if column not in columns:
+                        columns.append(column)
             except Exception as e:
                 print(f"[오류] '{file_list[i]}' 파일 로드 실패: {e}")
                 return
+            file_paths.append(file_path)
         else:
             print(f"[경고] 잘못된 번호({i+1})는 건너뜁니다.")
     
-    if not dataframes:
-        print("병합할 데이터프레임이 없습니다.")
+    if not file_paths:
+        print("병합할 데이터셋이 없습니다.")
         return
 
-    # 모든 데이터프레임을 하나로 합침
-    merged_df = pd.concat(dataframes, ignore_index=True)
-    # 중복된 기사(URL 기준)가 있다면 제거
-    merged_df.drop_duplicates(subset=['URL'], inplace=True, keep='first')
-    
-    # 병합된 파일 저장
+    # 병합된 파일 저장 (Parquet 데이터셋이 섞여 있으면 Parquet으로 저장)
+    use_parquet = PYARROW_AVAILABLE and any(path.endswith('.parquet') for path in file_paths)
     timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-    new_filename = f"dataset_merged_{timestamp}.csv"
+    new_filename = f"dataset_merged_{timestamp}.{'parquet' if use_parquet else 'csv'}"
     new_filepath = os.path.join(ARTICLES_PATH, new_filename)
     
+    stats = {'read': 0}
+    near_dup = None
     try:
-        merged_df.to_csv(new_filepath, index=False, encoding='utf-8-sig')
+        rows = _iter_merged_rows(file_paths, stats)
+        if near_dup_threshold:
+            # 병합이 끝나면 지우는 임시 인덱스 (메모리 대신 디스크에 서명을 둠)
+            near_dup = NearDupIndex(os.path.join(ARTICLES_PATH, f".merge_near_dup_{os.getpid()}.sqlite3"), near_dup_threshold)
+            rows = filter_near_duplicates(rows, near_dup, lambda r: r.get('기사본문'), lambda r: r.get('URL'))
+        if use_parquet:
+            written = write_parquet(rows, new_filepath, columns)
+        else:
+            written = _write_merged_csv(rows, new_filepath, columns)
+        near_dups = near_dup.stats['duplicates'] if near_dup else 0
         print(f"\n--- 병합 완료 ---")
-        print(f"총 {len(merged_df)}개의 기사가 '{new_filename}' 파일로 저장되었습니다.")
+        print(f"읽은 행 {stats['read']}개, 저장 {written}개, 중복 URL로 제외 {stats['read'] - written - near_dups}개"
+              + (f", 유사 중복(유사도 {near_dup_threshold} 이상)으로 제외 {near_dups}개" if near_dup else ""))
+        print(f"총 {written}개의 기사가 '{new_filename}' 파일로 저장되었습니다.")
     except Exception as e:
         print(f"[오류] 병합된 파일 저장 실패: {e}")
+    finally:
+        if near_dup:
+            near_dup.close()
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(near_dup.db_path + suffix):
+                    os.remove(near_dup.db_path + suffix)
 
 def delete_datasets(selected_indices, file_list):
     """선택된 데이터셋 파일을 삭제합니다."""
@@ -87,4 +197,50 @@ def delete_datasets(selected_indices, file_list):
             except Exception as e:
                 print(f"[오류] '{file_list[i]}' 파일 삭제 실패: {e}")
         else:
-            print(f"[경고] 잘못된 번호({i+1})는 건너뜁니다.")
\ No newline at end of file
+            print(f"[경고] 잘못된 번호({i+1})는 건너뜁니다.")
+
+def import_to_db(selected_indices, file_list):
+    """선택된 데이터셋을 기사 DB로 가져옵니다. (같은 URL/같은 가짜뉴스는 한 번만 저장)"""
+    if not selected_indices:
+        print("선택된 데이터셋이 없습니다.")
+        return
+
+    db = ArticleDB(config.ARTICLE_DB_PATH)
+    try:
+        for i in selected_indices:
+            if 0 <= i < len(file_list):
+                try:
+                    stats = db.import_file(os.path.join(ARTICLES_PATH, file_list[i]))
+                    print(f"'{file_list[i]}' 가져오기 완료: 기사 {stats['articles']}행, 가짜뉴스 {stats['fakes']}행")
+                except Exception as e:
+                    print(f"[오류] '{file_list[i]}' 파일 가져오기 실패: {e}")
+            else:
+                print(f"[경고] 잘못된 번호({i+1})는 건너뜁니다.")
+        stats = db.stats()
+        print(f"\n기사 DB 현황: 기사 {stats['articles']}개 (라벨 {stats['labeled']}개), 가짜뉴스 {stats['fakes']}개, 피드백 {stats['feedback']}개")
+    finally:
+        db.close()
+
+def export_from_db(source=None, since=None, until=None):
+    """기사 DB에서 조건에 맞는 학습 데이터셋을 새 파일(dataset_db_*)로 추출합니다."""
+    # 저장 형식과 DB 경로는 수집/가공 단계와 같은 config(.env)를 따릅니다.
+    use_parquet = PYARROW_AVAILABLE and config.OUTPUT_FORMAT in ('parquet', 'both')
+    timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+    new_filename = f"dataset_db_{timestamp}.{'parquet' if use_parquet else 'csv'}"
+    new_filepath = os.path.join(ARTICLES_PATH, new_filename)
+
+    db = ArticleDB(config.ARTICLE_DB_PATH)
+    try:
+        count = db.export_dataset(new_filepath, source=source or None, since=since or None, until=until or None)
+    except Exception as e:
+        print(f"[오류] 기사 DB 추출 실패: {e}")
+        return
+    finally:
+        db.close()
+
+    if not count:
+        os.remove(new_filepath)
+        print("조건에 맞는 기사가 없습니다.")
+        return
+    print(f"\n--- 추출 완료 ---")
+    print(f"총 {count}개의 기사가 '{new_filename}' 파일로 저장되었습니다.")
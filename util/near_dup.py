@@ -0,0 +1,251 @@
+# E:\workspace\util\near_dup.py
+
+import os
+import re
+import time
+import hashlib
+import sqlite3
+import argparse
+import threading
+
+import numpy as np
+
+from util.columnar_store import iter_rows
+
+_NORMALIZE = re.compile(r'[\W_]+', re.UNICODE)
+_SHINGLE_BASE = np.uint64(1000003)
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+# 이보다 짧은 본문(크롤링 실패 문구 등)은 비교하지 않고 그대로 통과시킵니다.
+MIN_TEXT_CHARS = 50
+# 긴 기사는 앞부분만 비교합니다. 전재 기사는 리드부터 같으므로 충분하고, 처리량이 기사 길이에 묶이지 않습니다.
+MAX_TEXT_CHARS = 4000
+
+def normalize(text):
+    """공백/문장부호를 지우고 소문자로 바꿉니다. (줄바꿈/띄어쓰기만 다른 전재 기사를 같게 봄)"""
+    return _NORMALIZE.sub('', str(text).lower())[:MAX_TEXT_CHARS]
+
+def shingle_hashes(text, size=5):
+    """정규화된 본문의 글자 size-gram을 32비트 해시 배열(중복 제거)로 만듭니다."""
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    count = len(codes) - size + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.uint64)
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        hashes = (hashes * _SHINGLE_BASE + codes[offset:offset + count]) & _MASK32
+    return np.unique(hashes)
+
+class MinHasher:
+    """
+    num_perm개의 해시 함수로 MinHash 서명을 만듭니다.
+    해시 함수는 multiply-shift 방식((a*x + b) mod 2^64 >> 32)이라 나머지 연산 없이 numpy로 한 번에 계산합니다.
+    """
+    def __init__(self, num_perm=128, seed=1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = rng.randint(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.randint(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes):
+        # uint64 곱셈은 2^64에서 넘쳐 돌아가며, 이것이 곧 mod 2^64입니다.
+        # 임시 배열을 줄이려고 제자리 연산을 쓰고, 상위 32비트는 최솟값을 고른 뒤에 자릅니다 (순서가 같으므로 결과 동일).
+        with np.errstate(over='ignore'):
+            values = np.multiply.outer(hashes, self._a)
+            values += self._b
+        return (values.min(axis=0) >> np.uint64(32)).astype(np.uint32)
+
+def similarity(sig_a, sig_b):
+    """두 MinHash 서명에서 추정한 Jaccard 유사도."""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+class NearDupIndex:
+    """
+    기사 본문의 MinHash 서명을 LSH(밴드) 버킷에 넣어 유사 중복(near-duplicate) 기사를 찾는 인덱스입니다.
+    - 서명을 bands개 밴드로 나눠, 한 밴드라도 같은 기사만 후보로 보고 서명 유사도가 threshold 이상이면 중복으로 봅니다.
+      (128/16 기준: 유사도 0.8인 쌍은 약 95%, 0.9 이상은 거의 모두 후보가 됩니다)
+    - 전체를 훑지 않고 버킷 인덱스로 후보만 조회하며, SQLite 파일에 저장하면 실행이 바뀌어도 이어서 쌓입니다.
+    - 키(URL)가 같은 기사는 중복으로 보지 않으므로, 같은 기사를 다시 넣어도 안전합니다.
+    """
+    def __init__(self, db_path=':memory:', threshold=0.8, num_perm=128, bands=16, shingle_size=5):
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm})은 bands({bands})로 나누어떨어져야 합니다.")
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.db_path = db_path
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm)
+        self.stats = {'checked': 0, 'skipped': 0, 'duplicates': 0, 'added': 0}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS docs (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                signature BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                bucket INTEGER NOT NULL,
+                doc_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_buckets_bucket ON buckets (bucket);
+        """)
+        self._check_meta({'num_perm': num_perm, 'bands': bands, 'shingle_size': shingle_size})
+        self._conn.commit()
+
+    def _check_meta(self, params):
+        """저장된 인덱스와 서명 설정이 다르면 서로 비교할 수 없으므로 오류를 냅니다."""
+        stored = dict(self._conn.execute("SELECT name, value FROM meta"))
+        if not stored:
+            self._conn.executemany("INSERT INTO meta (name, value) VALUES (?, ?)",
+                                   [(name, str(value)) for name, value in params.items()])
+            return
+        changed = {name: stored.get(name) for name, value in params.items() if stored.get(name) != str(value)}
+        if changed:
+            raise ValueError(f"기존 유사 중복 인덱스({self.db_path})와 설정이 다릅니다: {changed} (다른 경로를 쓰거나 파일을 지우세요)")
+
+    def signature(self, text):
+        """본문의 MinHash 서명을 반환합니다. 너무 짧아 비교하지 않는 본문이면 None."""
+        if not isinstance(text, str):
+            return None
+        normalized = normalize(text)
+        if len(normalized) < MIN_TEXT_CHARS:
+            return None
+        return self.hasher.signature(shingle_hashes(normalized, self.shingle_size))
+
+    def _buckets(self, signature):
+        buckets = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(band.to_bytes(2, 'big') + chunk, digest_size=8).digest()
+            buckets.append(int.from_bytes(digest, 'big', signed=True))
+        return buckets
+
+    def _find(self, key, signature, buckets):
+        """버킷이 하나라도 같은 후보 중 유사도가 가장 높은 (키, 유사도). (잠금을 잡은 상태에서 호출)"""
+        placeholders = ','.join('?' * len(buckets))
+        candidates = self._conn.execute(f"""
+            SELECT key, signature FROM docs
+            WHERE id IN (SELECT doc_id FROM buckets WHERE bucket IN ({placeholders}))
+        """, buckets)
+        best = None
+        for candidate_key, blob in candidates:
+            if candidate_key == key:
+                continue
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (candidate_key, score)
+        return best
+
+    def _insert(self, key, signature, buckets):
+        cursor = self._conn.execute("INSERT OR IGNORE INTO docs (key, signature) VALUES (?, ?)", (key, signature.tobytes()))
+        if cursor.rowcount:
+            self._conn.executemany("INSERT INTO buckets (bucket, doc_id) VALUES (?, ?)",
+                                   [(bucket, cursor.lastrowid) for bucket in buckets])
+            self.stats['added'] += 1
+            self._pending += 1
+            if self._pending >= 500:
+                self._conn.commit()
+                self._pending = 0
+
+    def query(self, text, key=None):
+        """text와 유사한 기존 기사 (키, 유사도)를 반환합니다. 없으면 None."""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        with self._lock:
+            return self._find(key, signature, self._buckets(signature))
+
+    def add(self, key, text):
+        """기사를 인덱스에 추가합니다. (이미 있는 키나 너무 짧은 본문은 무시)"""
+        signature = self.signature(text)
+        if signature is not None:
+            with self._lock:
+                self._insert(key, signature, self._buckets(signature))
+
+    def check_and_add(self, key, text):
+        """
+        기존 기사와 유사하면 그 (키, 유사도)를 반환하고, 아니면 인덱스에 추가한 뒤 None을 반환합니다.
+        수집/병합 단계에서 '먼저 나온 기사만 남기는' 필터로 씁니다.
+        """
+        self.stats['checked'] += 1
+        signature = self.signature(text)
+        if signature is None:
+            self.stats['skipped'] += 1
+            return None
+        buckets = self._buckets(signature)
+        with self._lock:
+            match = self._find(key, signature, buckets)
+            if match:
+                self.stats['duplicates'] += 1
+                return match
+            self._insert(key, signature, buckets)
+        return None
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+def filter_near_duplicates(records, index, text_of, key_of, on_duplicate=None):
+    """
+    records를 순서대로 보며 이미 나온 기사와 유사한 레코드는 빼고 내보냅니다 (제너레이터).
+    on_duplicate(레코드, (비슷한 기사 키, 유사도))로 걸러진 레코드를 알릴 수 있습니다.
+    """
+    for record in records:
+        match = index.check_and_add(key_of(record), text_of(record))
+        if match:
+            if on_duplicate:
+                on_duplicate(record, match)
+            continue
+        yield record
+
+def scan_files(paths, threshold=0.8, text_column='기사본문', key_column='URL', show=10):
+    """데이터셋 파일들에서 유사 중복 기사를 찾아 건수와 처리량을 출력합니다. (파일은 바꾸지 않음)"""
+    index = NearDupIndex(threshold=threshold)
+    examples = []
+    started = time.perf_counter()
+
+    def remember(record, match):
+        if len(examples) < show:
+            examples.append((record.get(key_column), match[0], match[1]))
+
+    try:
+        for path in paths:
+            rows = iter_rows(path, columns=[key_column, text_column])
+            for _ in filter_near_duplicates(rows, index, lambda r: r.get(text_column), lambda r: r.get(key_column), remember):
+                pass
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        stats = index.stats
+        print(f"\n--- 유사 중복 검사 (유사도 {threshold} 이상) ---")
+        print(f"  > 기사 {stats['checked']}개, 유사 중복 {stats['duplicates']}개, 짧아서 제외 {stats['skipped']}개, "
+              f"{elapsed:.1f}초 ({stats['checked'] / elapsed:.0f} articles/s)")
+        for key, match_key, score in examples:
+            print(f"    {score:.2f}  {key}\n          ~ {match_key}")
+    finally:
+        index.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="MinHash/LSH로 데이터셋의 유사 중복(전재) 기사를 찾습니다.")
+    parser.add_argument('files', nargs='+', help="검사할 CSV/Parquet 파일")
+    parser.add_argument('--threshold', type=float, default=0.8, help="중복으로 볼 추정 Jaccard 유사도")
+    parser.add_argument('--show', type=int, default=10, help="출력할 중복 예시 수")
+    args = parser.parse_args()
+    scan_files(args.files, args.threshold, show=args.show)
+
+if __name__ == '__main__':
+    main()